@@ -0,0 +1,309 @@
+"""Pluggable notification channels fed by an async fan-out queue."""
+
+import asyncio
+import smtplib
+from datetime import date
+from email.message import EmailMessage
+
+import httpx
+
+from .config import SLACK_WEBHOOK_URL, get_settings, load_channel_configs
+from .delivery import DeliveryReport, SlackDelivery, pack_messages
+from .ledger import NotificationLedger, alert_key
+
+
+class DeliveryError(Exception):
+    """Raised by a channel when a batch could not be delivered."""
+
+
+class Channel:
+    """A notification destination with city/country/topic subscriptions.
+
+    Empty subscriptions match every event. Each channel gets its own
+    bounded queue and ``concurrency`` workers.
+    """
+
+    kind = ""
+    batch_size = 10
+
+    def __init__(
+        self,
+        name: str,
+        cities=(),
+        countries=(),
+        topics=(),
+        concurrency: int = 1,
+        queue_size: int = 8,
+    ):
+        self.name = name
+        self.cities = {c.lower() for c in cities}
+        self.countries = {c.lower() for c in countries}
+        self.topics = [t.lower() for t in topics]
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+
+    def matches(self, view) -> bool:
+        event = view.event
+        if (self.cities or self.countries) and not (
+            event.city.lower() in self.cities or event.country.lower() in self.countries
+        ):
+            return False
+        if self.topics:
+            event_topics = [t.lower() for t in event.topics]
+            if not any(wanted in topic for wanted in self.topics for topic in event_topics):
+                return False
+        return True
+
+    async def deliver(self, views: list) -> None:
+        raise NotImplementedError
+
+    async def deliver_digest(self, views: list) -> None:
+        """Send every alert in one digest; by default a single batch."""
+        await self.deliver(views)
+
+
+class SlackChannel(Channel):
+    """Slack incoming webhook; one batch is one message."""
+
+    kind = "slack"
+    batch_size = 12  # 12 events x 4 blocks stays under Slack's 50-block limit
+
+    def __init__(self, name: str, webhook_url: str, delivery: SlackDelivery | None = None, **kwargs):
+        super().__init__(name, **kwargs)
+        self.delivery = delivery or SlackDelivery(webhook_url)
+
+    async def deliver(self, views: list) -> None:
+        from .notifier import event_blocks
+
+        report = await self.delivery.send(pack_messages([event_blocks(v) for v in views]))
+        if report.failed:
+            raise DeliveryError("; ".join(report.errors))
+
+    async def deliver_digest(self, views: list) -> None:
+        from .notifier import send_daily_digest
+
+        report = await send_daily_digest(views, self.delivery)
+        if report and report.failed:
+            raise DeliveryError("; ".join(report.errors))
+
+
+class WebhookChannel(Channel):
+    """Generic JSON webhook."""
+
+    kind = "webhook"
+    batch_size = 50
+
+    def __init__(self, name: str, url: str, headers: dict | None = None, timeout: float = 30.0, **kwargs):
+        super().__init__(name, **kwargs)
+        self.url = url
+        self.headers = headers or {}
+        self.timeout = timeout
+
+    async def deliver(self, views: list) -> None:
+        payload = {
+            "alerts": [
+                {**v.event.to_dict(), "days_left": v.days_left, "urgency": v.urgency}
+                for v in views
+            ]
+        }
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            try:
+                response = await client.post(self.url, json=payload, headers=self.headers)
+            except httpx.HTTPError as e:
+                raise DeliveryError(f"{type(e).__name__}: {e}") from e
+        if response.status_code >= 300:
+            raise DeliveryError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+
+class EmailChannel(Channel):
+    """Plain-text email over SMTP; one batch is one email."""
+
+    kind = "email"
+    batch_size = 50
+
+    def __init__(
+        self,
+        name: str,
+        to,
+        sender: str = "cfp-radar@localhost",
+        smtp_host: str = "localhost",
+        smtp_port: int = 25,
+        starttls: bool = False,
+        username: str | None = None,
+        password: str | None = None,
+        **kwargs,
+    ):
+        super().__init__(name, **kwargs)
+        self.to = [to] if isinstance(to, str) else list(to)
+        self.sender = sender
+        self.smtp_host = smtp_host
+        self.smtp_port = smtp_port
+        self.starttls = starttls
+        self.username = username
+        self.password = password
+
+    def build_message(self, views: list) -> EmailMessage:
+        message = EmailMessage()
+        message["Subject"] = f"{len(views)} CFP deadline(s) coming up"
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.to)
+        lines = []
+        for view in views:
+            event = view.event
+            lines.append(f"{event.name} ({event.city}, {event.country})")
+            lines.append(f"  CFP deadline: {view.cfp_long_label} ({view.days_left} days left)")
+            lines.append(f"  {event.cfp_url or event.website}")
+            lines.append("")
+        message.set_content("\n".join(lines))
+        return message
+
+    def _send(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(message)
+
+    async def deliver(self, views: list) -> None:
+        try:
+            await asyncio.to_thread(self._send, self.build_message(views))
+        except (OSError, smtplib.SMTPException) as e:
+            raise DeliveryError(f"{type(e).__name__}: {e}") from e
+
+
+CHANNEL_TYPES = {cls.kind: cls for cls in (SlackChannel, WebhookChannel, EmailChannel)}
+
+
+def build_channel(config: dict) -> Channel:
+    """Create a channel from its config entry.
+
+    Raises:
+        ValueError: If the channel type is unknown
+    """
+    config = dict(config)
+    kind = config.pop("type", "slack")
+    cls = CHANNEL_TYPES.get(kind)
+    if cls is None:
+        raise ValueError(f"Unknown channel type: {kind}")
+    if "from" in config:
+        config["sender"] = config.pop("from")
+    name = config.pop("name", kind)
+    return cls(name, **config)
+
+
+def load_channels(config_file=None) -> list[Channel]:
+    """Load channels from config, falling back to SLACK_WEBHOOK_URL."""
+    configs = load_channel_configs(config_file) if config_file else get_settings().channels
+    if configs:
+        return [build_channel(c) for c in configs]
+    if SLACK_WEBHOOK_URL:
+        return [SlackChannel("slack", SLACK_WEBHOOK_URL)]
+    return []
+
+
+async def fan_out(
+    views: list, channels: list[Channel], ledger: NotificationLedger | None = None
+) -> dict[str, DeliveryReport]:
+    """Deliver alerts to every subscribed channel concurrently.
+
+    Each channel has its own bounded queue and workers, so a slow or failing
+    channel only applies backpressure to its own producer and never delays
+    the others. With a ledger, alerts are tracked per channel.
+
+    Returns:
+        A delivery report per channel name
+    """
+    results = await asyncio.gather(*(_run_channel(channel, views, ledger) for channel in channels))
+    return {channel.name: report for channel, report in zip(channels, results)}
+
+
+async def send_digests(
+    views: list, channels: list[Channel], ledger: NotificationLedger | None = None
+) -> dict[str, DeliveryReport]:
+    """Send each channel one digest of the alerts it subscribes to, concurrently.
+
+    With a ledger, each channel gets at most one digest per day.
+
+    Returns:
+        A delivery report per channel name
+    """
+    results = await asyncio.gather(*(_send_digest(channel, views, ledger) for channel in channels))
+    return {channel.name: report for channel, report in zip(channels, results)}
+
+
+async def _send_digest(channel: Channel, views: list, ledger: NotificationLedger | None) -> DeliveryReport:
+    report = DeliveryReport()
+    alerts = [v for v in views if channel.matches(v)]
+    if not alerts:
+        return report
+    key = alert_key(channel.name, "digest", date.today(), "daily")
+    if ledger is not None:
+        if ledger.status(key):
+            print(f"Daily digest already sent to {channel.name} today")
+            return report
+        ledger.begin([key])
+    try:
+        await channel.deliver_digest(alerts)
+    except Exception as e:
+        report.failed += len(alerts)
+        report.messages_failed += 1
+        report.errors.append(f"{type(e).__name__}: {e}")
+        if ledger is not None:
+            ledger.discard([key])
+    else:
+        report.delivered += len(alerts)
+        report.messages_sent += 1
+        if ledger is not None:
+            ledger.mark_sent([key])
+    return report
+
+
+async def _run_channel(channel: Channel, views: list, ledger: NotificationLedger | None) -> DeliveryReport:
+    report = DeliveryReport()
+    alerts = [
+        v for v in views
+        if channel.matches(v) and (ledger is None or ledger.is_new(v, channel.name))
+    ]
+    if not alerts:
+        return report
+
+    def keys(batch):
+        return [alert_key(channel.name, v.event.id, v.event.cfp_deadline, v.urgency) for v in batch]
+
+    queue = asyncio.Queue(maxsize=channel.queue_size)
+
+    async def worker():
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            # Only the batch being sent is in doubt if the run dies now
+            if ledger is not None:
+                ledger.begin(keys(batch))
+            try:
+                await channel.deliver(batch)
+            except Exception as e:
+                report.failed += len(batch)
+                report.messages_failed += 1
+                report.errors.append(f"{type(e).__name__}: {e}")
+                if ledger is not None:
+                    ledger.discard(keys(batch))
+            else:
+                report.delivered += len(batch)
+                report.messages_sent += 1
+                if ledger is not None:
+                    ledger.mark_sent(keys(batch))
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, channel.concurrency))]
+    try:
+        for start in range(0, len(alerts), channel.batch_size):
+            # Blocks only this channel's producer when its queue is full
+            await queue.put(alerts[start:start + channel.batch_size])
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    return report
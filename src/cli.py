@@ -1,7 +1,7 @@
 """CLI entry point for the event tracker."""
 
 import argparse
-import asyncio
+import os
 import sys
 
 
@@ -14,21 +14,60 @@ def main():
 
     # Collect command
     collect_parser = subparsers.add_parser("collect", help="Collect events from all sources")
+    _add_collect_arguments(collect_parser)
     collect_parser.add_argument(
-        "output_file",
-        nargs="?",
-        default="data/index.html",
-        help="HTML output file (default: data/index.html)",
-    )
-    collect_parser.add_argument(
-        "--no-ai",
+        "--incremental",
         action="store_true",
-        help="Skip AI-powered web search (faster, but fewer results)",
+        help="Only refresh sources whose refresh interval has passed (see 'schedule' in the config)",
     )
     collect_parser.add_argument(
+        "--shard",
+        type=_shard_arg,
+        metavar="I/N",
+        help="Only collect shard I of N (numbered from 0) into a partial store under data/shards; "
+        "combine the shards with 'merge'",
+    )
+
+    # Merge command
+    merge_parser = subparsers.add_parser(
+        "merge", help="Combine the partial stores of sharded collect runs and export them"
+    )
+    merge_parser.add_argument(
+        "partials",
+        nargs="*",
+        help="Partial stores to merge (default: every shard store in data/shards)",
+    )
+    merge_parser.add_argument(
+        "--into",
+        help="Store to merge into (default: data/events.json)",
+    )
+    merge_parser.add_argument(
+        "--output-file",
+        default="data/index.html",
+        help="HTML output file (default: data/index.html)",
+    )
+    merge_parser.add_argument(
         "--config",
         help="Path to config YAML file (default: config.yaml)",
     )
+    merge_parser.add_argument(
+        "--format",
+        default="html",
+        help="Comma-separated output formats: html, ics, atom, json (default: html)",
+    )
+    merge_parser.add_argument(
+        "--sort",
+        choices=["deadline", "relevance", "date"],
+        default="deadline",
+        help="Order of events on the page (default: deadline)",
+    )
+
+    # Run command
+    run_parser = subparsers.add_parser(
+        "run",
+        help="Keep collecting, refreshing each source when it is due, and re-export on changes",
+    )
+    _add_collect_arguments(run_parser)
 
     # Notify command
     notify_parser = subparsers.add_parser("notify", help="Send Slack notifications for upcoming CFPs")
@@ -38,6 +77,21 @@ def main():
         default=14,
         help="Notify for CFPs closing within this many days (default: 14)",
     )
+    notify_parser.add_argument(
+        "--digest",
+        action="store_true",
+        help="Send a single daily digest instead of one notification per event",
+    )
+    notify_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the notification ledger and re-send alerts that were already sent",
+    )
+    notify_parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and alert as soon as each CFP crosses a 14/7/3-day threshold",
+    )
 
     # List command
     list_parser = subparsers.add_parser("list", help="List collected events")
@@ -45,6 +99,49 @@ def main():
     list_parser.add_argument("--topic", help="Filter by topic")
     list_parser.add_argument("--cfp", action="store_true", help="Show only events with open CFP")
     list_parser.add_argument(
+        "--sort",
+        choices=["deadline", "relevance", "date"],
+        default="deadline",
+        help="Sort by CFP deadline, relevance score or start date (default: deadline)",
+    )
+    list_parser.add_argument(
+        "--config",
+        help="Path to config YAML file (default: config.yaml)",
+    )
+
+    # Query command
+    query_parser = subparsers.add_parser(
+        "query",
+        help="Query collected events with a filter expression",
+        description=(
+            "Filter expressions compare fields with =, !=, <, <=, >, >=, ~ (contains), "
+            "!~ and in (...), combined with and/or/not, e.g. "
+            "'country in (France, India) and cfp_deadline < +21d and topic ~ kube'"
+        ),
+    )
+    query_parser.add_argument("expression", nargs="?", default="", help="Filter expression (default: all events)")
+    query_parser.add_argument(
+        "--sort",
+        default="start",
+        help="Field to sort by, prefixed with - for descending, e.g. --sort=-relevance (default: start)",
+    )
+    query_parser.add_argument("--limit", type=int, help="Show at most this many events")
+    query_parser.add_argument(
+        "--format",
+        choices=["table", "json", "csv"],
+        default="table",
+        help="Output format (default: table)",
+    )
+    query_parser.add_argument(
+        "--config",
+        help="Path to config YAML file (default: config.yaml)",
+    )
+
+    # Serve command
+    serve_parser = subparsers.add_parser("serve", help="Serve the events API")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8000, help="Port (default: 8000)")
+    serve_parser.add_argument(
         "--config",
         help="Path to config YAML file (default: config.yaml)",
     )
@@ -52,38 +149,107 @@ def main():
     args = parser.parse_args()
 
     if args.command == "collect":
-        asyncio.run(cmd_collect(args))
+        _run(cmd_collect(args))
+    elif args.command == "run":
+        _run(cmd_run(args))
+    elif args.command == "merge":
+        cmd_merge(args)
     elif args.command == "notify":
-        asyncio.run(cmd_notify(args))
+        _run(cmd_notify(args))
     elif args.command == "list":
         cmd_list(args)
+    elif args.command == "query":
+        cmd_query(args)
+    elif args.command == "serve":
+        cmd_serve(args)
     else:
         parser.print_help()
         sys.exit(1)
 
 
-async def cmd_collect(args):
-    """Run event collection."""
-    from datetime import date
+def _add_collect_arguments(parser):
+    """Arguments shared by the collect and run commands."""
+    parser.add_argument(
+        "output_file",
+        nargs="?",
+        default="data/index.html",
+        help="HTML output file (default: data/index.html)",
+    )
+    parser.add_argument(
+        "--no-ai",
+        action="store_true",
+        help="Skip AI-powered web search (faster, but fewer results)",
+    )
+    parser.add_argument(
+        "--config",
+        help="Path to config YAML file (default: config.yaml)",
+    )
+    parser.add_argument(
+        "--format",
+        default="html",
+        help="Comma-separated output formats: html, ics, atom, json (default: html)",
+    )
+    parser.add_argument(
+        "--sort",
+        choices=["deadline", "relevance", "date"],
+        default="deadline",
+        help="Order of events on the page (default: deadline)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=600.0,
+        help="Seconds a collection run may take; sources still running are cancelled "
+        "and partial results kept (default: 600)",
+    )
 
-    from .config import set_config_file, EVENTS_FILE
+
+def _shard_arg(text: str):
+    """Parse --shard for argparse, reporting a bad spec as a usage error."""
+    from .collector.shards import parse_shard
+
+    try:
+        return parse_shard(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def _run(coro):
+    """Run a coroutine to completion.
+
+    Subcommands import only what they use, so asyncio is loaded here rather
+    than at module level and synchronous commands like ``list`` start fast.
+    """
+    import asyncio
+
+    return asyncio.run(coro)
+
+
+def _collect_formats(args) -> list[str]:
+    """Apply --config and validate --format for the commands that export."""
+    from .config import set_config_file
+    from .exporter import EXPORT_FORMATS
 
     if args.config:
         set_config_file(args.config)
 
-    from .collector.agent import collect_all_events
-    from .collector.models import EventStore
+    formats = [f.strip() for f in args.format.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        print(f"Unknown output format(s): {', '.join(unknown)}")
+        sys.exit(1)
+    return formats
 
-    print("Collecting events from all sources...")
-    use_ai = not args.no_ai
 
-    if not use_ai:
-        print("(AI search disabled)")
+def _export(args, formats: list[str], store_path: str | None = None) -> None:
+    """Summarize the stored events and export them in every selected format."""
+    from datetime import date
 
-    await collect_all_events(use_ai=use_ai)
+    from .config import EVENTS_FILE
+    from .collector.models import EventStore
 
     # Read all events from store (includes previously collected)
-    store = EventStore(EVENTS_FILE)
+    store = EventStore(store_path or EVENTS_FILE)
     events = store.filter(start_after=date.today())
     print(f"\nTotal events: {len(events)}")
 
@@ -94,18 +260,85 @@ async def cmd_collect(args):
     upcoming_cfp = [e for e in cfp_events if e.cfp_deadline >= date.today()]
     print(f"  - Open CFP: {len(upcoming_cfp)}")
 
-    # Generate static HTML
-    from .generator import generate_html
-    generate_html(events, args.output_file)
-    print(f"\nHTML output written to: {args.output_file}")
+    # Export all selected formats in a single pass over the events
+    from .exporter import export_events
+    paths = export_events(events, args.output_file, formats, order=args.sort)
+    print(f"\nWrote {len(paths)} file(s):")
+    for path in paths:
+        print(f"  - {path}")
+
+
+async def cmd_collect(args):
+    """Run event collection."""
+    formats = _collect_formats(args)
+
+    from .collector.agent import collect_all_events
+
+    print("Collecting events from all sources...")
+    use_ai = not args.no_ai
+
+    if not use_ai:
+        print("(AI search disabled)")
+
+    await collect_all_events(
+        use_ai=use_ai, incremental=args.incremental, deadline=args.deadline, shard=args.shard
+    )
+    if args.shard:
+        # A shard's events are only part of the picture; 'merge' exports them all
+        print(f"\nShard {args.shard} stored in {args.shard.events_file}")
+        return
+    _export(args, formats)
+
+
+def cmd_merge(args):
+    """Merge the partial stores of sharded runs into the events store."""
+    formats = _collect_formats(args)
+
+    from .config import EVENTS_FILE
+    from .collector.shards import merge_stores, partial_stores
+
+    partials = args.partials or partial_stores()
+    if not partials:
+        print("No partial stores to merge; run 'collect --shard I/N' first")
+        sys.exit(1)
+    missing = [path for path in partials if not os.path.exists(path)]
+    if missing:
+        print(f"Partial store(s) not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    output = args.into or EVENTS_FILE
+    events = merge_stores(partials, output)
+    print(f"Merged {len(partials)} partial store(s) into {output}: {len(events)} events")
+    _export(args, formats, output)
+
+
+async def cmd_run(args):
+    """Collect continuously, each source on its own refresh interval."""
+    formats = _collect_formats(args)
+
+    from .daemon import run_collector
+
+    if args.no_ai:
+        print("(AI search disabled)")
+    if not os.path.exists(args.output_file):
+        _export(args, formats)
+    await run_collector(
+        use_ai=not args.no_ai, on_change=lambda: _export(args, formats), deadline=args.deadline
+    )
 
 
 async def cmd_notify(args):
     """Send Slack notifications."""
+    if args.daemon:
+        from .daemon import run_daemon
+
+        await run_daemon(days=args.days)
+        return
+
     from .notifier import check_upcoming_cfps
 
     print(f"Checking for CFPs closing within {args.days} days...")
-    await check_upcoming_cfps(days=args.days)
+    await check_upcoming_cfps(days=args.days, digest=args.digest, force=args.force)
 
 
 def cmd_list(args):
@@ -131,19 +364,54 @@ def cmd_list(args):
         print("No events found matching the criteria.")
         return
 
-    # Sort by CFP deadline
-    def sort_key(e):
-        return e.cfp_deadline if e.cfp_deadline else date(2099, 12, 31)
-
-    events.sort(key=sort_key)
+    from .views import build_views
 
-    for event in events:
+    for view in build_views(events, order=args.sort):
+        event = view.event
         cfp_info = ""
         if event.cfp_deadline:
-            days_left = (event.cfp_deadline - date.today()).days
-            cfp_info = f" [CFP: {event.cfp_deadline} ({days_left}d)]"
+            cfp_info = f" [CFP: {event.cfp_deadline} ({view.days_left}d)]"
+        score = f" ({event.relevance_score:.1f})" if args.sort == "relevance" else ""
+
+        print(f"{event.start_date} | {event.name}{score} | {event.city}{cfp_info}")
+
+
+def cmd_query(args):
+    """Run a filter expression against the stored events."""
+    from .config import set_config_file, EVENTS_FILE
+
+    if args.config:
+        set_config_file(args.config)
+
+    from .collector.models import EventStore
+    from .query import QueryError, compile_query, run_query, sort_key, write_rows
+
+    if args.limit is not None and args.limit < 0:
+        print("--limit must not be negative")
+        sys.exit(1)
+    try:
+        predicate = compile_query(args.expression)
+        sort_key(args.sort)
+    except QueryError as e:
+        print(f"Invalid query: {e}")
+        sys.exit(1)
+
+    events = run_query(EventStore(EVENTS_FILE).iter_events(), predicate, args.sort, args.limit)
+    write_rows(events, args.format, sys.stdout)
+
+
+def cmd_serve(args):
+    """Run the events API server."""
+    from .config import set_config_file
+
+    if args.config:
+        set_config_file(args.config)
+
+    import uvicorn
+
+    from .web.app import create_app
 
-        print(f"{event.start_date} | {event.name} | {event.city}{cfp_info}")
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level="info")
 
 
 if __name__ == "__main__":
@@ -1,55 +1,284 @@
 """Main collection agent that orchestrates all event sources."""
 
 import asyncio
+import os
+import time
 from datetime import date, datetime
+from .dates import parse_date
 from .models import Event, EventStore
-from .sources import confs_tech, papercall, web_search
-from ..config import EVENTS_FILE, TOPICS
-
-
-async def collect_all_events(use_ai: bool = True) -> list[Event]:
-    """Collect events from all sources and merge them."""
+from .ranking import prune_relevance, rank_events, rescore_store
+from .scheduler import SourceScheduler
+from .topics import tag_events
+from .sources import load_source, source_names, source_timeout
+from ..config import EVENTS_FILE, get_settings
+
+
+# A commit happens when this many seconds have passed since the last one...
+COMMIT_INTERVAL = 5.0
+# ...or this many events are waiting, whichever comes first
+COMMIT_SIZE = 500
+# Parsed task results waiting for the pipeline; full queues pause the sources
+QUEUE_SIZE = 16
+
+_SOURCE_DONE = object()
+
+
+class CollectionPipeline:
+    """Incremental dedup, date filter and periodic store commits for streamed events.
+
+    Only a dedup key, id and completeness score are kept per event seen;
+    the events themselves are held just until the next commit, so memory
+    is bounded by the commit size rather than by the whole run.
+
+    Args:
+        store: Store to commit into
+        cutoff: Events starting before this date are dropped
+    """
+
+    def __init__(self, store: EventStore, cutoff: date, commit_interval: float = COMMIT_INTERVAL,
+                 commit_size: int = COMMIT_SIZE, clock=time.monotonic):
+        self.store = store
+        self.cutoff = cutoff
+        self.commit_interval = commit_interval
+        self.commit_size = commit_size
+        self._clock = clock
+        self._seen = {}  # (normalized name, start date) -> (event id, completeness)
+        self._pending = {}  # id -> event waiting for the next commit
+        self._removed = set()  # ids superseded by a more complete duplicate
+        self._last_commit = clock()
+        self.committed = 0
+
+    def add(self, events: list[Event], stored: bool = False) -> None:
+        """Feed parsed events through dedup and the date filter.
+
+        Args:
+            stored: The events are unchanged since they were last committed;
+                they only take part in dedup so a newer, less complete
+                duplicate does not replace them
+        """
+        for event in events:
+            if event.start_date < self.cutoff:
+                continue
+            key = (_normalize_name(event.name), event.start_date.isoformat())
+            completeness = _event_completeness(event)
+            previous = self._seen.get(key)
+            if previous is not None:
+                if completeness <= previous[1]:
+                    continue
+                # Keep the event with more complete information
+                if previous[0] != event.id:
+                    self._pending.pop(previous[0], None)
+                    self._removed.add(previous[0])
+            self._seen[key] = (event.id, completeness)
+            if not stored:
+                self._removed.discard(event.id)
+                self._pending[event.id] = event
+
+    def due(self) -> bool:
+        """Whether enough events or time have accumulated for a commit."""
+        return bool(self._pending or self._removed) and (
+            len(self._pending) >= self.commit_size
+            or self._clock() - self._last_commit >= self.commit_interval
+        )
+
+    def commit(self) -> int:
+        """Tag, rank and merge the pending events into the store.
+
+        Returns:
+            The number of events committed
+        """
+        self._last_commit = self._clock()
+        if not self._pending and not self._removed:
+            return 0
+        events = sorted(self._pending.values(), key=lambda e: e.start_date)
+        # Tag topics from names and descriptions in one pass over the batch
+        tag_events(events, get_settings().topic_classifier)
+        # Score relevance against the interest profiles, new or changed events only
+        rank_events(events)
+        # The file is only rewritten if an event changed
+        self.store.merge(events, remove=self._removed)
+        self._pending, self._removed = {}, set()
+        self.committed += len(events)
+        return len(events)
+
+
+async def collect_all_events(
+    use_ai: bool = True,
+    incremental: bool = False,
+    scheduler: SourceScheduler | None = None,
+    pipeline: CollectionPipeline | None = None,
+    deadline: float | None = None,
+    shard=None,
+) -> int:
+    """Collect events from all sources, streaming them into the store.
+
+    Sources run concurrently as async generators. Each task's events go
+    through the pipeline as soon as they are parsed and are committed every
+    few seconds, so fast sources land in the store while slow ones are
+    still running, and a killed run keeps what it had committed.
+
+    Every source has a time budget from the registry. A source whose runs
+    keep failing is skipped while its circuit breaker is open. When the
+    global ``deadline`` passes, the results already queued are taken in,
+    sources still running are cancelled, their unfinished tasks are
+    recorded as failed and the partial results are committed.
+
+    Args:
+        use_ai: Include the Gemini-backed AI search
+        incremental: Only run source tasks whose refresh interval has passed
+        scheduler: Task and breaker state to consult and update (default: the schedule file)
+        pipeline: Dedup and commit pipeline (default: one over the events file)
+        deadline: Seconds the whole collection may take (default: no limit)
+        shard: Only run this shard's tasks, committing to its partial store
+            and keeping its own schedule (see collector.shards)
+
+    Returns:
+        The number of new or changed events committed to the store
+    """
     print("Starting event collection...")
-    all_events = []
-
-    # Collect from structured sources in parallel
-    tasks = [
-        confs_tech.fetch_conferences(date.today().year),
-        confs_tech.fetch_conferences(date.today().year + 1),
-        papercall.fetch_cfps(),
-    ]
-
-    if use_ai:
-        tasks.append(web_search.search_events())
-
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            source_name = ["confs.tech current", "confs.tech next", "papercall", "ai_search"][i]
-            print(f"Error collecting from {source_name}: {result}")
+    if shard is not None:
+        print(f"Collecting shard {shard}")
+    scheduler = scheduler or (SourceScheduler(shard.schedule_file) if shard else SourceScheduler())
+    now = datetime.now()
+
+    # Plan the tasks to run; each source module is imported only when it
+    # runs, so --no-ai never loads the Gemini SDK
+    plan = {}
+    for name in source_names(use_ai):
+        if not scheduler.allow(name, now):
+            print(f"Skipping {name}: failing repeatedly, retrying after {scheduler.breaker_open_until(name):%Y-%m-%d %H:%M}")
+            continue
+        source = load_source(name)
+        keys = source.task_keys()
+        if shard is not None:
+            keys = shard.select(name, keys)
+        scheduler.prune(name, keys)
+        if incremental:
+            keys = scheduler.due(name, keys, now)
+        if keys:
+            plan[name] = (source, keys)
+
+    if not plan:
+        print("No sources are due")
+        scheduler.save()
+        return 0
+
+    # Filter out past events (before the start of this month)
+    if pipeline is None:
+        store = EventStore(shard.events_file if shard else EVENTS_FILE)
+        pipeline = CollectionPipeline(store, date.today().replace(day=1))
+    queue = asyncio.Queue(QUEUE_SIZE)
+    # Without a store there is nothing to compare with, so keep every event
+    has_store = os.path.exists(pipeline.store.filepath)
+    unfinished = {(name, key) for name, (_, keys) in plan.items() for key in keys}
+    succeeded = set()
+
+    async def produce(name, source, keys):
+        done = set()
+        timeout = source_timeout(name)
+        try:
+            async with asyncio.timeout(timeout):
+                async for key, result in source.stream(keys):
+                    done.add(key)
+                    await queue.put((name, key, result))
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                e = TimeoutError(f"{name} took longer than {timeout:.0f}s")
+            # A source that dies or times out fails its remaining tasks
+            for key in keys:
+                if key not in done:
+                    await queue.put((name, key, e))
+        await queue.put(_SOURCE_DONE)
+
+    # Sources run in parallel, the tasks of one source share its client
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline if deadline is not None else None
+    producers = [asyncio.create_task(produce(name, *task)) for name, task in plan.items()]
+    active = len(producers)
+    completed = False
+
+    def commit() -> int:
+        # Fingerprints are recorded as tasks finish but only saved once their
+        # events are in the store; if the store write fails they are dropped,
+        # so the tasks count as changed on the next run instead of being skipped
+        try:
+            count = pipeline.commit()
+        except BaseException:
+            scheduler.reload()
+            raise
+        scheduler.save()
+        return count
+
+    def take(item) -> None:
+        name, key, outcome = item
+        unfinished.discard((name, key))
+        changed = scheduler.record(name, key, outcome, now)
+        if isinstance(outcome, Exception):
+            print(f"Error collecting from {name} {key}: {outcome}")
         else:
-            all_events.extend(result)
-            print(f"Collected {len(result)} events from source {i+1}")
-
-    # Deduplicate events
-    unique_events = deduplicate_events(all_events)
-    print(f"Total unique events after deduplication: {len(unique_events)}")
-
-    # Filter out past events (more than 30 days ago)
-    cutoff = date.today().replace(day=1)
-    future_events = [e for e in unique_events if e.start_date >= cutoff]
-    print(f"Future events: {len(future_events)}")
-
-    # Sort by start date
-    future_events.sort(key=lambda e: e.start_date)
-
-    # Save to storage
-    store = EventStore(EVENTS_FILE)
-    store.merge(future_events)
-    print(f"Events saved to {EVENTS_FILE}")
-
-    return future_events
+            succeeded.add(name)
+            print(f"Collected {len(outcome)} events from {name} {key}")
+            pipeline.add(outcome, stored=has_store and not changed)
+
+    error = None
+    try:
+        while active:
+            timeout = pipeline.commit_interval
+            if deadline_at is not None:
+                timeout = min(timeout, deadline_at - loop.time())
+                if timeout <= 0:
+                    # Tasks that finished in time keep their results
+                    while not queue.empty():
+                        item = queue.get_nowait()
+                        if item is not _SOURCE_DONE:
+                            take(item)
+                    if unfinished:
+                        print(f"Collection deadline of {deadline:.0f}s reached, cancelling: "
+                              + ", ".join(sorted({name for name, _ in unfinished})))
+                    break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                item = None  # Nothing arrived; commit what is waiting
+            if item is _SOURCE_DONE:
+                active -= 1
+            elif item is not None:
+                take(item)
+            if pipeline.due():
+                print(f"Committed {commit()} events to {pipeline.store.filepath}")
+        completed = True
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        for producer in producers:
+            producer.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+        # Whatever was collected before a failure, cancellation or the deadline is kept
+        try:
+            commit()
+        except Exception as e:
+            if error is None:
+                raise
+            # Let the error that stopped collection propagate, not this one
+            print(f"Could not commit collected events: {type(e).__name__}: {e}")
+        if completed:
+            for name, key in unfinished:
+                scheduler.record(name, key, TimeoutError("collection deadline reached"), now)
+            for name in plan:
+                scheduler.record_run(name, name in succeeded, now)
+        scheduler.save()
+
+    # Forget ranking state of events that left the store, then rescore the
+    # events that the commits did not rank if IDF drift invalidated their
+    # scores; a shard's partial store only holds part of the events, so only
+    # full runs do this
+    if shard is None:
+        prune_relevance(event.id for event in pipeline.store.iter_events())
+        rescore_store(pipeline.store)
+
+    print(f"Collection finished: {pipeline.committed} new or changed events committed")
+    return pipeline.committed
 
 
 def deduplicate_events(events: list[Event]) -> list[Event]:
@@ -108,44 +337,18 @@ def _event_completeness(event: Event) -> int:
     return score
 
 
-def calculate_topic_relevance(event: Event) -> float:
-    """Calculate relevance score based on topic matches."""
-    if not event.topics:
-        return 0.3
-
-    topic_lower = [t.lower() for t in event.topics]
-    matches = sum(1 for t in TOPICS if any(t.lower() in topic for topic in topic_lower))
-
-    # Base score
-    score = 0.3
-
-    # Topic matches (up to 0.5)
-    score += min(0.5, matches * 0.1)
-
-    # CFP availability bonus
-    if event.cfp_deadline and event.cfp_deadline >= date.today():
-        score += 0.15
-
-    # Tekton/CI-CD specific bonus
-    name_lower = event.name.lower()
-    if any(kw in name_lower for kw in ["tekton", "ci/cd", "cicd", "pipeline"]):
-        score += 0.1
-
-    return min(1.0, score)
-
-
 async def enrich_event_cfp(event: Event) -> Event:
     """Enrich event with CFP details from its website."""
     if not event.website or event.cfp_deadline:
         return event
 
-    details = await web_search.extract_cfp_details(event.website)
+    from .sources.web_search import extract_cfp_details
 
-    if details.get("cfp_deadline"):
-        try:
-            event.cfp_deadline = date.fromisoformat(details["cfp_deadline"])
-        except ValueError:
-            pass
+    details = await extract_cfp_details(event.website)
+
+    cfp_deadline = parse_date(details.get("cfp_deadline"), fuzzy=False)
+    if cfp_deadline:
+        event.cfp_deadline = cfp_deadline
 
     if details.get("cfp_url"):
         event.cfp_url = details["cfp_url"]
@@ -0,0 +1,202 @@
+"""Date parsing shared by every source.
+
+Sources see dates in a handful of shapes: ISO dates from confs.tech and
+Gemini, and listing text such as "Mar 3-5, 2030", "3 March 2030" or
+"CFP closes: 10.01.2030" from scraped pages. Parsing tries, in order:
+
+1. ``date.fromisoformat`` on the raw string
+2. precompiled patterns for ISO, numeric and month-name dates and ranges
+3. dateutil's fuzzy parser, as a last resort for text with a month name or
+   a day and month in it, unless the caller passes ``fuzzy=False``
+
+Structured sources (confs.tech, Gemini's JSON) pass ``fuzzy=False``: their
+dates are ISO, and guessing at anything else only invents dates.
+
+Results are cached, since the same strings recur across pages and runs.
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+DateRange = tuple[date | None, date | None]
+
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+    )
+}
+
+# Words around a date in listings: "CFP closes: ...", "Tuesday, ..."
+_NOISE = re.compile(
+    r"\b(?:cfp|call for (?:papers|proposals)|closes?|closing|ends?|deadline|due|by|from|on"
+    r"|(?:mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)(?:day|nesday|sday|urday)?)\b:?"
+)
+_ORDINAL = re.compile(r"(\d)(?:st|nd|rd|th)\b")
+_SEPARATORS = re.compile(r"\s*(?:[-–—]|\bto\b|\bthrough\b|\buntil\b)\s*")
+_SPACES = re.compile(r"[\s,]+")
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sept?|oct|nov|dec)[a-z]*\.?"
+_ISO = r"\d{4}-\d{2}-\d{2}"
+
+# What the fuzzy parser needs to see before its result is trusted: a month
+# name or a numeric day and month. "closes in 5 days", "q2 2030" or a bare
+# "2030" would otherwise become made-up dates.
+_DATE_TOKEN = re.compile(
+    r"\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b"
+    r"|\b\d{1,2}[/.-]\d{1,2}\b"
+)
+
+# Normalized text has lowercase words, single spaces and " - " between range ends
+_PATTERNS = [
+    # 2030-05-12, 2030-05-12t09:00:00z, 2030-05-12 - 2030-05-14, 2030-05-12/2030-05-14
+    ("iso", re.compile(rf"^(?P<start>{_ISO})(?:t\S*)?(?:(?: - |/)(?P<end>{_ISO})(?:t\S*)?)?$")),
+    # 2030/05/12
+    ("ymd", re.compile(r"^(?P<y>\d{4})[/.](?P<m>\d{1,2})[/.](?P<d>\d{1,2})$")),
+    # 12.05.2030 (day first)
+    ("dmy", re.compile(r"^(?P<d>\d{1,2})\.(?P<m>\d{1,2})\.(?P<y>\d{4})$")),
+    # 05/12/2030 (month first)
+    ("mdy", re.compile(r"^(?P<m>\d{1,2})/(?P<d>\d{1,2})/(?P<y>\d{4})$")),
+    # mar 3 2030, mar 3 - 5 2030, mar 30 - apr 2 2030, dec 30 2029 - jan 2 2030
+    (
+        "month_first",
+        re.compile(
+            rf"^(?P<m1>{_MONTH}) (?P<d1>\d{{1,2}})(?: (?P<y1>\d{{4}}))?"
+            rf"(?: - (?:(?P<m2>{_MONTH}) )?(?P<d2>\d{{1,2}}))?(?: (?P<y2>\d{{4}}))?$"
+        ),
+    ),
+    # 3 march 2030, 3 - 5 march 2030, 30 march - 2 april 2030, 30 dec 2029 - 2 jan 2030
+    (
+        "day_first",
+        re.compile(
+            rf"^(?P<d1>\d{{1,2}})(?: (?P<m1>{_MONTH})(?: (?P<y1>\d{{4}}))?)?"
+            rf"(?: - (?P<d2>\d{{1,2}}))? (?P<m2>{_MONTH}) (?P<y2>\d{{4}})$"
+        ),
+    ),
+]
+
+
+def parse_date(text: str | None, fuzzy: bool = True) -> date | None:
+    """Parse a date, or the start of a date range; None if there is none."""
+    return parse_date_range(text, fuzzy)[0]
+
+
+def parse_date_range(text: str | None, fuzzy: bool = True) -> DateRange:
+    """Parse a date or date range such as "Mar 3-5, 2030".
+
+    Args:
+        text: The text to parse
+        fuzzy: Fall back to dateutil's fuzzy parser for unknown formats
+
+    Returns:
+        (start, end); end is None for a single date, both are None if no
+        date was found
+    """
+    if not text or not isinstance(text, str):
+        return None, None
+    # The year is part of the key because dates without one default to it
+    return _parse(text.strip(), date.today().year, fuzzy)
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str, this_year: int, fuzzy: bool = True) -> DateRange:
+    try:
+        return date.fromisoformat(text), None
+    except ValueError:
+        pass
+
+    normalized = normalize(text)
+    for kind, pattern in _PATTERNS:
+        match = pattern.match(normalized)
+        if match:
+            try:
+                return _DETECTORS[kind](match, this_year)
+            except (KeyError, ValueError):
+                # Looked like a date but is not one, e.g. "feb 30 2030"
+                return None, None
+
+    if not fuzzy:
+        return None, None
+    return _parse_fuzzy(normalized, this_year), None
+
+
+def normalize(text: str) -> str:
+    """Lowercase ``text`` and strip the noise around dates, with " - " between range ends."""
+    text = _NOISE.sub(" ", text.lower())
+    text = _ORDINAL.sub(r"\1", text)
+    # ISO dates contain dashes, so only split around dashes between other tokens
+    parts = re.split(rf"({_ISO}(?:t\S*)?)", text)
+    text = "".join(part if i % 2 else _SEPARATORS.sub(" - ", part) for i, part in enumerate(parts))
+    return _SPACES.sub(" ", text).strip(" -")
+
+
+def _iso(match: re.Match, this_year: int) -> DateRange:
+    end = match["end"]
+    return date.fromisoformat(match["start"]), date.fromisoformat(end) if end else None
+
+
+def _numeric(match: re.Match, this_year: int) -> DateRange:
+    return date(int(match["y"]), int(match["m"]), int(match["d"])), None
+
+
+def _month(name: str) -> int:
+    return _MONTHS[name[:3]]
+
+
+def _month_first(match: re.Match, this_year: int) -> DateRange:
+    start_month = _month(match["m1"])
+    end_month = _month(match["m2"]) if match["m2"] else start_month
+    return _build_range(start_month, match["d1"], match["y1"], end_month, match["d2"], match["y2"], this_year)
+
+
+def _day_first(match: re.Match, this_year: int) -> DateRange:
+    end_month = _month(match["m2"])
+    if match["m1"] and not match["d2"]:
+        raise ValueError("range without an end day")
+    start_month = _month(match["m1"]) if match["m1"] else end_month
+    return _build_range(start_month, match["d1"], match["y1"], end_month, match["d2"], match["y2"], this_year)
+
+
+def _build_range(start_month, start_day, start_year, end_month, end_day, end_year, this_year) -> DateRange:
+    # A range gives its year once, after the end date, unless it spans two years;
+    # listings that leave it out mean this year
+    end_year = int(end_year or start_year or this_year)
+    if start_year:
+        start_year = int(start_year)
+    else:
+        # "dec 30 - jan 2 2030" starts in the previous year
+        start_year = end_year - 1 if start_month > end_month else end_year
+    start = date(start_year, start_month, int(start_day))
+    if end_day is None:
+        return start, None
+    end = date(end_year, end_month, int(end_day))
+    if end < start:
+        raise ValueError("range ends before it starts")
+    return start, end if end != start else None
+
+
+_DETECTORS = {
+    "iso": _iso,
+    "ymd": _numeric,
+    "dmy": _numeric,
+    "mdy": _numeric,
+    "month_first": _month_first,
+    "day_first": _day_first,
+}
+
+
+def _parse_fuzzy(text: str, this_year: int) -> date | None:
+    """Last resort for formats the patterns do not know; needs a digit and a day or month."""
+    if not any(c.isdigit() for c in text) or not _DATE_TOKEN.search(text):
+        return None
+    # Imported here: most dates never get this far
+    from dateutil import parser
+
+    # Missing parts default to January 1st of this year, not to today
+    default = datetime(this_year, 1, 1)
+    try:
+        return parser.parse(text, fuzzy=True, default=default).date()
+    except (ValueError, OverflowError):
+        return None
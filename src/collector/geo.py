@@ -0,0 +1,144 @@
+"""Offline gazetteer with a k-d tree for radius lookups around target cities."""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+from ..config import GAZETTEER_FILE
+from .matching import normalize
+
+EARTH_RADIUS_KM = 6371.0
+
+
+@dataclass(frozen=True, slots=True)
+class Place:
+    """A gazetteer entry."""
+
+    name: str
+    country: str
+    lat: float
+    lon: float
+    aliases: tuple[str, ...] = ()
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points, in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _to_xyz(lat: float, lon: float) -> tuple[float, float, float]:
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+class KDTree:
+    """Static 3-d tree over points on the unit sphere.
+
+    Points are stored as unit vectors, so a great-circle radius becomes a
+    plain Euclidean chord length and there is no longitude wrap-around to
+    handle. Nodes are (point, item, axis, left, right) tuples.
+    """
+
+    def __init__(self, points: list[tuple[tuple[float, float, float], object]]):
+        self.root = self._build(list(points), 0)
+
+    def _build(self, points: list, depth: int):
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda p: p[0][axis])
+        middle = len(points) // 2
+        point, item = points[middle]
+        return (
+            point,
+            item,
+            axis,
+            self._build(points[:middle], depth + 1),
+            self._build(points[middle + 1:], depth + 1),
+        )
+
+    def query_radius(self, center: tuple[float, float, float], radius: float) -> list:
+        """Items whose points lie within ``radius`` (Euclidean) of ``center``."""
+        found = []
+        limit = radius * radius
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point, item, axis, left, right = node
+            if sum((a - b) ** 2 for a, b in zip(point, center)) <= limit:
+                found.append(item)
+            diff = center[axis] - point[axis]
+            # Only cross the splitting plane when the sphere reaches it
+            stack.append(left if diff <= 0 else right)
+            if abs(diff) <= radius:
+                stack.append(right if diff <= 0 else left)
+        return found
+
+
+class Gazetteer:
+    """Place names and coordinates with cached lookups and radius queries."""
+
+    def __init__(self, places: list[Place]):
+        self.places = places
+        self._by_name = {}  # normalized name or alias -> [Place]
+        for place in places:
+            for name in (place.name, *place.aliases):
+                self._by_name.setdefault(normalize(name), []).append(place)
+        self._tree = KDTree([(_to_xyz(p.lat, p.lon), p) for p in places])
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def locate(self, name: str, country: str | None = None) -> Place | None:
+        """Resolve a place name to a gazetteer entry, preferring ``country``."""
+        key = (normalize(name or ""), normalize(country or ""))
+        if key not in self._cache:
+            candidates = self._by_name.get(key[0], [])
+            match = next((p for p in candidates if normalize(p.country) == key[1]), None)
+            self._cache[key] = match or (candidates[0] if candidates else None)
+        return self._cache[key]
+
+    def within(self, lat: float, lon: float, radius_km: float) -> list[tuple[Place, float]]:
+        """Places within ``radius_km`` of a point, nearest first, with distances."""
+        chord = 2 * math.sin(min(radius_km / EARTH_RADIUS_KM, math.pi) / 2)
+        hits = [
+            (place, haversine_km(lat, lon, place.lat, place.lon))
+            for place in self._tree.query_radius(_to_xyz(lat, lon), chord)
+        ]
+        return sorted(
+            ((place, km) for place, km in hits if km <= radius_km),
+            key=lambda hit: hit[1],
+        )
+
+    def around(self, name: str, radius_km: float, country: str | None = None) -> list[tuple[Place, float]]:
+        """Places within ``radius_km`` of a named place; empty if it is unknown."""
+        center = self.locate(name, country)
+        if center is None:
+            return []
+        return self.within(center.lat, center.lon, radius_km)
+
+
+def read_places(filepath: str) -> list[Place]:
+    """Read a tab-separated gazetteer: name, country, lat, lon, |-separated aliases."""
+    places = []
+    with open(filepath, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            aliases = tuple(a for a in fields[4].split("|") if a) if len(fields) > 4 else ()
+            places.append(Place(fields[0], fields[1], float(fields[2]), float(fields[3]), aliases))
+    return places
+
+
+@lru_cache(maxsize=4)
+def load_gazetteer(filepath: str = GAZETTEER_FILE) -> Gazetteer:
+    """Load and index the bundled gazetteer, once per file."""
+    return Gazetteer(read_places(filepath))
@@ -0,0 +1,186 @@
+"""Hedged and retried GET requests for the collectors.
+
+Collection time is dominated by the occasional slow response, not the
+typical one. Every GET is therefore timed into a latency histogram for its
+host; once a request has been outstanding for longer than that host's
+HEDGE_PERCENTILE latency, an identical request is fired and whichever
+answers first wins. Transport errors and 429/5xx responses are retried a
+bounded number of times with jittered exponential backoff. Only idempotent
+GETs go through here, so duplicates and retries are always safe.
+"""
+
+import asyncio
+import math
+import random
+import time
+
+import httpx
+
+# Latency percentile after which a duplicate request is sent
+HEDGE_PERCENTILE = 0.95
+# Samples a host needs before its own percentile is trusted
+MIN_SAMPLES = 20
+# Hedge delay in seconds for hosts without enough samples
+DEFAULT_HEDGE_DELAY = 2.0
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Longest Retry-After honoured; a longer wait is left to the next run
+MAX_RETRY_AFTER = 30.0
+
+# Histogram buckets grow geometrically from 10 ms to about 2 minutes
+_BUCKET_BASE = 0.01
+_BUCKET_GROWTH = 1.25
+_BUCKETS = 43
+# Counts are halved when a histogram reaches this many samples, so
+# thresholds follow a host whose latency changes
+_MAX_SAMPLES = 1000
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of response times for one host."""
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.total = 0
+
+    def record(self, seconds: float) -> None:
+        if seconds <= _BUCKET_BASE:
+            bucket = 0
+        else:
+            bucket = min(_BUCKETS - 1, math.ceil(math.log(seconds / _BUCKET_BASE, _BUCKET_GROWTH)))
+        self.counts[bucket] += 1
+        self.total += 1
+        if self.total >= _MAX_SAMPLES:
+            self.counts = [n // 2 for n in self.counts]
+            self.total = sum(self.counts)
+
+    def percentile(self, q: float) -> float | None:
+        """Upper bound in seconds of the bucket holding the ``q`` quantile, or None if empty."""
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return _BUCKET_BASE * _BUCKET_GROWTH**bucket
+        return _BUCKET_BASE * _BUCKET_GROWTH ** (_BUCKETS - 1)
+
+
+# Host -> latency histogram, shared by every client in the process
+_histograms: dict[str, LatencyHistogram] = {}
+
+
+class HedgedClient:
+    """GET through an httpx client with hedging and bounded retries.
+
+    Args:
+        client: The underlying client; its timeout bounds each attempt
+        max_retries: Retries after the first attempt for retryable failures
+        backoff: Base delay in seconds, doubled per retry and jittered
+        histograms: Host -> histogram mapping (default: the shared one)
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        histograms: dict[str, LatencyHistogram] | None = None,
+        sleep=None,
+        clock=None,
+    ):
+        self.client = client
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.histograms = _histograms if histograms is None else histograms
+        self._sleep = sleep or asyncio.sleep
+        self._clock = clock or time.monotonic
+        self.hedges = 0
+        self.retries = 0
+
+    def histogram(self, host: str) -> LatencyHistogram:
+        histogram = self.histograms.get(host)
+        if histogram is None:
+            histogram = self.histograms[host] = LatencyHistogram()
+        return histogram
+
+    def hedge_delay(self, host: str) -> float:
+        """Seconds to wait for a response before hedging a request to ``host``."""
+        histogram = self.histogram(host)
+        if histogram.total < MIN_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+        return histogram.percentile(HEDGE_PERCENTILE)
+
+    async def get(self, url: str, hedge: bool = True, **kwargs) -> httpx.Response:
+        """GET ``url``, hedging slow attempts and retrying transient failures.
+
+        Args:
+            url: URL to fetch
+            hedge: Send a duplicate of slow attempts; turn off for large
+                downloads, whose duration says little about a stalled server
+
+        Returns:
+            The first non-retryable response, or the last response once
+            retries are exhausted
+
+        Raises:
+            httpx.TransportError: If every attempt failed to get a response
+        """
+        for attempt in range(self.max_retries + 1):
+            error = None
+            try:
+                if hedge:
+                    response = await self._hedged_get(url, **kwargs)
+                else:
+                    response = await self._timed_get(url, self.histogram(httpx.URL(url).host), **kwargs)
+            except httpx.TransportError as e:
+                error = e
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+
+            if attempt == self.max_retries:
+                raise error
+            self.retries += 1
+            delay = self.backoff * 2**attempt
+            if error is None and response.status_code == 429:
+                delay = max(delay, min(_retry_after(response), MAX_RETRY_AFTER))
+            await self._sleep(delay + random.uniform(0, delay))
+
+    async def _timed_get(self, url: str, histogram: LatencyHistogram, **kwargs) -> httpx.Response:
+        start = self._clock()
+        response = await self.client.get(url, **kwargs)
+        histogram.record(self._clock() - start)
+        return response
+
+    async def _hedged_get(self, url: str, **kwargs) -> httpx.Response:
+        host = httpx.URL(url).host
+        histogram = self.histogram(host)
+        pending = {asyncio.create_task(self._timed_get(url, histogram, **kwargs))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay(host))
+            if done:
+                return done.pop().result()
+
+            self.hedges += 1
+            pending.add(asyncio.create_task(self._timed_get(url, histogram, **kwargs)))
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # A failed attempt only wins if the other one failed too
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    return succeeded[0].result()
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Read the Retry-After delay in seconds, or 0 if missing or malformed."""
+    try:
+        return max(0.0, float(response.headers.get("retry-after", "")))
+    except ValueError:
+        return 0.0
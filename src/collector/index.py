@@ -0,0 +1,198 @@
+"""In-memory index over the event store for fast repeated queries."""
+
+import base64
+import bisect
+import hashlib
+import itertools
+import json
+import os
+import time
+from datetime import date
+
+from .models import Event, EventStore, event_filter
+
+
+class EventIndex:
+    """Immutable snapshot of the store with lookup tables by id, city, country and topic.
+
+    Events are kept ordered by (start_date, id) so range scans and
+    pagination never need to sort.
+    """
+
+    def __init__(self, events: list[Event], version: str = ""):
+        self.events = sorted(events, key=lambda e: (e.start_date, e.id))
+        self.keys = [(e.start_date, e.id) for e in self.events]
+        self.version = version
+        self.by_id = {}
+        self.by_city = {}
+        self.by_country = {}
+        self.by_topic = {}
+        for position, event in enumerate(self.events):
+            self.by_id[event.id] = event
+            self.by_city.setdefault(event.city.lower(), []).append(position)
+            self.by_country.setdefault(event.country.lower(), []).append(position)
+            for topic in {t.lower() for t in event.topics}:
+                self.by_topic.setdefault(topic, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def filter(
+        self,
+        city: str | None = None,
+        topic: str | None = None,
+        has_cfp: bool | None = None,
+        start_after: date | None = None,
+        start_before: date | None = None,
+        country: str | list[str] | None = None,
+    ) -> list[Event]:
+        """Filter events by criteria, with the same semantics as EventStore.filter.
+
+        ``country`` may also be a list, matching events in any of those countries.
+        """
+        positions = None
+        if city:
+            positions = set(self.by_city.get(city.lower(), ()))
+        if country:
+            names = [country] if isinstance(country, str) else country
+            matched = set()
+            for name in names:
+                matched.update(self.by_country.get(name.lower(), ()))
+            positions = matched if positions is None else positions & matched
+        if topic:
+            # Topic filters are substring matches, so union every indexed topic containing it
+            topic_lower = topic.lower()
+            matched = set()
+            for name, topic_positions in self.by_topic.items():
+                if topic_lower in name:
+                    matched.update(topic_positions)
+            positions = matched if positions is None else positions & matched
+
+        if positions is None:
+            candidates = self.events
+        else:
+            candidates = [self.events[p] for p in sorted(positions)]
+
+        if has_cfp is None and not start_after and not start_before:
+            return list(candidates)
+        predicate = event_filter(has_cfp=has_cfp, start_after=start_after, start_before=start_before)
+        return [e for e in candidates if predicate(e)]
+
+    def page(
+        self,
+        cursor: str | None = None,
+        limit: int = 50,
+        **criteria,
+    ) -> tuple[list[Event], str | None]:
+        """Return one page of matching events in (start_date, id) order.
+
+        Pagination is keyset based: the cursor encodes the sort key of the
+        last event returned, so a page costs a binary search plus a scan of
+        at most the events it skips, and stays stable while the store changes.
+
+        Returns:
+            The events and the cursor for the next page (None on the last page)
+        """
+        start = 0
+        if cursor:
+            start = bisect.bisect_right(self.keys, decode_cursor(cursor))
+        if criteria.get("start_after"):
+            start = max(start, bisect.bisect_left(self.keys, (criteria["start_after"], "")))
+
+        predicate = event_filter(**criteria)
+        events = []
+        for event in itertools.islice(self.events, start, None):
+            if predicate(event):
+                if len(events) == limit:
+                    return events, encode_cursor(events[-1])
+                events.append(event)
+        return events, None
+
+    def facets(self) -> dict[str, dict[str, int]]:
+        """Count events per city, country and topic."""
+        cities = {}
+        countries = {}
+        topics = {}
+        for event in self.events:
+            cities[event.city] = cities.get(event.city, 0) + 1
+            countries[event.country] = countries.get(event.country, 0) + 1
+            for topic in event.topics:
+                topics[topic] = topics.get(topic, 0) + 1
+        return {"cities": cities, "countries": countries, "topics": topics}
+
+
+def encode_cursor(event: Event) -> str:
+    """Encode an event's (start_date, id) sort key as an opaque cursor."""
+    key = f"{event.start_date.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, str]:
+    """Decode a cursor produced by encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        start_date, event_id = raw.split("|", 1)
+        return date.fromisoformat(start_date), event_id
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class LiveIndex:
+    """EventIndex that is rebuilt whenever the underlying store file changes.
+
+    The file is stat'ed at most once per ``check_interval`` seconds, so
+    serving from the index costs no disk I/O between changes.
+    """
+
+    def __init__(self, filepath: str, check_interval: float = 1.0, clock=None):
+        self.store = EventStore(filepath)
+        self.check_interval = check_interval
+        self._clock = clock or time.monotonic
+        self._signature = None
+        self._checked_at = None
+        self._index = None
+        self._listeners = []
+
+    def on_reload(self, callback) -> None:
+        """Register a callback invoked with the new index after each reload."""
+        self._listeners.append(callback)
+
+    def current(self) -> EventIndex:
+        """Return the current index, reloading it if the store file changed."""
+        now = self._clock()
+        if self._index is not None and now - self._checked_at < self.check_interval:
+            return self._index
+        self._checked_at = now
+
+        try:
+            stat = os.stat(self.store.filepath)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+
+        if self._index is None or signature != self._signature:
+            try:
+                index = self._build()
+            except (ValueError, KeyError, TypeError) as e:
+                # Keep serving the previous index; the file is read again next check
+                print(f"Could not reload {self.store.filepath}: {e}")
+                if self._index is None:
+                    self._index = EventIndex([], version="empty")
+                return self._index
+            self._signature = signature
+            self._index = index
+            for callback in self._listeners:
+                callback(self._index)
+        return self._index
+
+    def _build(self) -> EventIndex:
+        if not os.path.exists(self.store.filepath):
+            return EventIndex([], version="empty")
+        with open(self.store.filepath, "rb") as f:
+            raw = f.read()
+        version = hashlib.sha1(raw).hexdigest()[:16]
+        return EventIndex([Event.from_dict(e) for e in json.loads(raw)], version=version)
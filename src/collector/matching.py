@@ -0,0 +1,291 @@
+"""Compiled keyword and location matching shared by all sources."""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+
+from ..config import GAZETTEER_FILE, ConfigError
+
+# Alternative spellings, keyed by normalized canonical name
+CITY_ALIASES = {
+    "bangalore": ["bengaluru"],
+    "tel aviv": ["tel aviv-yafo", "tel aviv yafo", "tel-aviv"],
+    "pune": ["poona"],
+    "mumbai": ["bombay"],
+    "new delhi": ["delhi"],
+    "new york": ["new york city", "nyc"],
+    "munich": ["münchen", "muenchen"],
+    "prague": ["praha"],
+}
+
+COUNTRY_ALIASES = {
+    "czech republic": ["czechia"],
+    "usa": ["united states", "united states of america", "u.s.a."],
+    "united kingdom": ["uk", "great britain", "england", "scotland"],
+    "netherlands": ["the netherlands", "holland"],
+    "germany": ["deutschland"],
+}
+
+# ISO 3166 alpha-2 codes, only matched as a whole trailing component ("Paris, FR")
+COUNTRY_CODES = {
+    "FR": "france",
+    "IN": "india",
+    "IL": "israel",
+    "US": "usa",
+    "CZ": "czech republic",
+    "GB": "united kingdom",
+    "UK": "united kingdom",
+    "DE": "germany",
+    "NL": "netherlands",
+    "ES": "spain",
+    "IT": "italy",
+    "CA": "canada",
+}
+
+# US state and territory abbreviations. "Chicago, IL" is Illinois, not Israel;
+# the ones that are also country codes above are read as states in US-style text
+US_STATES = {
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI", "ID", "IL", "IN",
+    "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH",
+    "NJ", "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT",
+    "VT", "VA", "WA", "WV", "WI", "WY", "PR",
+}
+
+# Countries that are never targets themselves but show that a place is
+# somewhere else, e.g. the "Canada" in "London, Ontario, Canada"
+OTHER_COUNTRIES = [
+    "Austria", "Belgium", "Brazil", "Canada", "China", "Denmark", "Finland", "France", "Germany",
+    "Greece", "Hungary", "India", "Ireland", "Israel", "Italy", "Japan", "Luxembourg", "Mexico",
+    "Norway", "Poland", "Portugal", "Romania", "Singapore", "Slovakia", "Spain", "Sweden",
+    "Switzerland", "Ukraine", "Australia", "Argentina", "Turkey",
+]
+
+# Trailing "IL" or "IL 60601" component
+_TRAILING_CODE = re.compile(r",\s*([A-Z]{2})(\s+\d{5}(?:-\d{4})?)?\s*$")
+
+
+def normalize(name: str) -> str:
+    """Normalize a place name for exact lookups, folding case and accents."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    name = name.lower().replace(".", "")
+    name = re.sub(r"[\s\-_]+", " ", name)
+    return name.strip()
+
+
+def keyword_pattern(keywords, flags: int = re.IGNORECASE) -> re.Pattern:
+    """Compile keywords into one regex factored as a trie, with word boundaries.
+
+    Shared prefixes are merged, so at each input position the engine follows
+    a single trie path instead of trying every keyword: matching stays
+    linear in input length however many keywords there are, like an
+    Aho-Corasick automaton but running inside the C regex engine.
+    """
+    trie = {}
+    for keyword in keywords:
+        if not keyword:
+            continue
+        node = trie
+        for char in keyword.lower() if flags & re.IGNORECASE else keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def to_regex(node) -> str:
+        ending = "" in node
+        branches = [re.escape(char) + to_regex(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ending:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if ending else group
+
+    if not trie:
+        return re.compile(r"(?!x)x")  # Matches nothing
+    return re.compile(r"(?<!\w)(?:" + to_regex(trie) + r")(?!\w)", flags)
+
+
+@dataclass(frozen=True)
+class LocationMatch:
+    """A target location found in some text."""
+
+    city: str | None  # Canonical target city, None for a country-level match
+    country: str
+    kind: str  # city | nearby | country
+    near: str | None = None  # Target city a nearby match is within range of
+
+
+class LocationMatcher:
+    """Match event locations against the configured target cities and countries.
+
+    Built once from the config; exact lookups are dict hits and free-text
+    matching is a single pass of a compiled trie pattern. Targets with a
+    ``radius_km`` match every gazetteer place within that distance, found
+    once with the gazetteer's spatial index at build time, instead of their
+    whole country.
+
+    Raises:
+        ConfigError: If a target with a radius or without a country is not
+            in the gazetteer
+    """
+
+    def __init__(self, targets: list[dict]):
+        self.cities = {}  # normalized name or alias -> (city, country)
+        self.countries = {}  # normalized name or alias -> country
+        self.nearby = {}  # normalized name or alias -> target city it is near
+        city_spellings = set()
+        country_spellings = set()
+        gazetteer = None
+        for target in targets:
+            city, country = target["city"], target.get("country", "")
+            radius = target.get("radius_km")
+            center = None
+            if radius or not country:
+                from .geo import load_gazetteer
+
+                gazetteer = gazetteer or load_gazetteer()
+                center = gazetteer.locate(city, country)
+                if center is None:
+                    problem = "has a radius" if radius else "has no country"
+                    raise ConfigError(f"cities: {city} {problem} but is not in the gazetteer ({GAZETTEER_FILE})")
+                if not country:
+                    country = center.country
+
+            for name in [city, *target.get("aliases", ()), *CITY_ALIASES.get(normalize(city), ())]:
+                self.cities.setdefault(normalize(name), (city, country))
+                city_spellings.update((name.lower(), normalize(name)))
+            # A radius target covers the places around it, not its whole country
+            if country and not radius:
+                for name in [country, *_country_aliases(country)]:
+                    self.countries.setdefault(normalize(name), country)
+                    country_spellings.update((name.lower(), normalize(name)))
+
+            if radius:
+                for place, _ in gazetteer.within(center.lat, center.lon, radius):
+                    # Keep the configured spelling of the target's own country
+                    place_country = country if place.country == center.country else place.country
+                    names = [place.name, *place.aliases, *CITY_ALIASES.get(normalize(place.name), ())]
+                    for name in names:
+                        key = normalize(name)
+                        if key not in self.cities:
+                            self.cities[key] = (place.name, place_country)
+                            self.nearby[key] = city
+                        city_spellings.update((name.lower(), key))
+
+        self.codes = {}
+        for code, name in COUNTRY_CODES.items():
+            if name in self.countries:
+                self.codes[code] = self.countries[name]
+        self._target_countries = {_country_key(c): c for c in self.countries.values()}
+
+        # Every country name we know, target or not -> one key per country
+        self._known_countries = {}
+        known = [*self.countries, *COUNTRY_CODES.values(), *OTHER_COUNTRIES]
+        for name in known + [alias for name in known for alias in _country_aliases(name)]:
+            self._known_countries.setdefault(normalize(name), _country_key(name))
+
+        self._city_pattern = keyword_pattern(city_spellings)
+        self._country_pattern = keyword_pattern(country_spellings)
+        self._any_country_pattern = keyword_pattern(self._known_countries)
+
+    def city(self, name: str) -> tuple[str, str] | None:
+        """Exact lookup of a city name or alias; returns (city, country)."""
+        return self.cities.get(normalize(name)) if name else None
+
+    def country(self, name: str) -> str | None:
+        """Exact lookup of a country name, alias or code."""
+        if not name:
+            return None
+        return self.countries.get(normalize(name)) or self.codes.get(name.strip().upper())
+
+    def resolve(self, city: str, country: str) -> tuple[str, str] | None:
+        """Match a structured (city, country) pair; returns the (city, country) to store.
+
+        A target city only matches when the given country agrees with it, so
+        "Paris", "USA" is not Paris, France. The source's own city is kept
+        for country-level matches.
+        """
+        found = self.city(city)
+        if found and (not country or _country_key(country) == _country_key(found[1])):
+            return found
+        found_country = self.country(country)
+        if found_country:
+            return city, found_country
+        return None
+
+    def match(self, text: str) -> LocationMatch | None:
+        """Find a target in free text such as "Paris, France" or "Bengaluru, IN".
+
+        City and nearby-place matches win over country matches, unless the
+        text names a different country: "Paris, TX, USA" is not Paris,
+        France. A trailing two-letter component counts as a country code
+        only when no other part of the text names a different country, and
+        codes that are also US states ("Chicago, IL") are read as states in
+        US-style text.
+        """
+        if not text:
+            return None
+        named = {self._known_countries[normalize(m)] for m in self._any_country_pattern.findall(text)}
+        implied = None  # Country given only by a trailing code
+        trailing = _TRAILING_CODE.search(text)
+        if trailing:
+            code, zip_code = trailing.groups()
+            us_style = bool(zip_code) or text.count(",") == 1 or _country_key("usa") in named
+            if code in US_STATES and (code not in COUNTRY_CODES or us_style):
+                if code not in COUNTRY_CODES:
+                    implied = _country_key("usa")
+            elif code in COUNTRY_CODES and named <= {_country_key(COUNTRY_CODES[code])}:
+                implied = _country_key(COUNTRY_CODES[code])
+            if implied:
+                named.add(implied)
+
+        for found in self._city_pattern.finditer(text):
+            key = normalize(found.group())
+            city, country = self.cities[key]
+            if named - {_country_key(country)}:
+                continue  # Same name, different country
+            if key in self.nearby:
+                return LocationMatch(city, country, "nearby", self.nearby[key])
+            return LocationMatch(city, country, "city")
+        found = self._country_pattern.search(text)
+        if found:
+            return LocationMatch(None, self.countries[normalize(found.group())], "country")
+        if implied in self._target_countries:
+            return LocationMatch(None, self._target_countries[implied], "country")
+        return None
+
+
+def _country_aliases(country: str) -> list[str]:
+    """Every known spelling of a country, whichever one the config uses."""
+    key = normalize(country)
+    for canonical, aliases in COUNTRY_ALIASES.items():
+        if key == canonical or key in map(normalize, aliases):
+            return [canonical, *aliases]
+    return []
+
+
+def _country_key(name: str) -> str:
+    """One key per country, whichever spelling or alias ``name`` uses."""
+    aliases = _country_aliases(name)
+    return aliases[0] if aliases else normalize(name)
+
+
+def _target_key(targets) -> tuple:
+    return tuple(
+        (t["city"], t.get("country", ""), tuple(t.get("aliases", ())), t.get("radius_km"))
+        for t in targets
+    )
+
+
+@lru_cache(maxsize=8)
+def _compile(key: tuple) -> LocationMatcher:
+    return LocationMatcher([
+        {"city": city, "country": country, "aliases": list(aliases), "radius_km": radius}
+        for city, country, aliases, radius in key
+    ])
+
+
+def location_matcher(targets: list[dict]) -> LocationMatcher:
+    """Return the compiled matcher for a list of targets, building it only once."""
+    return _compile(_target_key(targets))
@@ -1,10 +1,11 @@
 """Data models for event tracking."""
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, replace
 from datetime import date, datetime
-from typing import Any
+from typing import Any, Callable, Iterator, TextIO
 import json
 import os
+import re
 import hashlib
 
 
@@ -50,6 +51,10 @@ class Event:
         data["last_updated"] = self.last_updated.isoformat()
         return data
 
+    def same_content(self, other: "Event") -> bool:
+        """Whether two events are equal apart from when they were last updated."""
+        return replace(self, last_updated=other.last_updated) == other
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Event":
         """Create Event from dictionary."""
@@ -79,24 +84,50 @@ class EventStore:
             data = json.load(f)
         return [Event.from_dict(e) for e in data]
 
+    def iter_events(self, chunk_size: int = 65536) -> Iterator[Event]:
+        """Yield stored events one at a time without loading the whole file."""
+        if not os.path.exists(self.filepath):
+            return
+        with open(self.filepath, "r") as f:
+            for data in iter_json_array(f, chunk_size):
+                yield Event.from_dict(data)
+
     def save(self, events: list[Event]) -> None:
-        """Save events to storage."""
+        """Atomically save events to storage, so readers never see a partial file."""
         data = [e.to_dict() for e in events]
-        with open(self.filepath, "w") as f:
+        tmp = f"{self.filepath}.tmp"
+        with open(tmp, "w") as f:
             json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.filepath)
 
-    def merge(self, new_events: list[Event]) -> list[Event]:
-        """Merge new events with existing, updating duplicates."""
+    def merge(self, new_events: list[Event], remove=()) -> list[Event]:
+        """Merge new events with existing, updating duplicates.
+
+        The file is only rewritten if an event was added, removed or its
+        content changed; re-fetching an identical event does not touch the store.
+
+        Args:
+            new_events: Events to add or update
+            remove: Ids of stored events to drop, e.g. superseded duplicates
+        """
         existing = {e.id: e for e in self.load()}
+        changed = False
+        for event_id in remove:
+            changed |= existing.pop(event_id, None) is not None
         for event in new_events:
-            if event.id in existing:
+            current = existing.get(event.id)
+            if current is None:
+                existing[event.id] = event
+                changed = True
+            elif event.last_updated > current.last_updated and not event.same_content(current):
                 # Update existing event if new data is more recent
-                if event.last_updated > existing[event.id].last_updated:
-                    existing[event.id] = event
-            else:
                 existing[event.id] = event
+                changed = True
         events = list(existing.values())
-        self.save(events)
+        if changed:
+            self.save(events)
         return events
 
     def filter(
@@ -108,21 +139,145 @@ class EventStore:
         start_before: date | None = None,
     ) -> list[Event]:
         """Filter events by criteria."""
-        events = self.load()
-        if city:
-            events = [e for e in events if e.city.lower() == city.lower()]
-        if topic:
-            topic_lower = topic.lower()
-            events = [
-                e for e in events if any(topic_lower in t.lower() for t in e.topics)
-            ]
+        predicate = event_filter(city, topic, has_cfp, start_after, start_before)
+        return [e for e in self.load() if predicate(e)]
+
+    def iter_filter(self, **criteria) -> Iterator[Event]:
+        """Stream events matching the same criteria as filter()."""
+        predicate = event_filter(**criteria)
+        return (e for e in self.iter_events() if predicate(e))
+
+
+def event_filter(
+    city: str | None = None,
+    topic: str | None = None,
+    has_cfp: bool | None = None,
+    start_after: date | None = None,
+    start_before: date | None = None,
+    country: str | None = None,
+) -> Callable[[Event], bool]:
+    """Build a predicate implementing the EventStore filter criteria."""
+    city_lower = city.lower() if city else None
+    country_lower = country.lower() if country else None
+    topic_lower = topic.lower() if topic else None
+    today = date.today()
+
+    def predicate(e: Event) -> bool:
+        if city_lower and e.city.lower() != city_lower:
+            return False
+        if country_lower and e.country.lower() != country_lower:
+            return False
+        if topic_lower and not any(topic_lower in t.lower() for t in e.topics):
+            return False
         if has_cfp is not None:
-            if has_cfp:
-                events = [e for e in events if e.cfp_deadline and e.cfp_deadline >= date.today()]
-            else:
-                events = [e for e in events if not e.cfp_deadline or e.cfp_deadline < date.today()]
-        if start_after:
-            events = [e for e in events if e.start_date >= start_after]
-        if start_before:
-            events = [e for e in events if e.start_date <= start_before]
-        return events
+            is_open = bool(e.cfp_deadline and e.cfp_deadline >= today)
+            if is_open != has_cfp:
+                return False
+        if start_after and e.start_date < start_after:
+            return False
+        if start_before and e.start_date > start_before:
+            return False
+        return True
+
+    return predicate
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 65536) -> Iterator[Any]:
+    """Incrementally decode the elements of a top-level JSON array from a file.
+
+    Only one chunk plus the element being decoded is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size).lstrip()
+    if not buf.startswith("["):
+        raise ValueError("Expected a JSON array")
+    pos = 1
+    eof = False
+
+    while True:
+        # Skip whitespace and separators between elements
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+        if pos >= len(buf) or buf[pos] == "]":
+            return
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Element spans the chunk boundary: read more and retry
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        if end == len(buf) and not eof:
+            # A number could continue in the next chunk
+            more = f.read(chunk_size)
+            if more:
+                buf, pos = buf[pos:] + more, 0
+                continue
+            eof = True
+        yield value
+        pos = end
+
+
+# Text kept while looking for the array key, enough for the key and the
+# whitespace around its colon
+_KEY_LOOKBEHIND = 256
+
+
+class JsonArrayStream:
+    """Incrementally decode the objects of a JSON array from streamed text.
+
+    Chunks are fed as they arrive and every object is returned as soon as
+    its closing brace has been received. The array is the value of ``key``
+    in the top-level object, e.g. ``{"events": [...]}``; anything around
+    the JSON, such as a Markdown fence or trailing prose, is ignored.
+    """
+
+    def __init__(self, key: str):
+        self._start = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._in_array = False
+        self.done = False  # The closing bracket of the array was seen
+
+    def feed(self, chunk: str) -> list[Any]:
+        """Add ``chunk`` and return the elements it completed."""
+        if self.done:
+            return []
+        buf = self._buf + chunk
+        pos = 0
+        if not self._in_array:
+            match = self._start.search(buf)
+            if not match:
+                # The key may be split across chunks
+                self._buf = buf[-_KEY_LOOKBEHIND:]
+                return []
+            self._in_array = True
+            pos = match.end()
+
+        items = []
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                break
+            if buf[pos] == "]":
+                self.done = True
+                break
+            try:
+                value, pos = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # The element is not complete yet
+                break
+            items.append(value)
+        self._buf = "" if self.done else buf[pos:]
+        return items
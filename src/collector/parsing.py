@@ -0,0 +1,87 @@
+"""Parse downloaded pages off the event loop.
+
+Decoding a large JSON file or building a BeautifulSoup tree is CPU-bound
+and would stall every other download while it runs. Sources hand the raw
+response bytes to ``run_parser`` instead, which runs a module-level parse
+function in a worker pool and returns its result. Parse functions return
+plain tuples rather than Event objects, so a process pool pickles as little
+as possible on the way back; location matching and topic tagging, which
+depend on the settings, stay in the event loop.
+
+The pool kind and size come from the ``parsing`` section of the config:
+
+    parsing:
+      pool: process   # or thread (default)
+      workers: 4      # 0 picks a size from the CPU count
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache
+
+from ..config import get_settings
+
+_executor: Executor | None = None
+_executor_key: tuple[str, int] | None = None
+
+
+@cache
+def html_backend() -> str:
+    """BeautifulSoup tree builder to use: lxml when installed, else the stdlib parser."""
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return "html.parser"
+    return "lxml"
+
+
+@cache
+def _json_loads():
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+def loads(payload: bytes):
+    """Decode a JSON document, with orjson when it is installed."""
+    return _json_loads()(payload)
+
+
+def get_executor() -> Executor:
+    """The shared parse pool, recreated if the configured kind or size changed."""
+    global _executor, _executor_key
+    settings = get_settings()
+    key = (settings.parse_pool, settings.parse_workers)
+    if _executor is None or key != _executor_key:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        pool, workers = key
+        if pool == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers or None)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=workers or min(4, os.cpu_count() or 1), thread_name_prefix="parse"
+            )
+        _executor_key = key
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the parse pool; the next parse starts a new one."""
+    global _executor, _executor_key
+    if _executor is not None:
+        _executor.shutdown()
+    _executor = _executor_key = None
+
+
+async def run_parser(func, payload: bytes, *args):
+    """Run ``func(payload, *args)`` in the parse pool without blocking the event loop.
+
+    ``func`` must be a module-level function so a process pool can pickle it.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), func, payload, *args)
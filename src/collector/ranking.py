@@ -0,0 +1,276 @@
+"""TF-IDF relevance ranking of events against interest profiles."""
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+
+from ..config import DEFAULT_PROFILES, RELEVANCE_FILE, get_settings
+
+# Relevance scores use the same 1-5 scale as the stored events
+MIN_SCORE = 1.0
+MAX_SCORE = 5.0
+# Cosine similarity at which an event gets the maximum score
+SATURATION = 0.35
+# Scores are recomputed once the corpus has grown or shrunk by this fraction
+# since they were computed, as IDF weights drift with it
+IDF_DRIFT = 0.2
+
+STOPWORDS = frozenset(
+    "a about an and are as at be by for from has have in into is it its of on or our the "
+    "their this to we will with you your conference conf summit meetup event events day days "
+    "edition talks talk community".split()
+)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[/+#.-][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens, keeping compounds such as "ci/cd" and "cloud-native"."""
+    return [
+        token for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS and not token.isdigit()
+    ]
+
+
+def event_terms(event) -> Counter:
+    """Term frequencies of an event's name, topics and description.
+
+    The name and topics count twice: they are short and on point, while
+    descriptions are long and chatty.
+    """
+    terms = Counter(tokenize(event.description or ""))
+    for text in (event.name, *event.topics):
+        for token in tokenize(text):
+            terms[token] += 2
+    return terms
+
+
+def fingerprint(event) -> str:
+    """Hash of the fields ranking depends on, to detect new or changed events."""
+    key = "\x1f".join([event.name, event.description or "", *event.topics])
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def _normalized(weights: dict[str, float]) -> dict[str, float]:
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    return {t: w / norm for t, w in weights.items()} if norm else {}
+
+
+class RelevanceModel:
+    """Sparse TF-IDF model over events, scored against interest profiles.
+
+    Document frequencies and per-event scores are persisted, so each run
+    only tokenizes and scores events that are new or whose text changed.
+    Once the corpus size drifts by IDF_DRIFT from the size the scores were
+    computed at, every score is recomputed the next time its event is
+    ranked; rescore_store() does that for the whole store. prune() drops
+    events that left the store.
+    Scoring a batch is one sparse matrix product: every term of every
+    event row is looked up once in an inverted index of the profile
+    matrix and accumulated into that event's row of profile scores.
+
+    Args:
+        profiles: Profile name -> profile text
+        filepath: JSON file holding the model state, or None to keep it in memory
+    """
+
+    def __init__(self, profiles: dict[str, str] | None = None, filepath: str | None = None):
+        self.profiles = dict(profiles or DEFAULT_PROFILES)
+        self.filepath = filepath
+        self.df = Counter()  # term -> number of events containing it
+        self.docs = {}  # event id -> {"fp", "terms", "score", "profile"}
+        self.scored_size = 0  # Corpus size the current scores were computed at
+        self._profiles_key = hashlib.sha1(
+            json.dumps(self.profiles, sort_keys=True).encode()
+        ).hexdigest()[:16]
+        if filepath and os.path.exists(filepath):
+            with open(filepath) as f:
+                state = json.load(f)
+            self.df = Counter(state.get("df", {}))
+            self.docs = state.get("docs", {})
+            self.scored_size = state.get("scored_size", len(self.docs))
+            if state.get("profiles") != self._profiles_key:
+                # Profiles changed: keep the corpus statistics, drop every score
+                for doc in self.docs.values():
+                    doc["score"] = None
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency."""
+        return math.log((1 + len(self.docs)) / (1 + self.df.get(term, 0))) + 1
+
+    def update(self, events: list) -> list:
+        """Add new or changed events to the corpus; returns those that need scoring."""
+        pending = []
+        for event in events:
+            fp = fingerprint(event)
+            doc = self.docs.get(event.id)
+            if doc and doc["fp"] == fp:
+                if doc["score"] is None:
+                    pending.append(event)
+                continue
+            if doc:
+                self.df.subtract(doc["terms"])
+            terms = sorted(event_terms(event))
+            self.df.update(terms)
+            self.docs[event.id] = {"fp": fp, "terms": terms, "score": None, "profile": None}
+            pending.append(event)
+        return pending
+
+    def reset(self) -> None:
+        """Forget every event, so the next batch is scored against its own statistics."""
+        self.df = Counter()
+        self.docs = {}
+        self.scored_size = 0
+
+    def prune(self, keep) -> int:
+        """Forget events whose ids are not in ``keep``; returns how many were dropped."""
+        keep = set(keep)
+        stale = [event_id for event_id in self.docs if event_id not in keep]
+        for event_id in stale:
+            self.df.subtract(self.docs.pop(event_id)["terms"])
+        return len(stale)
+
+    def _drifted(self) -> bool:
+        return abs(len(self.docs) - self.scored_size) > IDF_DRIFT * self.scored_size
+
+    def _profile_index(self) -> dict[str, list[tuple[int, float]]]:
+        """Inverted index of the L2-normalized profile TF-IDF matrix."""
+        index = {}
+        for column, text in enumerate(self.profiles.values()):
+            counts = Counter(tokenize(text))
+            weights = _normalized({t: n * self.idf(t) for t, n in counts.items()})
+            for term, weight in weights.items():
+                index.setdefault(term, []).append((column, weight))
+        return index
+
+    def similarities(self, events: list) -> list[list[float]]:
+        """Cosine similarity of each event to each profile, in profile order."""
+        index = self._profile_index()
+        width = len(self.profiles)
+        rows = []
+        for event in events:
+            row = [0.0] * width
+            vector = _normalized({t: n * self.idf(t) for t, n in event_terms(event).items()})
+            for term, weight in vector.items():
+                for column, profile_weight in index.get(term, ()):
+                    row[column] += weight * profile_weight
+            rows.append(row)
+        return rows
+
+    def score(self, events: list) -> list[float]:
+        """Relevance scores on the 1-5 scale for a batch of events."""
+        names = list(self.profiles)
+        scores = []
+        for event, row in zip(events, self.similarities(events)):
+            best = max(range(len(row)), key=row.__getitem__) if row else None
+            similarity = row[best] if row else 0.0
+            score = round(MIN_SCORE + (MAX_SCORE - MIN_SCORE) * min(1.0, similarity / SATURATION), 2)
+            doc = self.docs.get(event.id)
+            if doc is not None:
+                doc["score"] = score
+                doc["profile"] = names[best] if best is not None and similarity > 0 else None
+            scores.append(score)
+        return scores
+
+    def rank(self, events: list) -> int:
+        """Set ``relevance_score`` on events, scoring only new or changed ones.
+
+        Returns:
+            The number of events that were (re)scored
+        """
+        pending = self.update(events)
+        if self._drifted():
+            for doc in self.docs.values():
+                doc["score"] = None
+            self.scored_size = len(self.docs)
+            pending = list(events)
+        self.score(pending)
+        for event in events:
+            event.relevance_score = self.docs[event.id]["score"]
+        return len(pending)
+
+    def best_profile(self, event) -> str | None:
+        """The profile an event matched best when it was last scored."""
+        doc = self.docs.get(event.id)
+        return doc["profile"] if doc else None
+
+    def save(self) -> None:
+        """Atomically write the model state to disk."""
+        if not self.filepath:
+            return
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {
+            "profiles": self._profiles_key,
+            "df": {t: n for t, n in self.df.items() if n > 0},
+            "docs": self.docs,
+            "scored_size": self.scored_size,
+        }
+        tmp = f"{self.filepath}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.filepath)
+
+
+def rank_events(events: list, filepath: str = RELEVANCE_FILE, rescore: bool = False) -> int:
+    """Score events against the configured profiles, persisting the model.
+
+    Args:
+        events: Events to score
+        filepath: JSON file holding the model state
+        rescore: Start from an empty model, so scores only depend on ``events``
+
+    Returns:
+        The number of events that were (re)scored
+    """
+    model = RelevanceModel(get_settings().profiles, filepath)
+    if rescore:
+        model.reset()
+    scored = model.rank(events)
+    model.save()
+    return scored
+
+
+def prune_relevance(keep, filepath: str = RELEVANCE_FILE) -> int:
+    """Drop ranking state for events whose ids are not in ``keep``.
+
+    Returns:
+        The number of events dropped
+    """
+    if not os.path.exists(filepath):
+        return 0
+    model = RelevanceModel(get_settings().profiles, filepath)
+    dropped = model.prune(keep)
+    if dropped:
+        model.save()
+    return dropped
+
+
+def rescore_store(store, filepath: str = RELEVANCE_FILE) -> int:
+    """Bring the stored relevance scores up to date with the model.
+
+    A commit only ranks its own batch, so when IDF drift or pruning
+    invalidates every score, the events that were not in the batch keep
+    stale scores in the store until this runs.
+
+    Returns:
+        The number of stored events whose score changed
+    """
+    events = store.load()
+    before = [event.relevance_score for event in events]
+    model = RelevanceModel(get_settings().profiles, filepath)
+    model.rank(events)
+    model.save()
+    changed = sum(score != event.relevance_score for score, event in zip(before, events))
+    if changed:
+        store.save(events)
+    return changed
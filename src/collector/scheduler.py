@@ -0,0 +1,173 @@
+"""Per-source refresh schedule, persisted between collection runs.
+
+Sources split their work into tasks (a confs.tech year and category, a
+papercall keyword, a city for AI search). For every task the scheduler
+records when it last ran, when it last succeeded, a fingerprint of the
+events it returned and when that fingerprint last changed. A task is due
+once its source's refresh interval has passed since its last success; a
+failed task is retried sooner, after at most RETRY_DELAY.
+
+Each source also has a circuit breaker: after BREAKER_THRESHOLD runs in a
+row where none of its tasks succeeded, the source is skipped for a
+cooldown that doubles with every further failed trial run.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+from ..config import SCHEDULE_FILE, get_settings
+
+# Refresh interval for sources missing from the configured schedule
+DEFAULT_INTERVAL = timedelta(days=1)
+# Longest wait before a failed task is retried
+RETRY_DELAY = timedelta(minutes=15)
+# Failed runs in a row that open a source's circuit breaker
+BREAKER_THRESHOLD = 3
+# First and longest time an open breaker skips its source
+BREAKER_COOLDOWN = timedelta(hours=1)
+BREAKER_MAX_COOLDOWN = timedelta(days=1)
+
+
+def fingerprint(events: list) -> str:
+    """Hash of a task's events, ignoring when they were fetched."""
+    rows = sorted(
+        json.dumps({k: v for k, v in e.to_dict().items() if k != "last_updated"}, sort_keys=True)
+        for e in events
+    )
+    return hashlib.sha1("\n".join(rows).encode()).hexdigest()[:16]
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+class SourceScheduler:
+    """Decide which source tasks are due and remember how each run went.
+
+    Args:
+        filepath: JSON file holding the task state, or None to keep it in memory
+        intervals: Source name -> refresh interval in seconds; defaults to
+            the configured schedule, re-read on every lookup so config
+            reloads apply to a running daemon
+    """
+
+    def __init__(self, filepath: str | None = SCHEDULE_FILE, intervals: dict[str, float] | None = None):
+        self.filepath = filepath
+        self._intervals = intervals
+        self.reload()
+
+    def reload(self) -> None:
+        """Replace the in-memory state with the last saved one, dropping unsaved records."""
+        self.tasks = {}  # "source:key" -> {"last_run", "last_success", "last_changed", "fingerprint", "error"}
+        self.breakers = {}  # source -> {"failures", "open_until"}
+        if self.filepath and os.path.exists(self.filepath):
+            with open(self.filepath) as f:
+                state = json.load(f)
+            if "tasks" in state:
+                self.tasks, self.breakers = state["tasks"], state.get("breakers", {})
+            else:
+                # State written before breakers existed: tasks only
+                self.tasks = state
+
+    @staticmethod
+    def task_id(source: str, key: str) -> str:
+        return f"{source}:{key}"
+
+    def interval(self, source: str) -> timedelta:
+        intervals = self._intervals if self._intervals is not None else get_settings().schedule
+        seconds = intervals.get(source)
+        return timedelta(seconds=seconds) if seconds else DEFAULT_INTERVAL
+
+    def due_at(self, source: str, key: str) -> datetime | None:
+        """When a task is next due, or None if it has never run."""
+        entry = self.tasks.get(self.task_id(source, key))
+        if not entry:
+            return None
+        interval = self.interval(source)
+        if entry.get("error") or not entry.get("last_success"):
+            return _parse_time(entry["last_run"]) + min(interval, RETRY_DELAY)
+        return _parse_time(entry["last_success"]) + interval
+
+    def due(self, source: str, keys: list[str], now: datetime) -> list[str]:
+        """The tasks of a source that should run at ``now``."""
+        return [key for key in keys if (self.due_at(source, key) or now) <= now]
+
+    def next_due(self, sources=None) -> datetime | None:
+        """Earliest time a recorded task of the given sources (default: all) is due.
+
+        Tasks of a source whose breaker is open are not due before it closes.
+        """
+        times = []
+        for task_id in self.tasks:
+            source, _, key = task_id.partition(":")
+            if sources is None or source in sources:
+                due = self.due_at(source, key)
+                open_until = self.breaker_open_until(source)
+                times.append(max(due, open_until) if open_until else due)
+        return min(times, default=None)
+
+    def last_changed(self, source: str, key: str) -> datetime | None:
+        """When a task last returned different events."""
+        entry = self.tasks.get(self.task_id(source, key))
+        return _parse_time(entry.get("last_changed")) if entry else None
+
+    def record(self, source: str, key: str, result, now: datetime) -> bool:
+        """Record a task's outcome: its events or the exception it raised.
+
+        Returns:
+            Whether the task returned events that differ from its last success
+        """
+        entry = self.tasks.setdefault(self.task_id(source, key), {})
+        entry["last_run"] = now.isoformat()
+        if isinstance(result, BaseException):
+            entry["error"] = f"{type(result).__name__}: {result}"
+            return False
+        fp = fingerprint(result)
+        changed = fp != entry.get("fingerprint")
+        entry.update(last_success=now.isoformat(), fingerprint=fp, error=None)
+        if changed:
+            entry["last_changed"] = now.isoformat()
+        return changed
+
+    def allow(self, source: str, now: datetime) -> bool:
+        """Whether a source may run, i.e. its breaker is closed or its cooldown is over."""
+        open_until = _parse_time(self.breakers.get(source, {}).get("open_until"))
+        return open_until is None or open_until <= now
+
+    def breaker_open_until(self, source: str) -> datetime | None:
+        return _parse_time(self.breakers.get(source, {}).get("open_until"))
+
+    def record_run(self, source: str, ok: bool, now: datetime) -> None:
+        """Record whether any task of a source succeeded in a run, tripping its breaker."""
+        if ok:
+            self.breakers.pop(source, None)
+            return
+        breaker = self.breakers.setdefault(source, {"failures": 0, "open_until": None})
+        breaker["failures"] += 1
+        if breaker["failures"] >= BREAKER_THRESHOLD:
+            doublings = min(breaker["failures"] - BREAKER_THRESHOLD, 10)
+            cooldown = min(BREAKER_COOLDOWN * 2 ** doublings, BREAKER_MAX_COOLDOWN)
+            breaker["open_until"] = (now + cooldown).isoformat()
+
+    def prune(self, source: str, keys: list[str]) -> None:
+        """Forget tasks a source no longer has, e.g. last year's confs.tech files."""
+        current = {self.task_id(source, key) for key in keys}
+        prefix = f"{source}:"
+        for task_id in [t for t in self.tasks if t.startswith(prefix) and t not in current]:
+            del self.tasks[task_id]
+
+    def save(self) -> None:
+        """Atomically write the task and breaker state to disk."""
+        if not self.filepath:
+            return
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.filepath}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"tasks": self.tasks, "breakers": self.breakers}, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.filepath)
@@ -0,0 +1,117 @@
+"""Sharded collection and merging of the partial stores it produces.
+
+``collect --shard i/n`` runs only the source tasks assigned to shard ``i``
+of ``n`` (numbered from 0) and commits them to a partial store of its own,
+so a CI matrix can spread the slow per-city AI search over several runners.
+Each source's tasks are dealt round-robin, starting at a shard picked from
+a hash of the source name: the assignment depends only on the task lists,
+never on which sources are enabled or failing on a runner, and every shard
+gets an equal share of each source give or take one task.
+
+``merge`` then combines the partial stores into one with the same rules as
+a single run: versions of an event with the same id keep the most recent,
+and events with the same normalized name and start date keep the most
+complete. Ties are broken on content, so the result does not depend on the
+order the partial stores are given in. Each shard scored its events against
+its own part of the corpus, so the merged events are scored again as a whole.
+"""
+
+import glob
+import json
+import os
+import zlib
+from dataclasses import dataclass
+
+from ..config import SHARDS_DIR
+from .agent import _event_completeness, _normalize_name
+from .models import Event, EventStore
+from .ranking import rank_events
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One of ``count`` slices of the collection work."""
+
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def select(self, source: str, keys: list[str]) -> list[str]:
+        """The tasks of ``source`` that belong to this shard."""
+        offset = zlib.crc32(source.encode())
+        return [key for i, key in enumerate(keys) if (i + offset) % self.count == self.index]
+
+    @property
+    def events_file(self) -> str:
+        """Partial store this shard commits to."""
+        return os.path.join(SHARDS_DIR, f"events-{self.index}-of-{self.count}.json")
+
+    @property
+    def schedule_file(self) -> str:
+        """Schedule state for this shard's tasks."""
+        return os.path.join(SHARDS_DIR, f"schedule-{self.index}-of-{self.count}.json")
+
+
+def parse_shard(text: str) -> Shard:
+    """Parse an ``i/n`` shard spec such as ``0/4``.
+
+    Raises:
+        ValueError: If the spec is malformed or ``i`` is not in 0..n-1
+    """
+    index, sep, count = text.partition("/")
+    try:
+        shard = Shard(int(index), int(count))
+    except ValueError:
+        raise ValueError(f"shard must look like i/n, got {text!r}") from None
+    if not sep or shard.count < 1 or not 0 <= shard.index < shard.count:
+        raise ValueError(f"shard index must be between 0 and n-1, got {text!r}")
+    return shard
+
+
+def partial_stores() -> list[str]:
+    """Partial stores written by sharded runs, in name order."""
+    return sorted(glob.glob(os.path.join(SHARDS_DIR, "events-*-of-*.json")))
+
+
+def merge_stores(paths: list[str], output: str) -> list[Event]:
+    """Merge partial stores into ``output``, which takes part as one more input.
+
+    Every input is streamed once; only the surviving version of each event
+    is kept in memory. The events are rescored against the merged corpus,
+    so their relevance does not depend on how the tasks were split. The
+    output is sorted by start date and id and replaced atomically.
+
+    Returns:
+        The merged events
+    """
+    # (normalized name, start date) -> id -> newest version of that event
+    groups: dict[tuple[str, str], dict[str, Event]] = {}
+    inputs = [output, *paths] if os.path.exists(output) else list(paths)
+    for path in inputs:
+        for event in EventStore(path).iter_events():
+            versions = groups.setdefault((_normalize_name(event.name), event.start_date.isoformat()), {})
+            current = versions.get(event.id)
+            if current is None or _version(event) > _version(current):
+                versions[event.id] = event
+
+    # Keep the most complete event of each group, as the collection pipeline does
+    events = [
+        max(versions.values(), key=lambda e: (_event_completeness(e), e.id)) for versions in groups.values()
+    ]
+    events.sort(key=lambda e: (e.start_date, e.id))
+    rank_events(events, rescore=True)
+
+    # EventStore creates the output directory
+    EventStore(output)
+    tmp = f"{output}.tmp"
+    with open(tmp, "w") as f:
+        json.dump([e.to_dict() for e in events], f, indent=2)
+    os.replace(tmp, output)
+    return events
+
+
+def _version(event: Event) -> tuple:
+    """Sort key for versions of one event: the most recent wins, ties are broken by content."""
+    return event.last_updated, json.dumps(event.to_dict(), sort_keys=True)
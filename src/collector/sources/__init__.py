@@ -1 +1,56 @@
-"""Data source collectors."""
+"""Data source collectors.
+
+Sources are registered by name and imported on first use, so a command
+only pays for the HTTP, HTML and AI libraries of the sources it runs.
+
+Every source module splits its work into scheduler tasks and provides:
+
+- ``task_keys() -> list[str]``: the tasks it currently has
+- ``stream(keys)``: an async generator running some of them and yielding
+  ``(key, events)`` as soon as each task is parsed, or ``(key, exception)``
+  for a task that failed
+"""
+
+import importlib
+from dataclasses import dataclass
+
+# Time budget for a source without a registry entry
+DEFAULT_TIMEOUT = 60.0
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """Registry entry for a source."""
+
+    module: str  # Module in this package
+    timeout: float = DEFAULT_TIMEOUT  # Seconds for all of the source's tasks in one run
+    ai: bool = False  # Calls the Gemini API; skipped with --no-ai
+
+
+SOURCES = {
+    "confs.tech": SourceSpec("confs_tech", timeout=60.0),
+    "papercall": SourceSpec("papercall", timeout=90.0),
+    "ai_search": SourceSpec("web_search", timeout=300.0, ai=True),
+}
+
+AI_SOURCES = frozenset(name for name, spec in SOURCES.items() if spec.ai)
+
+
+def source_names(use_ai: bool = True) -> list[str]:
+    """Registered source names, in collection order."""
+    return [name for name in SOURCES if use_ai or name not in AI_SOURCES]
+
+
+def load_source(name: str):
+    """Import and return a source's module.
+
+    Raises:
+        KeyError: If no source is registered under ``name``
+    """
+    return importlib.import_module(f".{SOURCES[name].module}", __name__)
+
+
+def source_timeout(name: str) -> float:
+    """Seconds a source may take for all of its tasks in one run."""
+    spec = SOURCES.get(name)
+    return spec.timeout if spec else DEFAULT_TIMEOUT
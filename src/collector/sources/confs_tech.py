@@ -1,15 +1,95 @@
-"""Collector for confs.tech - open source conference list."""
+"""Collector for confs.tech - open source conference list.
+
+In the default "files" mode every year and category is one request for its
+JSON file. In "archive" mode (``confs_tech: {mode: archive}`` in the config)
+the whole conference-data repository is downloaded as one compressed
+archive, every category and year is indexed in CONFS_TECH_INDEX_FILE, and
+collection is answered from that index. The archive is only downloaded
+again when its ETag changed; a local checkout of the repository can be
+used instead and is rescanned incrementally by file modification time.
+"""
+
+import io
+import json
+import os
+import re
+import tarfile
 
 import httpx
+from collections.abc import AsyncIterator
 from datetime import date, datetime
+from ..http import HedgedClient
+from ..dates import parse_date
 from ..models import Event
-from ...config import TARGET_CITIES, TOPICS
+from ..parsing import loads, run_parser
+from ...config import CONFS_TECH_INDEX_FILE, get_settings
 
 
 CONFS_TECH_BASE = "https://raw.githubusercontent.com/tech-conferences/conference-data/main/conferences"
+CONFS_TECH_ARCHIVE = "https://codeload.github.com/tech-conferences/conference-data/tar.gz/refs/heads/main"
 
 # confs.tech category mappings for our topics
 CATEGORIES = ["devops", "cloud", "general"]
+# Topics implied by a category; conferences in other categories need a topic match
+CATEGORY_TOPICS = {"devops": "devops", "cloud": "cloud native"}
+
+# Scheduler task of archive mode, which covers every category at once
+ARCHIVE_TASK = "archive"
+# "conferences/2030/devops.json", at any depth inside an archive or checkout
+_DATA_FILE = re.compile(r"(?:^|/)conferences/(\d{4})/([\w-]+)\.json$")
+# Conference fields kept in the index
+_INDEX_FIELDS = (
+    "name", "url", "startDate", "endDate", "city", "country", "cfpUrl", "cfpEndDate", "description"
+)
+
+
+def task_keys() -> list[str]:
+    """Scheduler tasks: one per category file for this year and next, or the archive."""
+    if get_settings().confs_tech_mode == "archive":
+        return [ARCHIVE_TASK]
+    return [f"{y}/{category}" for y in _years() for category in CATEGORIES]
+
+
+def _years() -> list[int]:
+    year = date.today().year
+    return [year, year + 1]
+
+
+async def stream(keys: list[str]) -> AsyncIterator[tuple[str, list[Event] | Exception]]:
+    """Fetch the given "year/category" files, sharing one HTTP client.
+
+    The archive task syncs the local index and yields the conferences of
+    this year and next in every category.
+
+    Yields:
+        (task key, parsed events or the exception it failed with), as soon
+        as each file is parsed
+    """
+    async with httpx.AsyncClient(timeout=30.0) as http:
+        client = HedgedClient(http)
+        for key in keys:
+            if key == ARCHIVE_TASK:
+                try:
+                    index = await sync_index(client)
+                    result = _index_events(index, _years())
+                except Exception as e:
+                    result = e
+                yield key, result
+                continue
+
+            year, _, category = key.partition("/")
+            try:
+                response = await client.get(f"{CONFS_TECH_BASE}/{year}/{category}.json")
+                if response.status_code == 404:
+                    # Category file may not exist for all years
+                    result = []
+                else:
+                    response.raise_for_status()
+                    rows = await run_parser(_decode_conferences, response.content)
+                    result = _build_events(rows, category)
+            except Exception as e:
+                result = e
+            yield key, result
 
 
 async def fetch_conferences(year: int | None = None) -> list[Event]:
@@ -17,77 +97,90 @@ async def fetch_conferences(year: int | None = None) -> list[Event]:
     if year is None:
         year = date.today().year
 
-    events = []
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for category in CATEGORIES:
-            url = f"{CONFS_TECH_BASE}/{year}/{category}.json"
-            try:
-                response = await client.get(url)
-                if response.status_code == 200:
-                    data = response.json()
-                    events.extend(_parse_conferences(data, category))
-            except Exception:
-                # Category file may not exist for all years
-                continue
+    if get_settings().confs_tech_mode == "archive":
+        async with httpx.AsyncClient(timeout=30.0) as http:
+            return _index_events(await sync_index(HedgedClient(http)), [year])
 
+    events = []
+    async for _, result in stream([f"{year}/{category}" for category in CATEGORIES]):
+        if not isinstance(result, Exception):
+            events.extend(result)
     return events
 
 
-def _parse_conferences(data: list[dict], category: str) -> list[Event]:
-    """Parse conference data from confs.tech format."""
-    events = []
-    target_cities_lower = {c["city"].lower() for c in TARGET_CITIES}
-    target_countries = {c["country"].lower() for c in TARGET_CITIES}
+# Fields a worker extracts from each conference, in this order
+ConferenceRow = tuple[
+    str,  # name
+    str,  # description
+    str,  # city
+    str,  # country
+    date,  # start date
+    date | None,  # end date
+    date | None,  # CFP deadline
+    str | None,  # CFP URL
+    str,  # website
+]
 
-    for conf in data:
-        city = conf.get("city", "")
-        country = conf.get("country", "")
 
-        # Check if event is in our target locations
-        city_match = city.lower() in target_cities_lower
-        country_match = country.lower() in target_countries
+def _decode_conferences(payload: bytes) -> list[ConferenceRow]:
+    """Decode a category file into conference rows; runs in the parse pool."""
+    return _conference_rows(loads(payload))
 
-        if not (city_match or country_match):
+
+def _conference_rows(data: list[dict]) -> list[ConferenceRow]:
+    """Extract the fields we use, dropping conferences without a valid start date."""
+    rows = []
+    for conf in data:
+        start_date = parse_date(conf.get("startDate"), fuzzy=False)
+        if start_date is None:
             continue
+        rows.append(
+            (
+                conf.get("name", ""),
+                conf.get("description") or "",
+                conf.get("city", ""),
+                conf.get("country", ""),
+                start_date,
+                parse_date(conf.get("endDate"), fuzzy=False),
+                parse_date(conf.get("cfpEndDate"), fuzzy=False),
+                conf.get("cfpUrl") or None,
+                conf.get("url", ""),
+            )
+        )
+    return rows
 
-        # Check topic relevance
-        name_lower = conf.get("name", "").lower()
-        topics_found = [t for t in TOPICS if t.lower() in name_lower]
 
-        # Add category as topic
-        if category == "devops":
-            topics_found.append("devops")
-        elif category == "cloud":
-            topics_found.append("cloud native")
+def _parse_conferences(data: list[dict], category: str) -> list[Event]:
+    """Parse conference data from confs.tech format."""
+    return _build_events(_conference_rows(data), category)
 
-        if not topics_found and category == "general":
-            # Skip general conferences without relevant keywords
-            continue
 
-        try:
-            start_date = date.fromisoformat(conf["startDate"])
-        except (KeyError, ValueError):
-            continue
+def _build_events(rows: list[ConferenceRow], category: str) -> list[Event]:
+    """Turn conference rows in our target locations into events."""
+    events = []
+    settings = get_settings()
+    matcher = settings.matcher
+    # Tag every conference name and description in one pass
+    tags = settings.topic_classifier.classify_many([f"{row[0]}\n{row[1]}" for row in rows])
 
-        end_date = None
-        if conf.get("endDate"):
-            try:
-                end_date = date.fromisoformat(conf["endDate"])
-            except ValueError:
-                pass
+    for row, topics_found in zip(rows, tags):
+        name, description, city, country, start_date, end_date, cfp_deadline, cfp_url, website = row
 
-        cfp_deadline = None
-        cfp_url = None
-        if conf.get("cfpEndDate"):
-            try:
-                cfp_deadline = date.fromisoformat(conf["cfpEndDate"])
-            except ValueError:
-                pass
-        if conf.get("cfpUrl"):
-            cfp_url = conf["cfpUrl"]
+        # Check if event is in our target locations, accepting aliases
+        found = matcher.resolve(city, country)
+        if found is None:
+            continue
+        city, country = found
+
+        # Add category as topic
+        if category in CATEGORY_TOPICS:
+            topics_found.append(CATEGORY_TOPICS[category])
+        elif not topics_found:
+            # Skip general conferences without relevant keywords
+            continue
 
         event = Event(
-            name=conf.get("name", ""),
+            name=name,
             city=city,
             country=country,
             start_date=start_date,
@@ -96,9 +189,8 @@ def _parse_conferences(data: list[dict], category: str) -> list[Event]:
             topics=list(set(topics_found)),
             cfp_deadline=cfp_deadline,
             cfp_url=cfp_url,
-            website=conf.get("url", ""),
-            description=conf.get("description", ""),
-            relevance_score=_calculate_relevance(conf, topics_found),
+            website=website,
+            description=description,
             last_updated=datetime.now(),
         )
         events.append(event)
@@ -106,12 +198,152 @@ def _parse_conferences(data: list[dict], category: str) -> list[Event]:
     return events
 
 
-def _calculate_relevance(conf: dict, topics_found: list[str]) -> float:
-    """Calculate relevance score based on topic matches."""
-    score = 0.3  # Base score for being in target location
-    score += min(0.5, len(topics_found) * 0.15)  # Topic matches
-    if conf.get("cfpUrl"):
-        score += 0.1  # Has CFP
-    if conf.get("twitter"):
-        score += 0.1  # Active community presence
-    return min(1.0, score)
+class ConferenceIndex:
+    """Local index of the confs.tech dataset: "year/category" -> conferences.
+
+    Args:
+        filepath: JSON file the index is kept in (None: memory only)
+    """
+
+    def __init__(self, filepath: str | None = CONFS_TECH_INDEX_FILE):
+        self.filepath = filepath
+        self.source = ""  # Archive URL or path the index was built from
+        self.etag = None  # ETag of the downloaded archive
+        self.mtimes = {}  # "year/category" -> mtime of the file in a local checkout
+        self.files = {}  # "year/category" -> conferences
+        if filepath and os.path.exists(filepath):
+            with open(filepath) as f:
+                data = json.load(f)
+            self.source = data.get("source", "")
+            self.etag = data.get("etag")
+            self.mtimes = data.get("mtimes", {})
+            self.files = data.get("files", {})
+
+    def keys(self, years: list[int]) -> list[str]:
+        """Indexed "year/category" keys for the given years, in order."""
+        prefixes = tuple(f"{year}/" for year in years)
+        return sorted(key for key in self.files if key.startswith(prefixes))
+
+    def replace(self, source: str, files: dict[str, list[dict]], etag=None, mtimes=None) -> None:
+        self.source, self.files, self.etag, self.mtimes = source, files, etag, mtimes or {}
+
+    def save(self) -> None:
+        if not self.filepath:
+            return
+        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        tmp = f"{self.filepath}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                {"source": self.source, "etag": self.etag, "mtimes": self.mtimes, "files": self.files}, f
+            )
+        os.replace(tmp, self.filepath)
+
+
+async def sync_index(
+    client: HedgedClient, index: ConferenceIndex | None = None, source: str | None = None
+) -> ConferenceIndex:
+    """Bring the local index up to date with the configured archive.
+
+    A URL costs one conditional request, answered with 304 while the archive
+    is unchanged. A local archive file is re-read, and a local checkout only
+    has its changed files re-read.
+
+    Raises:
+        httpx.HTTPStatusError: If the archive could not be downloaded
+    """
+    index = index or ConferenceIndex(CONFS_TECH_INDEX_FILE)
+    source = source or get_settings().confs_tech_archive or CONFS_TECH_ARCHIVE
+    if source != index.source:
+        index.replace(source, {})
+
+    if os.path.isdir(source):
+        changed, mtimes = await run_parser(_scan_checkout, source, index.mtimes)
+        if changed or mtimes.keys() != index.mtimes.keys():
+            files = {key: index.files[key] for key in mtimes if key not in changed}
+            index.replace(source, {**files, **changed}, mtimes=mtimes)
+            index.save()
+    elif os.path.isfile(source):
+        with open(source, "rb") as f:
+            payload = f.read()
+        index.replace(source, await run_parser(_index_archive, payload))
+        index.save()
+    else:
+        headers = {"If-None-Match": index.etag} if index.etag and index.files else {}
+        # One large download: retried, but not hedged
+        response = await client.get(source, hedge=False, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+            files = await run_parser(_index_archive, response.content)
+            index.replace(source, files, etag=response.headers.get("etag"))
+            index.save()
+    return index
+
+
+def _index_events(index: ConferenceIndex, years: list[int]) -> list[Event]:
+    """Events of every indexed category in ``years``.
+
+    A conference listed in several categories becomes one event with the
+    topics of all of them.
+    """
+    events = {}
+    for key in index.keys(years):
+        category = key.partition("/")[2]
+        for event in _parse_conferences(index.files[key], category):
+            current = events.get(event.id)
+            if current is None:
+                events[event.id] = event
+            else:
+                current.topics = sorted(set(current.topics) | set(event.topics))
+    return list(events.values())
+
+
+def _index_archive(payload: bytes) -> dict[str, list[dict]]:
+    """Index every data file of a conference-data .tar.gz; runs in the parse pool.
+
+    Members are read in memory, nothing is extracted to disk.
+    """
+    files = {}
+    with tarfile.open(fileobj=io.BytesIO(payload), mode="r:gz") as archive:
+        for member in archive:
+            match = _DATA_FILE.search(member.name)
+            if not match or not member.isfile():
+                continue
+            data = loads(archive.extractfile(member).read())
+            files[f"{match[1]}/{match[2]}"] = _index_fields(data)
+    return files
+
+
+def _scan_checkout(root: str, mtimes: dict[str, int]) -> tuple[dict[str, list[dict]], dict[str, int]]:
+    """Read the data files of a checkout changed since ``mtimes``; runs in the parse pool.
+
+    Returns:
+        (the changed files, the mtime of every data file now present)
+    """
+    changed, current = {}, {}
+    conferences = os.path.join(root, "conferences")
+    for year in sorted(os.listdir(conferences)) if os.path.isdir(conferences) else []:
+        year_dir = os.path.join(conferences, year)
+        if not os.path.isdir(year_dir):
+            continue
+        for name in sorted(os.listdir(year_dir)):
+            match = _DATA_FILE.search(f"conferences/{year}/{name}")
+            if not match:
+                continue
+            key = f"{match[1]}/{match[2]}"
+            path = os.path.join(year_dir, name)
+            current[key] = os.stat(path).st_mtime_ns
+            if mtimes.get(key) != current[key]:
+                with open(path, "rb") as f:
+                    changed[key] = _index_fields(loads(f.read()))
+    return changed, current
+
+
+def _index_fields(data) -> list[dict]:
+    """Keep only the conference fields the collector uses."""
+    if not isinstance(data, list):
+        return []
+    return [
+        {field: conf[field] for field in _INDEX_FIELDS if conf.get(field) is not None}
+        for conf in data
+        if isinstance(conf, dict)
+    ]
@@ -2,30 +2,56 @@
 
 import httpx
 from bs4 import BeautifulSoup
+from collections.abc import AsyncIterator
 from datetime import date, datetime
+from ..http import HedgedClient
+from ..dates import parse_date, parse_date_range
 from ..models import Event
-from ...config import TARGET_CITIES, TOPICS
+from ..parsing import html_backend, run_parser
+from ...config import get_settings
 
 
 PAPERCALL_URL = "https://www.papercall.io/events"
 
 
-async def fetch_cfps() -> list[Event]:
-    """Fetch CFPs from papercall.io by scraping the events page."""
-    events = []
-    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-        # Search for relevant CFPs
-        for topic in ["devops", "kubernetes", "cloud", "platform"]:
+# Search keywords, each one scheduler task
+KEYWORDS = ["devops", "kubernetes", "cloud", "platform"]
+
+
+def task_keys() -> list[str]:
+    """Scheduler tasks: one per search keyword."""
+    return list(KEYWORDS)
+
+
+async def stream(keys: list[str]) -> AsyncIterator[tuple[str, list[Event] | Exception]]:
+    """Search papercall.io for each keyword, sharing one HTTP client.
+
+    Yields:
+        (keyword, parsed events or the exception it failed with), as soon
+        as each results page is parsed
+    """
+    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as http:
+        client = HedgedClient(http)
+        for topic in keys:
             try:
                 response = await client.get(
                     PAPERCALL_URL,
                     params={"keywords": topic},
                     headers={"User-Agent": "Mozilla/5.0 (compatible; gather-cnf/1.0)"},
                 )
-                if response.status_code == 200:
-                    events.extend(_parse_papercall_page(response.text))
-            except Exception:
-                continue
+                response.raise_for_status()
+                result = _build_events(await run_parser(_extract_cards, response.content))
+            except Exception as e:
+                result = e
+            yield topic, result
+
+
+async def fetch_cfps() -> list[Event]:
+    """Fetch CFPs from papercall.io by scraping the events page."""
+    events = []
+    async for _, result in stream(KEYWORDS):
+        if not isinstance(result, Exception):
+            events.extend(result)
 
     # Deduplicate by name
     seen = set()
@@ -38,13 +64,15 @@ async def fetch_cfps() -> list[Event]:
     return unique_events
 
 
-def _parse_papercall_page(html: str) -> list[Event]:
-    """Parse papercall.io events page."""
-    events = []
-    soup = BeautifulSoup(html, "html.parser")
+# Fields a worker extracts from each event card: name, location, start
+# and end date, CFP deadline and link
+CardRow = tuple[str, str, date | None, date | None, date | None, str]
 
-    target_cities_lower = {c["city"].lower() for c in TARGET_CITIES}
-    target_countries = {c["country"].lower() for c in TARGET_CITIES}
+
+def _extract_cards(payload: bytes | str) -> list[CardRow]:
+    """Extract the event cards of a results page; runs in the parse pool."""
+    soup = BeautifulSoup(payload, html_backend())
+    rows = []
 
     # Find event cards
     for card in soup.select(".event-card, .event-listing, article.event"):
@@ -58,29 +86,11 @@ def _parse_papercall_page(html: str) -> list[Event]:
             location_elem = card.select_one(".location, .event-location, .city")
             location = location_elem.get_text(strip=True) if location_elem else ""
 
-            # Check if in target location
-            location_lower = location.lower()
-            in_target = any(city in location_lower for city in target_cities_lower)
-            in_target = in_target or any(
-                country in location_lower for country in target_countries
-            )
-
-            if not in_target:
-                continue
-
             # Get dates
             date_elem = card.select_one(".date, .event-date, time")
             cfp_date_elem = card.select_one(".cfp-date, .deadline")
-
-            start_date = _parse_date_text(
-                date_elem.get_text(strip=True) if date_elem else ""
-            )
-            if not start_date:
-                start_date = date.today()  # Default to today if no date found
-
-            cfp_deadline = _parse_date_text(
-                cfp_date_elem.get_text(strip=True) if cfp_date_elem else ""
-            )
+            start_date, end_date = parse_date_range(_date_text(date_elem))
+            cfp_deadline = parse_date(_date_text(cfp_date_elem))
 
             # Get link
             link_elem = card.select_one("a[href]")
@@ -88,51 +98,64 @@ def _parse_papercall_page(html: str) -> list[Event]:
             if website and website.startswith("/"):
                 website = f"https://www.papercall.io{website}"
 
-            # Determine city and country from location
-            city, country = _parse_location(location)
-
-            # Check topic relevance
-            name_lower = name.lower()
-            topics_found = [t for t in TOPICS if t.lower() in name_lower]
-
-            event = Event(
-                name=name,
-                city=city,
-                country=country,
-                start_date=start_date,
-                event_type="conference",
-                topics=topics_found if topics_found else ["cloud native"],
-                cfp_deadline=cfp_deadline,
-                cfp_url=website,
-                website=website,
-                description="",
-                relevance_score=0.6,
-                last_updated=datetime.now(),
-            )
-            events.append(event)
-
+            rows.append((name, location, start_date, end_date, cfp_deadline, website))
         except Exception:
             continue
 
-    return events
+    return rows
 
 
-def _parse_date_text(text: str) -> date | None:
-    """Parse date from various text formats."""
-    import re
-    from dateutil import parser
+def _parse_papercall_page(html: bytes | str) -> list[Event]:
+    """Parse papercall.io events page."""
+    return _build_events(_extract_cards(html))
+
+
+def _build_events(rows: list[CardRow]) -> list[Event]:
+    """Turn event cards in our target locations into events."""
+    events = []
+    settings = get_settings()
+    matcher = settings.matcher
 
-    if not text:
-        return None
+    for name, location, start_date, end_date, cfp_deadline, website in rows:
+        # Check if in target location
+        match = matcher.match(location)
+        if not match or not start_date:
+            continue
+
+        # Determine city and country from location
+        if match.kind != "country":
+            city, country = match.city, match.country
+        else:
+            city = _parse_location(location)[0]
+            country = match.country
+
+        # Check topic relevance
+        topics_found = settings.topic_classifier.classify(name)
+
+        event = Event(
+            name=name,
+            city=city,
+            country=country,
+            start_date=start_date,
+            end_date=end_date,
+            event_type="conference",
+            topics=topics_found if topics_found else ["cloud native"],
+            cfp_deadline=cfp_deadline,
+            cfp_url=website,
+            website=website,
+            description="",
+            last_updated=datetime.now(),
+        )
+        events.append(event)
+
+    return events
 
-    # Clean up the text
-    text = re.sub(r"(CFP|closes?|ends?|deadline):?\s*", "", text, flags=re.IGNORECASE)
-    text = text.strip()
 
-    try:
-        return parser.parse(text, fuzzy=True).date()
-    except Exception:
-        return None
+def _date_text(elem) -> str:
+    """Text of a date element, preferring a machine-readable datetime attribute."""
+    if elem is None:
+        return ""
+    return elem.get("datetime") or elem.get_text(" ", strip=True)
 
 
 def _parse_location(location: str) -> tuple[str, str]:
@@ -1,149 +1,191 @@
 """AI-powered web search for event discovery using Gemini."""
 
 import json
-import re
+from collections.abc import AsyncIterator
 from datetime import date, datetime
 
 import httpx
-from google import genai
-from google.genai import types
 
-from ...config import GEMINI_API_KEY, TARGET_CITIES, TOPICS
-from ..models import Event
+from ...config import GEMINI_API_KEY, get_settings
+from ..dates import parse_date
+from ..http import HedgedClient
+from ..models import Event, JsonArrayStream
 
 
-async def search_events() -> list[Event]:
-    """Use Gemini to search for and extract event information."""
+def task_keys() -> list[str]:
+    """Scheduler tasks: one per configured city, none without an API key."""
     if not GEMINI_API_KEY:
         print("Warning: GEMINI_API_KEY not set, skipping AI search")
         return []
+    return get_settings().city_names
 
-    print(f"Starting Gemini search with API key: {GEMINI_API_KEY[:3]}...")
 
-    client = genai.Client(api_key=GEMINI_API_KEY)
+async def search_events() -> list[Event]:
+    """Use Gemini to search for and extract event information."""
     events = []
+    async for _, result in stream(task_keys()):
+        if not isinstance(result, Exception):
+            events.extend(result)
+    return events
 
-    for location in TARGET_CITIES:
-        city = location["city"]
-        country = location["country"]
-
-        # Build search query for Gemini
-        topics_str = ", ".join(TOPICS[:5])
-        current_year = date.today().year
-
-        prompt = f"""Search for upcoming tech conferences and meetups in {city}, {country} for {current_year} and {current_year + 1}.
-
-Focus on events related to: {topics_str}
 
-For each event you find, provide the following information in JSON format:
-{{
-  "events": [
-    {{
-      "name": "Event Name",
-      "city": "{city}",
-      "country": "{country}",
-      "start_date": "YYYY-MM-DD",
-      "end_date": "YYYY-MM-DD or null",
-      "event_type": "conference or meetup or workshop",
-      "topics": ["topic1", "topic2"],
-      "cfp_deadline": "YYYY-MM-DD or null",
-      "cfp_url": "https://... or null",
-      "website": "https://...",
-      "description": "Brief description"
-    }}
-  ]
-}}
+GEMINI_MODEL = "gemini-3-flash-preview"
+
+# Response schemas: the model's output is constrained to valid JSON of this
+# shape, with properties in this order
+EVENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "city": {"type": "string"},
+        "country": {"type": "string"},
+        "start_date": {"type": "string", "format": "date"},
+        "end_date": {"type": ["string", "null"], "format": "date"},
+        "event_type": {"type": "string", "enum": ["conference", "meetup", "workshop"]},
+        "topics": {"type": "array", "items": {"type": "string"}},
+        "cfp_deadline": {"type": ["string", "null"], "format": "date"},
+        "cfp_url": {"type": ["string", "null"]},
+        "website": {"type": "string"},
+        "description": {"type": "string"},
+    },
+    "required": ["name", "start_date", "website"],
+}
+EVENTS_SCHEMA = {
+    "type": "object",
+    "properties": {"events": {"type": "array", "items": EVENT_SCHEMA}},
+    "required": ["events"],
+}
+CFP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "cfp_deadline": {"type": ["string", "null"], "format": "date"},
+        "cfp_url": {"type": ["string", "null"]},
+        "cfp_open": {"type": "boolean"},
+        "topics": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["cfp_deadline", "cfp_url", "cfp_open", "topics"],
+}
+
+
+def _client():
+    """Gemini client; the SDK takes most of a second to import, so only load it when AI search runs."""
+    from google import genai
+
+    return genai.Client(api_key=GEMINI_API_KEY)
+
+
+def _config(schema: dict):
+    """Generation config with Google Search grounding and JSON output constrained to ``schema``."""
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        tools=[types.Tool(google_search=types.GoogleSearch())],
+        response_mime_type="application/json",
+        response_json_schema=schema,
+    )
+
+
+async def stream(keys: list[str]) -> AsyncIterator[tuple[str, list[Event] | Exception]]:
+    """Ask Gemini for events in each of the given cities.
+
+    Yields:
+        (city, parsed events or the exception the search failed with), as
+        soon as each city's answer has been streamed
+    """
+    if not keys:
+        return
 
-Only include events that:
-1. Are actually in {city}, {country}
-2. Are related to DevOps, CI/CD, Cloud Native, Kubernetes, or Platform Engineering
-3. Have dates in the future or within the last month
-4. You are reasonably confident about
+    print(f"Starting Gemini search with API key: {GEMINI_API_KEY[:3]}...")
+    client = _client()
 
-Return ONLY the JSON, no other text."""
+    settings = get_settings()
+    for location in settings.cities:
+        if location["city"] not in keys:
+            continue
+        # Countries left out of the config are resolved from the gazetteer
+        city, country = settings.matcher.city(location["city"]) or (location["city"], location["country"])
 
         try:
             print(f"Querying Gemini for {city}, {country}...")
-            response = client.models.generate_content(
-                model="gemini-3-flash-preview",
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    tools=[types.Tool(google_search=types.GoogleSearch())],
-                ),
-            )
-            content = response.text
-            print(f"Gemini response for {city}: {len(content)} chars")
-            parsed_events = _parse_response(content, city, country)
-            print(f"Parsed {len(parsed_events)} events for {city}")
-            events.extend(parsed_events)
-
+            result = [event async for event in search_city(client, city, country)]
+            print(f"Parsed {len(result)} events for {city}")
         except Exception as e:
             print(f"Error searching events for {city}: {type(e).__name__}: {e}")
-            continue
+            result = e
+        yield location["city"], result
 
-    return events
 
+async def search_city(client, city: str, country: str) -> AsyncIterator[Event]:
+    """Stream Gemini's answer for one city, yielding each event as soon as it is complete.
 
-def _parse_response(content: str, city: str, country: str) -> list[Event]:
-    """Parse Gemini's JSON response into Event objects."""
-    events = []
+    A response cut off before the end of the list still yields the events
+    that arrived whole.
+    """
+    settings = get_settings()
+    topics_str = ", ".join(settings.topics[:5])
+    current_year = date.today().year
 
-    # Try to extract JSON from the response
-    try:
-        # Find JSON in the response
-        json_match = re.search(r"\{[\s\S]*\}", content)
-        if not json_match:
-            return events
-
-        data = json.loads(json_match.group())
-        event_list = data.get("events", [])
-
-        for item in event_list:
-            try:
-                start_date_str = item.get("start_date")
-                if not start_date_str or not isinstance(start_date_str, str):
-                    continue
-                start_date = date.fromisoformat(start_date_str)
-
-                end_date = None
-                if item.get("end_date"):
-                    try:
-                        end_date = date.fromisoformat(item["end_date"])
-                    except ValueError:
-                        pass
-
-                cfp_deadline = None
-                if item.get("cfp_deadline"):
-                    try:
-                        cfp_deadline = date.fromisoformat(item["cfp_deadline"])
-                    except ValueError:
-                        pass
-
-                event = Event(
-                    name=item.get("name", ""),
-                    city=item.get("city", city),
-                    country=item.get("country", country),
-                    start_date=start_date,
-                    end_date=end_date,
-                    event_type=item.get("event_type", "conference"),
-                    topics=item.get("topics", []),
-                    cfp_deadline=cfp_deadline,
-                    cfp_url=item.get("cfp_url"),
-                    website=item.get("website", ""),
-                    description=item.get("description", ""),
-                    relevance_score=0.7,  # AI-discovered events get moderate score
-                    last_updated=datetime.now(),
-                )
-                events.append(event)
-
-            except (KeyError, ValueError) as e:
-                print(f"Error parsing event: {e}")
-                continue
-
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON response: {e}")
+    prompt = f"""Search for upcoming tech conferences and meetups in {city}, {country} for {current_year} and {current_year + 1}.
+
+Focus on events related to: {topics_str}
+
+List every event you find with its dates as YYYY-MM-DD, its type, topics, website,
+CFP deadline and URL if it has one, and a brief description.
+
+Only include events that:
+1. Are actually in {city}, {country}
+2. Are related to DevOps, CI/CD, Cloud Native, Kubernetes, or Platform Engineering
+3. Have dates in the future or within the last month
+4. You are reasonably confident about"""
+
+    # The async client keeps other sources streaming while Gemini answers
+    chunks = await client.aio.models.generate_content_stream(
+        model=GEMINI_MODEL, contents=prompt, config=_config(EVENTS_SCHEMA)
+    )
+    parser = JsonArrayStream("events")
+    async for chunk in chunks:
+        for item in parser.feed(chunk.text or ""):
+            event = _event_from_item(item, city, country, settings.topic_classifier)
+            if event is not None:
+                yield event
+    if not parser.done:
+        print(f"Gemini response for {city} ended before the event list was complete")
 
-    return events
+
+def _parse_response(content: str, city: str, country: str) -> list[Event]:
+    """Parse a complete Gemini JSON response into Event objects."""
+    classifier = get_settings().topic_classifier
+    items = JsonArrayStream("events").feed(content)
+    events = (_event_from_item(item, city, country, classifier) for item in items)
+    return [event for event in events if event is not None]
+
+
+def _event_from_item(item, city: str, country: str, classifier) -> Event | None:
+    """Build an event from one object of Gemini's event list, or None if it is unusable.
+
+    Topics are tagged by ``classifier`` from the name and description, with
+    the model's own topics kept when nothing matches.
+    """
+    if not isinstance(item, dict):
+        return None
+    start_date = parse_date(item.get("start_date"), fuzzy=False)
+    if start_date is None:
+        return None
+    topics = [t for t in item.get("topics") or [] if isinstance(t, str)]
+    return Event(
+        name=item.get("name") or "",
+        city=item.get("city") or city,
+        country=item.get("country") or country,
+        start_date=start_date,
+        end_date=parse_date(item.get("end_date"), fuzzy=False),
+        event_type=item.get("event_type") or "conference",
+        topics=classifier.classify(item.get("name") or "", item.get("description") or "", *topics) or topics,
+        cfp_deadline=parse_date(item.get("cfp_deadline"), fuzzy=False),
+        cfp_url=item.get("cfp_url"),
+        website=item.get("website") or "",
+        description=item.get("description") or "",
+        last_updated=datetime.now(),
+    )
 
 
 async def extract_cfp_details(event_url: str) -> dict:
@@ -154,7 +196,7 @@ async def extract_cfp_details(event_url: str) -> dict:
     # Fetch the page content
     async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as http:
         try:
-            response = await http.get(
+            response = await HedgedClient(http).get(
                 event_url,
                 headers={"User-Agent": "Mozilla/5.0 (compatible; gather-cnf/1.0)"},
             )
@@ -164,37 +206,33 @@ async def extract_cfp_details(event_url: str) -> dict:
         except Exception:
             return {}
 
-    client = genai.Client(api_key=GEMINI_API_KEY)
-
-    prompt = f"""Analyze this event website HTML and extract CFP (Call for Papers/Proposals) information.
+    prompt = f"""Analyze this event website HTML and extract CFP (Call for Papers/Proposals) information:
+the CFP deadline as YYYY-MM-DD, the CFP URL, whether the CFP is open and the event's topics.
 
 HTML content:
-{html[:30000]}
-
-Return JSON with:
-{{
-  "cfp_deadline": "YYYY-MM-DD or null",
-  "cfp_url": "https://... or null",
-  "cfp_open": true/false,
-  "topics": ["topic1", "topic2"]
-}}
-
-Return ONLY the JSON, no other text."""
+{html[:30000]}"""
 
     try:
-        response = client.models.generate_content(
-            model="gemini-3-flash-preview",
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                tools=[types.Tool(google_search=types.GoogleSearch())],
-            ),
+        response = await _client().aio.models.generate_content(
+            model=GEMINI_MODEL, contents=prompt, config=_config(CFP_SCHEMA)
         )
-        content = response.text
-        json_match = re.search(r"\{[\s\S]*\}", content)
-        if json_match:
-            return json.loads(json_match.group())
+        details = _first_json_object(response.text or "")
+        if details is not None:
+            return details
 
     except Exception as e:
         print(f"Error extracting CFP details: {e}")
 
     return {}
+
+
+def _first_json_object(content: str) -> dict | None:
+    """Decode the first JSON object in ``content``, ignoring any text around it."""
+    decoder = json.JSONDecoder()
+    start = content.find("{")
+    while start != -1:
+        try:
+            return decoder.raw_decode(content, start)[0]
+        except json.JSONDecodeError:
+            start = content.find("{", start + 1)
+    return None
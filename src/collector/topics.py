@@ -0,0 +1,91 @@
+"""Topic classifier compiled once from the configured topics and their synonyms."""
+
+from bisect import bisect_right
+from itertools import accumulate
+
+from .matching import keyword_pattern
+
+# Other ways events spell a topic, keyed by lowercased topic
+TOPIC_SYNONYMS = {
+    "ci/cd": ["cicd", "ci-cd", "ci / cd", "pipeline", "pipelines"],
+    "continuous integration": ["continuous-integration"],
+    "continuous delivery": ["continuous deployment", "continuous-delivery"],
+    "devops": ["dev ops", "devopsdays", "devops days", "sre", "site reliability"],
+    "platform engineering": ["platformcon", "platform engineer", "internal developer platform"],
+    "cloud native": ["cloud-native", "cloudnative", "cncf", "kubecon", "cloudnativecon"],
+    "kubernetes": ["k8s", "kubecon", "kubeday", "kcd"],
+    "containers": ["container", "docker", "podman", "containerd"],
+    "gitops": ["argocd", "argo cd", "fluxcd", "gitopscon"],
+    "tekton": ["tektoncd"],
+}
+
+# Separates joined texts in batch mode; never part of a keyword
+_SEPARATOR = "\n"
+
+
+class TopicClassifier:
+    """Tag text with topics using a single compiled, word-bounded pattern.
+
+    Every topic and synonym goes into one trie-factored regex, so a text is
+    classified in one scan whatever the number of keywords. Text is
+    lowercased up front so the scan runs without IGNORECASE, which is
+    markedly faster. Tags come back in the configured topic order.
+    """
+
+    def __init__(self, topics: list[str], synonyms: dict[str, list[str]] | None = None):
+        synonyms = TOPIC_SYNONYMS if synonyms is None else synonyms
+        self.topics = list(topics)
+        self._masks = {}  # lowercased keyword -> bit mask of the topics it implies
+        for bit, topic in enumerate(self.topics):
+            for keyword in [topic, *synonyms.get(topic.lower(), ())]:
+                key = keyword.lower()
+                self._masks[key] = self._masks.get(key, 0) | (1 << bit)
+        self._pattern = keyword_pattern(self._masks, flags=0)
+        # For the rare text whose length changes when lowercased
+        self._folding_pattern = keyword_pattern(self._masks)
+        self._tags = {0: ()}  # mask -> topics, in configured order
+
+    def _scan(self, text: str):
+        """Yield (start offset, topic mask) for every keyword in ``text``."""
+        lowered = text.lower()
+        masks = self._masks
+        if len(lowered) == len(text):
+            for match in self._pattern.finditer(lowered):
+                yield match.start(), masks[match.group()]
+        else:
+            for match in self._folding_pattern.finditer(text):
+                yield match.start(), masks[match.group().lower()]
+
+    def _topics(self, mask: int) -> list[str]:
+        tags = self._tags.get(mask)
+        if tags is None:
+            tags = self._tags[mask] = tuple(t for bit, t in enumerate(self.topics) if mask >> bit & 1)
+        return list(tags)
+
+    def classify(self, *texts: str) -> list[str]:
+        """Topics mentioned in any of the texts, e.g. an event name and description."""
+        mask = 0
+        for _, found in self._scan(_SEPARATOR.join(t for t in texts if t)):
+            mask |= found
+        return self._topics(mask)
+
+    def classify_many(self, texts: list[str]) -> list[list[str]]:
+        """Classify many texts with one scan over their concatenation."""
+        # Offset of each text in the joined string (each is followed by one separator)
+        starts = list(accumulate(map((1).__add__, map(len, texts)), initial=0))
+        found = {}  # text index -> topic mask
+        for start, mask in self._scan(_SEPARATOR.join(texts)):
+            i = bisect_right(starts, start) - 1
+            found[i] = found.get(i, 0) | mask
+        return [self._topics(found[i]) if i in found else [] for i in range(len(texts))]
+
+
+def event_text(event) -> str:
+    """The text an event is classified on: its name, description and any existing tags."""
+    return _SEPARATOR.join([event.name, event.description or "", *event.topics])
+
+
+def tag_events(events: list, classifier: TopicClassifier) -> None:
+    """Add classified topics to events in place, keeping tags they already have."""
+    for event, tags in zip(events, classifier.classify_many([event_text(e) for e in events])):
+        event.topics = list(dict.fromkeys([*event.topics, *tags]))
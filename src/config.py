@@ -1,8 +1,11 @@
 """Configuration for the event tracker."""
 
+import hashlib
 import os
-
-import yaml
+import re
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
 
 DEFAULT_CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
 _config_file = None
@@ -16,42 +19,377 @@ _DEFAULT_CITIES = [
     {"city": "Brno", "country": "Czech Republic"},
 ]
 
+DEFAULT_TOPICS = [
+    "ci/cd",
+    "continuous integration",
+    "continuous delivery",
+    "devops",
+    "platform engineering",
+    "cloud native",
+    "kubernetes",
+    "containers",
+    "gitops",
+    "tekton",
+]
+
+# Interest profiles for relevance ranking: name -> what the profile cares about
+DEFAULT_PROFILES = {
+    "Tekton/CI-CD": (
+        "tekton ci/cd cicd continuous integration continuous delivery continuous deployment "
+        "pipelines pipeline build release automation gitops argocd supply chain security"
+    ),
+    "Platform Engineering": (
+        "platform engineering internal developer platform developer experience backstage "
+        "golden paths self-service infrastructure devops sre"
+    ),
+    "Cloud Native": (
+        "cloud native kubernetes k8s kubecon cncf containers operators openshift "
+        "service mesh serverless observability"
+    ),
+}
+
+# How often each source is refreshed by `collect --incremental` and `run`
+DEFAULT_SCHEDULE = {
+    "confs.tech": "1d",
+    "papercall": "6h",
+    "ai_search": "7d",
+}
+
+# Worker pools that downloaded pages can be parsed in, see collector.parsing
+PARSE_POOLS = ("thread", "process")
+
+# How confs.tech data is fetched: one file per year and category, or the
+# whole dataset as one archive indexed locally
+CONFS_TECH_MODES = ("files", "archive")
+
+# Notification channel types, see channels.CHANNEL_TYPES
+CHANNEL_KINDS = ("slack", "webhook", "email")
+
+# Seconds between checks of the config file for changes
+CHECK_INTERVAL = 1.0
+
+_INTERVAL_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhdw])$")
+_INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+# "Paris within 150 km" or "Paris, France within 150 km"
+_WITHIN_PATTERN = re.compile(
+    r"^(?P<city>[^,]+?)(?:\s*,\s*(?P<country>[^,]+?))?\s+within\s+(?P<radius>\d+(?:\.\d+)?)\s*km$",
+    re.IGNORECASE,
+)
+
+
+class ConfigError(ValueError):
+    """Raised when the config file is malformed."""
+
+
+def parse_interval(value) -> float:
+    """Convert a refresh interval such as ``"6h"``, ``"2d"`` or ``90`` (minutes) to seconds.
+
+    Raises:
+        ValueError: If the interval is not a positive duration
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"invalid interval {value!r}")
+    if isinstance(value, (int, float)):
+        seconds = value * 60
+    else:
+        match = _INTERVAL_PATTERN.match(str(value).strip().lower())
+        if not match:
+            raise ValueError(f"invalid interval {value!r}; use e.g. 30m, 6h or 2d")
+        seconds = float(match[1]) * _INTERVAL_UNITS[match[2]]
+    if seconds <= 0:
+        raise ValueError(f"interval {value!r} must be positive")
+    return float(seconds)
+
+
+def parse_city_entry(entry):
+    """Normalize a ``cities`` entry to a dict with city, country and optional radius_km.
+
+    Entries are either mappings (``{city: Paris, country: France, radius_km: 150}``)
+    or strings such as ``"Paris within 150 km"``. A missing country is left
+    empty and resolved from the gazetteer when matching.
+    """
+    if isinstance(entry, dict):
+        return dict(entry, country=entry.get("country", ""))
+    match = _WITHIN_PATTERN.match(entry.strip())
+    if not match:
+        city, _, country = entry.partition(",")
+        return {"city": city.strip(), "country": country.strip()}
+    return {
+        "city": match["city"].strip(),
+        "country": (match["country"] or "").strip(),
+        "radius_km": float(match["radius"]),
+    }
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Validated configuration, shared by every module and replaced on reload.
+
+    Derived structures are computed on first use and live as long as this
+    object, so they are rebuilt only when the config file changes.
+    """
+
+    config_file: str
+    cities: list[dict] = field(default_factory=lambda: [dict(c) for c in _DEFAULT_CITIES])
+    topics: list[str] = field(default_factory=lambda: list(DEFAULT_TOPICS))
+    channels: list[dict] = field(default_factory=list)
+    profiles: dict[str, str] = field(default_factory=lambda: dict(DEFAULT_PROFILES))
+    # Source name -> refresh interval in seconds
+    schedule: dict[str, float] = field(
+        default_factory=lambda: {name: parse_interval(v) for name, v in DEFAULT_SCHEDULE.items()}
+    )
+    # Page parsing runs off the event loop in a pool of this kind and size (0 = automatic)
+    parse_pool: str = "thread"
+    parse_workers: int = 0
+    confs_tech_mode: str = "files"
+    # Archive URL, local .tar.gz or conference-data checkout ("" = GitHub's archive)
+    confs_tech_archive: str = ""
+    version: str = "defaults"  # Content hash of the config file
+
+    @cached_property
+    def city_names(self) -> list[str]:
+        return [c["city"] for c in self.cities]
+
+    @cached_property
+    def topic_set(self) -> set[str]:
+        return {t.lower() for t in self.topics}
+
+    @cached_property
+    def topic_classifier(self):
+        """Topic classifier for the configured topics and their synonyms."""
+        from .collector.topics import TopicClassifier
+
+        return TopicClassifier(self.topics)
+
+    @cached_property
+    def matcher(self):
+        """Location matcher for the configured cities."""
+        from .collector.matching import location_matcher
+
+        return location_matcher(self.cities)
+
+
+def _check_gazetteer(target: dict, path: str) -> None:
+    """Reject a target that can only be matched through the gazetteer but is not in it."""
+    from .collector.geo import load_gazetteer
+
+    if load_gazetteer(GAZETTEER_FILE).locate(target["city"], target.get("country")) is None:
+        problem = "has a radius" if target.get("radius_km") is not None else "has no country"
+        raise ConfigError(f"{path}: {target['city']} {problem} but is not in the gazetteer ({GAZETTEER_FILE})")
+
+
+def _validate(data, path: str) -> dict:
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path}: expected a mapping at the top level")
+
+    cities = data.get("cities")
+    if cities is not None:
+        if not isinstance(cities, list) or not cities:
+            raise ConfigError(f"{path}: 'cities' must be a non-empty list")
+        for entry in cities:
+            if not isinstance(entry, (str, dict)):
+                raise ConfigError(f"{path}: invalid city entry {entry!r}")
+            parsed = parse_city_entry(entry)
+            if not isinstance(parsed.get("city"), str) or not parsed["city"].strip():
+                raise ConfigError(f"{path}: city entry {entry!r} has no city name")
+            radius = parsed.get("radius_km")
+            if radius is not None and (
+                isinstance(radius, bool) or not isinstance(radius, (int, float)) or radius <= 0
+            ):
+                raise ConfigError(f"{path}: radius_km for {parsed['city']} must be a positive number")
+            if radius is not None or not parsed.get("country"):
+                _check_gazetteer(parsed, path)
+
+    topics = data.get("topics")
+    if topics is not None:
+        if not isinstance(topics, list) or not all(isinstance(t, str) and t.strip() for t in topics):
+            raise ConfigError(f"{path}: 'topics' must be a list of strings")
+
+    profiles = data.get("profiles")
+    if profiles is not None:
+        if not isinstance(profiles, dict) or not profiles or not all(
+            isinstance(v, str) or (isinstance(v, list) and all(isinstance(k, str) for k in v))
+            for v in profiles.values()
+        ):
+            raise ConfigError(f"{path}: 'profiles' must map names to text or keyword lists")
+
+    schedule = data.get("schedule")
+    if schedule is not None:
+        if not isinstance(schedule, dict):
+            raise ConfigError(f"{path}: 'schedule' must map source names to intervals")
+        for name, interval in schedule.items():
+            try:
+                parse_interval(interval)
+            except ValueError as e:
+                raise ConfigError(f"{path}: schedule for {name}: {e}") from e
+
+    parsing = data.get("parsing")
+    if parsing is not None:
+        if not isinstance(parsing, dict):
+            raise ConfigError(f"{path}: 'parsing' must be a mapping")
+        if parsing.get("pool", "thread") not in PARSE_POOLS:
+            raise ConfigError(f"{path}: parsing pool must be one of {', '.join(PARSE_POOLS)}")
+        workers = parsing.get("workers", 0)
+        if isinstance(workers, bool) or not isinstance(workers, int) or workers < 0:
+            raise ConfigError(f"{path}: parsing workers must be a non-negative integer")
+
+    confs_tech = data.get("confs_tech")
+    if confs_tech is not None:
+        if not isinstance(confs_tech, dict):
+            raise ConfigError(f"{path}: 'confs_tech' must be a mapping")
+        if confs_tech.get("mode", "files") not in CONFS_TECH_MODES:
+            raise ConfigError(f"{path}: confs_tech mode must be one of {', '.join(CONFS_TECH_MODES)}")
+        if not isinstance(confs_tech.get("archive", ""), str):
+            raise ConfigError(f"{path}: confs_tech archive must be a URL or path")
+
+    channels = data.get("channels")
+    if channels is not None:
+        if not isinstance(channels, list) or not all(isinstance(c, dict) for c in channels):
+            raise ConfigError(f"{path}: 'channels' must be a list of mappings")
+        for entry in channels:
+            if entry.get("type", "slack") not in CHANNEL_KINDS:
+                raise ConfigError(
+                    f"{path}: unknown channel type {entry['type']!r}; use one of {', '.join(CHANNEL_KINDS)}"
+                )
+    return data
+
+
+def _read_config(path: str) -> tuple[dict, str]:
+    """Read and validate a config file; returns (data, content hash)."""
+    if not os.path.exists(path):
+        return {}, "defaults"
+    # Imported here so commands that never read the config skip PyYAML
+    import yaml
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        data = yaml.safe_load(raw)
+    except yaml.YAMLError as e:
+        raise ConfigError(f"{path}: {e}") from e
+    return _validate(data, path), hashlib.sha1(raw).hexdigest()[:12]
+
+
+def load_settings(config_file=None) -> Settings:
+    """Load and validate settings from a YAML config file.
+
+    ``${VAR}`` references in channel string values are expanded from the
+    environment, so webhook URLs and passwords can stay out of the file.
+
+    Raises:
+        ConfigError: If the file is not valid YAML or fails validation
+    """
+    path = config_file or _config_file or DEFAULT_CONFIG_FILE
+    data, version = _read_config(path)
+    fields = {}
+    if data.get("cities"):
+        fields["cities"] = [parse_city_entry(entry) for entry in data["cities"]]
+    if data.get("topics"):
+        fields["topics"] = [t.strip() for t in data["topics"]]
+    if data.get("profiles"):
+        fields["profiles"] = {
+            str(name): text if isinstance(text, str) else " ".join(text)
+            for name, text in data["profiles"].items()
+        }
+    if data.get("schedule"):
+        fields["schedule"] = {
+            name: parse_interval(interval)
+            for name, interval in {**DEFAULT_SCHEDULE, **data["schedule"]}.items()
+        }
+    if data.get("parsing"):
+        fields["parse_pool"] = data["parsing"].get("pool", "thread")
+        fields["parse_workers"] = data["parsing"].get("workers", 0)
+    if data.get("confs_tech"):
+        fields["confs_tech_mode"] = data["confs_tech"].get("mode", "files")
+        fields["confs_tech_archive"] = os.path.expanduser(data["confs_tech"].get("archive", ""))
+    channels = [
+        {key: os.path.expandvars(value) if isinstance(value, str) else value for key, value in entry.items()}
+        for entry in data.get("channels") or []
+    ]
+    return Settings(config_file=path, channels=channels, version=version, **fields)
+
 
 def load_cities(config_file=None):
     """Load cities from YAML config file."""
-    path = config_file or _config_file or DEFAULT_CONFIG_FILE
-    if os.path.exists(path):
-        with open(path) as f:
-            data = yaml.safe_load(f)
-            return data.get("cities", _DEFAULT_CITIES)
-    return _DEFAULT_CITIES
+    return load_settings(config_file).cities
+
+
+def load_channel_configs(config_file=None):
+    """Load notification channel entries from YAML config."""
+    return load_settings(config_file).channels
+
+
+_settings = None
+_signature = None
+_checked_at = 0.0
+
+
+def _file_signature(path: str):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_settings() -> Settings:
+    """Return the shared settings, reloading them if the config file changed.
+
+    The file is stat-ed at most once per CHECK_INTERVAL. A reload that fails
+    validation keeps the previous settings so a running server stays up.
+    """
+    global _settings, _signature, _checked_at
+    now = time.monotonic()
+    if _settings is not None and now - _checked_at < CHECK_INTERVAL:
+        return _settings
+    _checked_at = now
+
+    path = _config_file or DEFAULT_CONFIG_FILE
+    signature = _file_signature(path)
+    if _settings is not None and _settings.config_file == path and signature == _signature:
+        return _settings
+    try:
+        settings = load_settings(path)
+    except ConfigError as e:
+        if _settings is None:
+            raise
+        print(f"Warning: keeping previous config, reload failed: {e}")
+        return _settings
+    _settings, _signature = settings, signature
+    return _settings
+
+
+def reload_settings() -> Settings:
+    """Re-read the config file now and return the new settings."""
+    global _settings
+    _settings = None
+    return get_settings()
 
 
 def set_config_file(path):
-    """Set the config file path for subsequent load_cities() calls."""
+    """Use another config file for all subsequent settings lookups."""
     global _config_file
     _config_file = path
+    reload_settings()
 
 
 def get_target_cities():
     """Get target cities, reloading from config if needed."""
-    return load_cities()
+    return get_settings().cities
 
 
-TARGET_CITIES = load_cities()
+def __getattr__(name):
+    # TARGET_CITIES and TOPICS used to be import-time globals; they stay
+    # readable as module attributes, backed by the current settings.
+    if name == "TARGET_CITIES":
+        return get_settings().cities
+    if name == "TOPICS":
+        return get_settings().topics
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-TOPICS = [
-    "ci/cd",
-    "continuous integration",
-    "continuous delivery",
-    "devops",
-    "platform engineering",
-    "cloud native",
-    "kubernetes",
-    "containers",
-    "gitops",
-    "tekton",
-]
 
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 SLACK_WEBHOOK_URL = os.environ.get("SLACK_WEBHOOK_URL", "")
@@ -59,3 +397,9 @@ MEETUP_API_KEY = os.environ.get("MEETUP_API_KEY", "")
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 EVENTS_FILE = os.path.join(DATA_DIR, "events.json")
+LEDGER_FILE = os.path.join(DATA_DIR, "notified.json")
+GAZETTEER_FILE = os.path.join(DATA_DIR, "gazetteer.tsv")
+RELEVANCE_FILE = os.path.join(DATA_DIR, "relevance.json")
+SCHEDULE_FILE = os.path.join(DATA_DIR, "schedule.json")
+SHARDS_DIR = os.path.join(DATA_DIR, "shards")
+CONFS_TECH_INDEX_FILE = os.path.join(DATA_DIR, "confs_tech_index.json")
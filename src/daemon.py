@@ -0,0 +1,263 @@
+"""Long-running daemons: the deadline notifier and the scheduled collector.
+
+The notifier is driven by a priority queue of deadline threshold
+crossings; the collector sleeps until the next source task is due.
+"""
+
+import asyncio
+import heapq
+import os
+from datetime import date, datetime, time, timedelta
+
+from .channels import fan_out, load_channels
+from .collector.index import LiveIndex
+from .config import EVENTS_FILE, LEDGER_FILE, get_settings
+from .ledger import NotificationLedger
+from .views import URGENCY_THRESHOLDS, build_views
+
+
+class DeadlineQueue:
+    """Min-heap of upcoming (event, urgency bucket) threshold crossings.
+
+    A crossing happens at the start of the day an event's CFP deadline
+    enters the ``days`` window or a bucket inside it (e.g. 7 days before
+    it for "urgent"). Updates are
+    incremental: only new or changed events push entries, and stale
+    entries are dropped lazily when they reach the top of the heap.
+    """
+
+    def __init__(self, days: int = 14):
+        self.thresholds = [(bucket, limit) for bucket, limit in URGENCY_THRESHOLDS if limit <= days]
+        self.days = days
+        self.heap = []
+        self.events = {}  # id -> (event, version)
+        self._versions = {}  # id -> latest version, kept after removal
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def update(self, events, now: datetime) -> int:
+        """Sync the queue with the current events; returns how many changed."""
+        seen = set()
+        changed = 0
+        for event in events:
+            seen.add(event.id)
+            current = self.events.get(event.id)
+            if current and current[0].cfp_deadline == event.cfp_deadline:
+                self.events[event.id] = (event, current[1])
+                continue
+            self._schedule(event, now)
+            changed += 1
+        for event_id in list(self.events):
+            if event_id not in seen:
+                # Bumping the version invalidates its queued entries
+                del self.events[event_id]
+                self._versions[event_id] += 1
+                changed += 1
+        return changed
+
+    def _schedule(self, event, now: datetime) -> None:
+        version = self._versions.get(event.id, 0) + 1
+        self._versions[event.id] = version
+        self.events[event.id] = (event, version)
+        deadline = event.cfp_deadline
+        if not deadline or deadline < now.date():
+            return
+
+        days_left = (deadline - now.date()).days
+        if days_left <= self.days:
+            # Already inside the window: alert for the current bucket right away
+            self._push(now, event.id, None, version)
+        # Entering the window, then each bucket inside it
+        for bucket, limit in [(None, self.days), *self.thresholds]:
+            crossing = datetime.combine(deadline - timedelta(days=limit), time.min)
+            if crossing > now:
+                self._push(crossing, event.id, bucket, version)
+
+    def _push(self, when: datetime, event_id: str, bucket: str | None, version: int) -> None:
+        self._seq += 1
+        heapq.heappush(self.heap, (when, self._seq, event_id, bucket, version))
+
+    def requeue(self, events, when: datetime) -> None:
+        """Make ``events`` due again at ``when``, e.g. after their alerts failed."""
+        for event in events:
+            current = self.events.get(event.id)
+            if current:
+                self._push(when, event.id, None, current[1])
+
+    def next_time(self) -> datetime | None:
+        """When the next live crossing is due, if any."""
+        self._drop_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now: datetime) -> list:
+        """Pop the events whose crossings are due at ``now``."""
+        due = {}
+        while True:
+            self._drop_stale()
+            if not self.heap or self.heap[0][0] > now:
+                break
+            _, _, event_id, _, _ = heapq.heappop(self.heap)
+            due[event_id] = self.events[event_id][0]
+        return list(due.values())
+
+    def _drop_stale(self) -> None:
+        while self.heap:
+            _, _, event_id, _, version = self.heap[0]
+            current = self.events.get(event_id)
+            if current and current[1] == version:
+                return
+            heapq.heappop(self.heap)
+
+
+class NotifierDaemon:
+    """Sleep until the next threshold crossing or store change, then alert.
+
+    Args:
+        days: Alert for CFPs closing within this many days
+        poll_interval: Maximum seconds between checks for store changes
+        send: Coroutine called with the views to alert on and the ledger
+    """
+
+    def __init__(
+        self,
+        events_file: str = EVENTS_FILE,
+        days: int = 14,
+        poll_interval: float = 60.0,
+        send=None,
+        ledger: NotificationLedger | None = None,
+        clock=None,
+        sleep=None,
+    ):
+        self.live = LiveIndex(events_file, check_interval=0)
+        self.queue = DeadlineQueue(days)
+        self.poll_interval = poll_interval
+        self.ledger = ledger
+        self.send = send or _print_alerts
+        self._clock = clock or datetime.now
+        self._sleep = sleep or asyncio.sleep
+        self._index = None
+
+    async def step(self) -> float:
+        """Process store changes and due crossings; returns seconds to sleep."""
+        now = self._clock()
+        index = self.live.current()
+        if index is not self._index:
+            changed = self.queue.update(index.events, now)
+            self._index = index
+            print(f"Store version {index.version}: {changed} event(s) (re)scheduled")
+
+        due = self.queue.pop_due(now)
+        if due:
+            views = [
+                v for v in build_views(due, today=now.date())
+                if 0 <= v.days_left <= self.queue.days
+            ]
+            if views:
+                try:
+                    await self.send(views, self.ledger)
+                except Exception:
+                    # Alert again on the next attempt instead of at the next crossing
+                    self.queue.requeue(due, now + timedelta(seconds=self.poll_interval))
+                    raise
+
+        next_time = self.queue.next_time()
+        delay = self.poll_interval
+        if next_time is not None:
+            delay = min(delay, max(0.0, (next_time - self._clock()).total_seconds()))
+        return delay
+
+    async def run(self) -> None:
+        """Run until cancelled; a failing step is reported and retried after ``poll_interval``."""
+        print(f"Notifier daemon watching {self.live.store.filepath}")
+        while True:
+            try:
+                delay = await self.step()
+            except Exception as e:
+                print(f"Notifier step failed: {type(e).__name__}: {e}")
+                delay = self.poll_interval
+            await self._sleep(delay)
+
+
+async def _print_alerts(views, ledger) -> None:
+    for view in views:
+        print(f"  - {view.event.name} ({view.event.city}): {view.days_left} days left")
+
+
+async def run_daemon(days: int = 14, poll_interval: float = 60.0) -> None:
+    """Run the notifier daemon against the configured channels and ledger.
+
+    Channels are rebuilt whenever the config file changes, and alerts for
+    past deadlines are pruned from the ledger before each send.
+    """
+    ledger = NotificationLedger(LEDGER_FILE)
+    loaded = {}
+
+    async def send(views, ledger):
+        if ledger.prune(before=date.today()):
+            ledger.save()
+        version = get_settings().version
+        if loaded.get("version") != version:
+            loaded.update(version=version, channels=load_channels())
+        channels = loaded["channels"]
+        if not channels:
+            await _print_alerts(views, ledger)
+            return
+        for name, report in (await fan_out(views, channels, ledger)).items():
+            print(f"  {name}: delivered {report.delivered}, failed {report.failed}")
+
+    await NotifierDaemon(days=days, poll_interval=poll_interval, send=send, ledger=ledger).run()
+
+
+def _store_signature(path: str):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+async def run_collector(
+    use_ai: bool = True,
+    on_change=None,
+    poll_interval: float = 900.0,
+    scheduler=None,
+    sleep=None,
+    clock=None,
+    runs: int | None = None,
+    deadline: float | None = None,
+) -> None:
+    """Run due source tasks, then sleep until the next one is due.
+
+    Args:
+        use_ai: Include the Gemini-backed AI search
+        on_change: Called without arguments after a run changed the store
+        poll_interval: Maximum seconds between runs, so sources or cities
+            added to the config are picked up
+        runs: Stop after this many runs (default: run until cancelled)
+        deadline: Seconds each collection run may take (default: no limit)
+    """
+    from .collector.agent import collect_all_events
+    from .collector.scheduler import SourceScheduler
+    from .collector.sources import source_names
+
+    scheduler = scheduler or SourceScheduler()
+    sleep = sleep or asyncio.sleep
+    clock = clock or datetime.now
+    done = 0
+    while runs is None or done < runs:
+        before = _store_signature(EVENTS_FILE)
+        await collect_all_events(use_ai, incremental=True, scheduler=scheduler, deadline=deadline)
+        if on_change and _store_signature(EVENTS_FILE) != before:
+            on_change()
+        done += 1
+        if runs is not None and done >= runs:
+            break
+
+        delay = poll_interval
+        next_time = scheduler.next_due(source_names(use_ai))
+        if next_time is not None:
+            delay = min(delay, max(1.0, (next_time - clock()).total_seconds()))
+        print(f"Next collection in {delay / 60:.0f} min")
+        await sleep(delay)
@@ -0,0 +1,194 @@
+"""Batched, rate-limited delivery of Slack webhook messages."""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+# Slack rejects messages with more than 50 blocks, and section text over 3000 chars
+MAX_BLOCKS = 50
+MAX_TEXT = 3000
+
+# Incoming webhooks allow roughly one message per second
+DEFAULT_RATE = 1.0
+
+
+@dataclass
+class DeliveryReport:
+    """Outcome of a delivery run."""
+
+    delivered: int = 0  # Items (events or digest sections) that reached Slack
+    failed: int = 0
+    messages_sent: int = 0
+    messages_failed: int = 0
+    retries: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class TokenBucket:
+    """Async token bucket that can also be paused until a point in time."""
+
+    def __init__(self, rate: float, capacity: float = 1.0, clock=None, sleep=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or asyncio.sleep
+        self._updated = self._clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hold all sends for at least ``seconds`` (e.g. from a Retry-After header)."""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+        self.tokens = 0.0
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await self._sleep(self._paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await self._sleep((1.0 - self.tokens) / self.rate)
+
+
+def split_text(text: str, limit: int = MAX_TEXT) -> list[str]:
+    """Split text on line boundaries into chunks of at most ``limit`` chars."""
+    chunks = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if len(current) + len(line) > limit:
+            chunks.append(current)
+            current = ""
+        current += line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def pack_messages(groups: list[list[dict]], header: list[dict] | None = None, max_blocks: int = MAX_BLOCKS) -> list[tuple[dict, int]]:
+    """Pack groups of blocks into as few messages as Slack's block limit allows.
+
+    A group (the blocks for one event) is never split across messages.
+
+    Args:
+        groups: Block lists, one per delivered item
+        header: Blocks repeated at the top of every message
+        max_blocks: Maximum blocks per message
+
+    Returns:
+        (message, number of groups in it) pairs
+    """
+    header = header or []
+    messages = []
+    blocks = list(header)
+    count = 0
+    for group in groups:
+        if count and len(blocks) + len(group) > max_blocks:
+            messages.append(({"blocks": blocks}, count))
+            blocks = list(header)
+            count = 0
+        blocks.extend(group)
+        count += 1
+    if count:
+        messages.append(({"blocks": blocks}, count))
+    return messages
+
+
+class SlackDelivery:
+    """Send webhook messages through a token bucket with retries.
+
+    429 responses pause the bucket for the ``Retry-After`` delay; network
+    errors and 5xx responses are retried with jittered exponential backoff.
+    Other 4xx responses are permanent failures.
+    """
+
+    def __init__(
+        self,
+        webhook_url: str,
+        rate: float = DEFAULT_RATE,
+        max_retries: int = 4,
+        backoff: float = 1.0,
+        client: httpx.AsyncClient | None = None,
+        bucket: TokenBucket | None = None,
+        sleep=None,
+    ):
+        self.webhook_url = webhook_url
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.client = client
+        self._sleep = sleep or asyncio.sleep
+        self.bucket = bucket or TokenBucket(rate, sleep=self._sleep)
+
+    async def send(self, messages: list[tuple[dict, int]]) -> DeliveryReport:
+        """Deliver packed messages in order and report what got through.
+
+        Args:
+            messages: (message, item count) pairs from pack_messages()
+        """
+        report = DeliveryReport()
+        if self.client is not None:
+            await self._send_all(self.client, messages, report)
+        else:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                await self._send_all(client, messages, report)
+        return report
+
+    async def _send_all(self, client, messages, report: DeliveryReport) -> None:
+        for message, count in messages:
+            if await self._send_one(client, message, report):
+                report.delivered += count
+                report.messages_sent += 1
+            else:
+                report.failed += count
+                report.messages_failed += 1
+
+    async def _send_one(self, client, message: dict, report: DeliveryReport) -> bool:
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            try:
+                response = await client.post(self.webhook_url, json=message)
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code == 200:
+                    return True
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code == 429 and attempt < self.max_retries:
+                    self.bucket.pause(_retry_after(response, self.backoff * 2**attempt))
+                    report.retries += 1
+                    continue
+                if response.status_code < 500:
+                    report.errors.append(error)
+                    return False
+
+            if attempt < self.max_retries:
+                report.retries += 1
+                delay = self.backoff * 2**attempt
+                await self._sleep(delay + random.uniform(0, delay))
+
+        report.errors.append(error)
+        return False
+
+
+def _retry_after(response: httpx.Response, default: float) -> float:
+    """Read the Retry-After delay in seconds, falling back to ``default``."""
+    try:
+        return max(0.0, float(response.headers.get("retry-after", "")))
+    except ValueError:
+        return default
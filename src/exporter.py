@@ -0,0 +1,378 @@
+"""Single-pass export of events to HTML, iCalendar, Atom and JSON files.
+
+Events are sorted once and walked once; every event is handed to each
+selected writer in turn, which streams it to a temporary file next to its
+output. Only when every writer has finished its files are they all moved
+into place, so a failed export leaves the previous outputs untouched and no
+half-written files behind.
+"""
+
+import json
+import os
+import re
+from datetime import date, datetime, timedelta, timezone
+from xml.sax.saxutils import escape, quoteattr
+
+from .config import get_settings
+from .generator import render_html
+from .views import build_views
+
+EXPORT_FORMATS = ("html", "ics", "atom", "json")
+
+FEED_ID = "https://openshift-pipelines.github.io/cfp-radar/"
+
+
+def _slugify(text: str) -> str:
+    """Make a filesystem-friendly slug from a city or topic name."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "unknown"
+
+
+class EventWriter:
+    """Base class for streaming event writers.
+
+    Writers create no files until they are given an event or finished, so
+    building them has nothing to clean up.
+    """
+
+    def write(self, event) -> None:
+        raise NotImplementedError
+
+    def finish(self) -> list["AtomicFile"]:
+        """Complete the output; returns its files, still under their temporary names."""
+        raise NotImplementedError
+
+    def abort(self) -> None:
+        """Discard the output after a failed export."""
+
+
+class AtomicFile:
+    """Text file written under a temporary name and moved into place on commit.
+
+    The file may be closed between writes to release its handle; the next
+    write reopens it for appending.
+    """
+
+    def __init__(self, path: str, newline: str | None = None):
+        self.path = path
+        self.tmp = f"{path}.tmp"
+        self.newline = newline
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(self.tmp, "w", encoding="utf-8", newline=newline)
+
+    def write(self, text: str) -> None:
+        if self.file.closed:
+            self.file = open(self.tmp, "a", encoding="utf-8", newline=self.newline)
+        self.file.write(text)
+
+    def close(self) -> None:
+        self.file.close()
+
+    def commit(self) -> None:
+        self.file.close()
+        os.replace(self.tmp, self.path)
+
+    def abort(self) -> None:
+        self.file.close()
+        if os.path.exists(self.tmp):
+            os.remove(self.tmp)
+
+
+def commit_all(files: list[AtomicFile]) -> None:
+    """Close every file, then move them all into place; on failure none are moved."""
+    try:
+        for f in files:
+            f.close()
+    except BaseException:
+        for f in files:
+            f.abort()
+        raise
+    for f in files:
+        f.commit()
+
+
+class HtmlWriter(EventWriter):
+    """Render the static HTML page."""
+
+    def __init__(self, output_file: str):
+        self.output_file = output_file
+        self.views = []
+        self.file = None
+
+    def write(self, event) -> None:
+        self.views.append(event)
+
+    def finish(self) -> list[AtomicFile]:
+        self.file = render_html(self.views, self.output_file, commit=False)
+        return [self.file]
+
+    def abort(self) -> None:
+        if self.file:
+            self.file.abort()
+
+
+class IcsWriter(EventWriter):
+    """Write one iCalendar file per city and per topic, plus an all-events file.
+
+    Each event produces a VEVENT for the conference itself and, when known,
+    an all-day VEVENT on its CFP deadline. VEVENTs are streamed to each
+    calendar's temporary file; at most MAX_OPEN_CALENDARS of them are kept
+    open, the least recently written one is closed to make room.
+    """
+
+    MAX_OPEN_CALENDARS = 32
+
+    def __init__(self, output_dir: str):
+        self.output_dir = os.path.join(output_dir, "ics")
+        self.calendars = {}  # file name -> AtomicFile
+        self.open = {}  # names of the calendars with an open handle, least recently written first
+        self.stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.topics = get_settings().topic_set
+
+    def _calendar(self, name: str, title: str) -> AtomicFile:
+        f = self.calendars.get(name)
+        if f is None:
+            f = self.calendars[name] = AtomicFile(os.path.join(self.output_dir, f"{name}.ics"), newline="")
+            header = [
+                "BEGIN:VCALENDAR",
+                "VERSION:2.0",
+                "PRODID:-//cfp-radar//EN",
+                "CALSCALE:GREGORIAN",
+                f"X-WR-CALNAME:{_ics_escape(title)}",
+            ]
+            f.write("".join(self._fold(line) for line in header))
+        self.open.pop(name, None)
+        self.open[name] = True
+        if len(self.open) > self.MAX_OPEN_CALENDARS:
+            oldest = next(iter(self.open))
+            del self.open[oldest]
+            self.calendars[oldest].close()
+        return f
+
+    @staticmethod
+    def _fold(line: str) -> str:
+        # RFC 5545: fold lines longer than 75 octets
+        data = line.encode("utf-8")
+        folded = []
+        while len(data) > 75:
+            cut = 75
+            while (data[cut] & 0xC0) == 0x80:  # don't split a UTF-8 sequence
+                cut -= 1
+            folded.append(data[:cut].decode("utf-8") + "\r\n")
+            data = b" " + data[cut:]
+        folded.append(data.decode("utf-8") + "\r\n")
+        return "".join(folded)
+
+    def _vevents(self, event) -> list[str]:
+        end = (event.end_date or event.start_date) + timedelta(days=1)
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{event.id}@cfp-radar",
+            f"DTSTAMP:{self.stamp}",
+            f"DTSTART;VALUE=DATE:{event.start_date:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{end:%Y%m%d}",
+            f"SUMMARY:{_ics_escape(event.name)}",
+            f"LOCATION:{_ics_escape(f'{event.city}, {event.country}')}",
+            f"URL:{event.website}",
+            f"DESCRIPTION:{_ics_escape(event.description)}",
+            "END:VEVENT",
+        ]
+        if event.cfp_deadline:
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:{event.id}-cfp@cfp-radar",
+                f"DTSTAMP:{self.stamp}",
+                f"DTSTART;VALUE=DATE:{event.cfp_deadline:%Y%m%d}",
+                f"DTEND;VALUE=DATE:{event.cfp_deadline + timedelta(days=1):%Y%m%d}",
+                f"SUMMARY:{_ics_escape(f'CFP deadline: {event.name}')}",
+                f"URL:{event.cfp_url or event.website}",
+                "TRANSP:TRANSPARENT",
+                "END:VEVENT",
+            ]
+        return lines
+
+    def write(self, event) -> None:
+        targets = [("all", "CFP Radar")]
+        if event.city:
+            targets.append((f"city-{_slugify(event.city)}", f"CFP Radar: {event.city}"))
+        for topic in {t.lower() for t in event.topics} & self.topics:
+            targets.append((f"topic-{_slugify(topic)}", f"CFP Radar: {topic}"))
+
+        text = "".join(self._fold(line) for line in self._vevents(event))
+        for name, title in targets:
+            self._calendar(name, title).write(text)
+
+    def finish(self) -> list[AtomicFile]:
+        files = list(self.calendars.values())
+        for f in files:
+            f.write(self._fold("END:VCALENDAR"))
+            f.close()
+        self.open = {}
+        return files
+
+    def abort(self) -> None:
+        for f in self.calendars.values():
+            f.abort()
+        self.calendars = {}
+        self.open = {}
+
+
+class AtomWriter(EventWriter):
+    """Write Atom feeds of all events and of events with an open CFP."""
+
+    def __init__(self, output_dir: str, today: date | None = None):
+        self.output_dir = os.path.join(output_dir, "feeds")
+        self.today = today or date.today()
+        self.updated = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.feeds = {}
+
+    def _feed(self, name: str, title: str):
+        f = self.feeds.get(name)
+        if f is None:
+            f = AtomicFile(os.path.join(self.output_dir, f"{name}.atom"))
+            f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+            f.write('<feed xmlns="http://www.w3.org/2005/Atom">\n')
+            f.write(f"  <id>{FEED_ID}feeds/{name}.atom</id>\n")
+            f.write(f"  <title>{escape(title)}</title>\n")
+            f.write(f"  <updated>{self.updated}</updated>\n")
+            f.write(f'  <link href="{FEED_ID}"/>\n')
+            self.feeds[name] = f
+        return f
+
+    def _entry(self, event) -> str:
+        summary = f"{event.city}, {event.country} | {event.start_date:%b %d, %Y}"
+        if event.cfp_deadline:
+            summary += f" | CFP: {event.cfp_deadline:%b %d, %Y}"
+        if event.description:
+            summary += f"\n{event.description}"
+        updated = event.last_updated.replace(microsecond=0)
+        if updated.tzinfo is None:
+            updated = updated.replace(tzinfo=timezone.utc)
+        return (
+            "  <entry>\n"
+            f"    <id>urn:cfp-radar:{escape(event.id)}</id>\n"
+            f"    <title>{escape(event.name)}</title>\n"
+            f"    <updated>{updated.isoformat()}</updated>\n"
+            f"    <link href={quoteattr(event.cfp_url or event.website)}/>\n"
+            f"    <summary>{escape(summary)}</summary>\n"
+            + "".join(f"    <category term={quoteattr(t)}/>\n" for t in event.topics)
+            + "  </entry>\n"
+        )
+
+    def write(self, event) -> None:
+        entry = self._entry(event)
+        self._feed("events", "CFP Radar: upcoming events").write(entry)
+        if event.cfp_deadline and event.cfp_deadline >= self.today:
+            self._feed("cfp", "CFP Radar: open calls for papers").write(entry)
+
+    def finish(self) -> list[AtomicFile]:
+        files = list(self.feeds.values())
+        for f in files:
+            f.write("</feed>\n")
+            f.close()
+        return files
+
+    def abort(self) -> None:
+        for f in self.feeds.values():
+            f.abort()
+        self.feeds = {}
+
+
+class JsonWriter(EventWriter):
+    """Write a JSON API snapshot of the events, one array element at a time."""
+
+    def __init__(self, output_dir: str):
+        self.path = os.path.join(output_dir, "api", "events.json")
+        self.file = None
+        self.count = 0
+
+    def _file(self) -> AtomicFile:
+        if self.file is None:
+            self.file = AtomicFile(self.path)
+            generated = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            self.file.write(f'{{"generated": "{generated}", "events": [')
+        return self.file
+
+    def write(self, event) -> None:
+        f = self._file()
+        if self.count:
+            f.write(",")
+        f.write("\n")
+        f.write(json.dumps(event.to_dict()))
+        self.count += 1
+
+    def finish(self) -> list[AtomicFile]:
+        f = self._file()
+        f.write(f'\n], "count": {self.count}}}\n')
+        f.close()
+        return [f]
+
+    def abort(self) -> None:
+        if self.file:
+            self.file.abort()
+
+
+def _ics_escape(text: str) -> str:
+    """Escape text values for iCalendar properties."""
+    return (
+        (text or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def make_writers(formats, output_file: str) -> list[EventWriter]:
+    """Create writers for the requested formats.
+
+    Args:
+        formats: Iterable of format names from EXPORT_FORMATS
+        output_file: HTML output path; other formats are written next to it
+    """
+    formats = list(formats)
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format: {unknown[0]}")
+    output_dir = os.path.dirname(output_file) or "."
+    writers = []
+    for fmt in formats:
+        if fmt == "html":
+            writers.append(HtmlWriter(output_file))
+        elif fmt == "ics":
+            writers.append(IcsWriter(output_dir))
+        elif fmt == "atom":
+            writers.append(AtomWriter(output_dir))
+        elif fmt == "json":
+            writers.append(JsonWriter(output_dir))
+    return writers
+
+
+def export_events(events, output_file: str, formats=("html",), order: str = "deadline") -> list[str]:
+    """Build sorted views once and stream them to every selected writer.
+
+    Args:
+        events: Iterable of Event objects
+        output_file: Path of the HTML output; other formats go in its directory
+        formats: Format names to produce (see EXPORT_FORMATS)
+        order: Display order of the events (see views.SORT_ORDERS)
+
+    Returns:
+        Paths of all files written
+    """
+    writers = make_writers(formats, output_file)
+    try:
+        for view in build_views(events, order=order):
+            for writer in writers:
+                writer.write(view)
+
+        files = []
+        for writer in writers:
+            files.extend(writer.finish())
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+    # Every output is complete: replace the previous ones together
+    commit_all(files)
+    return [f.path for f in files]
@@ -3,10 +3,12 @@
 import os
 import shutil
 from datetime import date
+from functools import lru_cache
 
 from jinja2 import Environment, FileSystemLoader
 
-from .config import TARGET_CITIES, TOPICS
+from .config import get_settings
+from .views import build_views
 
 
 def generate_html(events: list, output_file: str) -> None:
@@ -16,49 +18,39 @@ def generate_html(events: list, output_file: str) -> None:
         events: List of Event objects
         output_file: Path to write HTML file to
     """
+    render_html(build_views(events), output_file)
 
-    # Sort by CFP deadline (upcoming first), then by start date
-    def sort_key(e):
-        cfp_priority = e.cfp_deadline if e.cfp_deadline else date(2099, 12, 31)
-        return (cfp_priority, e.start_date)
 
-    events = sorted(events, key=sort_key)
+def render_html(views: list, output_file: str, commit: bool = True):
+    """Render precomputed event views to a static HTML file.
 
-    # Extract unique countries with counts
-    country_counts = {}
-    for event in events:
-        country = event.country
-        country_counts[country] = country_counts.get(country, 0) + 1
+    The page is streamed to a temporary file that replaces ``output_file``
+    once it is complete.
 
-    # Sort countries by count (most events first)
-    countries = sorted(country_counts.items(), key=lambda x: x[1], reverse=True)
+    Args:
+        views: List of EventView objects, in display order
+        output_file: Path to write HTML file to
+        commit: Move the page into place; otherwise the caller commits or
+            aborts the returned file
 
-    # Setup Jinja2 templates
-    templates_dir = os.path.join(os.path.dirname(__file__), "web", "templates")
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=True)
-    template = env.get_template("index.html")
-
-    cities = [c["city"] for c in TARGET_CITIES]
-
-    html = template.render(
-        events=events,
-        cities=cities,
-        topics=TOPICS[:8],
-        selected_city=None,
-        selected_topic=None,
-        has_cfp=None,
-        today=date.today(),
-        countries=countries,
-    )
-
-    # Ensure output directory exists
+    Returns:
+        The exporter.AtomicFile holding the page
+    """
+    # Imported here: the exporter builds on this module
+    from .exporter import AtomicFile
+
+    template = template_environment().get_template("index.html")
     output_dir = os.path.dirname(output_file)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
 
-    # Write the HTML file
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(html)
+    f = AtomicFile(output_file)
+    try:
+        template.stream(**page_context(views)).dump(f)
+        f.close()
+        if commit:
+            f.commit()
+    except BaseException:
+        f.abort()
+        raise
 
     # Copy optimized logo to output directory
     logo_src = os.path.join("data", "logo.webp")
@@ -66,3 +58,35 @@ def generate_html(events: list, output_file: str) -> None:
         logo_dst = os.path.join(output_dir, "logo.webp")
         if not os.path.exists(logo_dst):
             shutil.copy2(logo_src, logo_dst)
+    return f
+
+
+@lru_cache(maxsize=1)
+def template_environment() -> Environment:
+    """Return the shared Jinja2 environment for the web templates."""
+    templates_dir = os.path.join(os.path.dirname(__file__), "web", "templates")
+    return Environment(loader=FileSystemLoader(templates_dir), autoescape=True)
+
+
+def page_context(views: list) -> dict:
+    """Build the template variables for the full events page."""
+    # Extract unique countries with counts
+    country_counts = {}
+    for view in views:
+        country = view.event.country
+        country_counts[country] = country_counts.get(country, 0) + 1
+
+    # Sort countries by count (most events first)
+    countries = sorted(country_counts.items(), key=lambda x: x[1], reverse=True)
+
+    settings = get_settings()
+    return {
+        "events": views,
+        "cities": settings.city_names,
+        "topics": settings.topics[:8],
+        "selected_city": None,
+        "selected_topic": None,
+        "has_cfp": None,
+        "today": date.today(),
+        "countries": countries,
+    }
@@ -0,0 +1,109 @@
+"""Persistent ledger of sent notifications to suppress repeat alerts."""
+
+import json
+import os
+from datetime import date, datetime
+
+# Buckets in escalation order: a more urgent bucket re-alerts, a less urgent one does not
+URGENCY_RANK = {"open": 0, "soon": 1, "urgent": 2, "critical": 3}
+
+SENT = "sent"
+PENDING = "pending"
+
+# Channel that alerts in ledgers without per-channel keys went to
+LEGACY_CHANNEL = "slack"
+
+
+def alert_key(channel: str, event_id: str, deadline: date, urgency: str) -> str:
+    """Ledger key for one alert: channel, event id, CFP deadline and urgency bucket."""
+    return f"{channel}|{event_id}|{deadline.isoformat()}|{urgency}"
+
+
+class NotificationLedger:
+    """JSON-backed record of alerts, keyed by (channel, event id, deadline, urgency bucket).
+
+    Alerts are recorded as pending before they are sent and marked sent as
+    soon as their message is delivered, with every change written atomically.
+    An alert left pending by a crashed run is treated as possibly delivered
+    and is not sent again, so a retried run never double-posts.
+
+    Ledgers written before keys named a channel only tracked the Slack
+    webhook; their keys are read as alerts sent to the "slack" channel.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.entries = {}
+        if os.path.exists(filepath):
+            with open(filepath) as f:
+                self.entries = {
+                    key if key.count("|") == 3 else f"{LEGACY_CHANNEL}|{key}": entry
+                    for key, entry in json.load(f).items()
+                }
+
+    def status(self, key: str) -> str | None:
+        entry = self.entries.get(key)
+        return entry["status"] if entry else None
+
+    def is_new(self, view, channel: str = "slack") -> bool:
+        """Whether an alert for this view is new or an escalation on a channel.
+
+        Costs at most one dict lookup per urgency bucket, whatever the
+        size of the history.
+        """
+        if view.urgency not in URGENCY_RANK:
+            return False
+        rank = URGENCY_RANK[view.urgency]
+        event = view.event
+        for bucket, bucket_rank in URGENCY_RANK.items():
+            if bucket_rank >= rank and alert_key(channel, event.id, event.cfp_deadline, bucket) in self.entries:
+                return False
+        return True
+
+    def select(self, views: list, channel: str = "slack") -> list:
+        """Return the views that need an alert on a channel."""
+        return [view for view in views if self.is_new(view, channel)]
+
+    def in_doubt(self) -> list[str]:
+        """Keys left pending by an interrupted run."""
+        return [key for key, entry in self.entries.items() if entry["status"] == PENDING]
+
+    def begin(self, keys: list[str]) -> None:
+        """Record alerts as pending before sending them."""
+        now = datetime.now().isoformat(timespec="seconds")
+        for key in keys:
+            self.entries[key] = {"status": PENDING, "at": now}
+        self.save()
+
+    def mark_sent(self, keys: list[str]) -> None:
+        """Record alerts as delivered."""
+        now = datetime.now().isoformat(timespec="seconds")
+        for key in keys:
+            self.entries[key] = {"status": SENT, "at": now}
+        self.save()
+
+    def discard(self, keys: list[str]) -> None:
+        """Forget alerts that definitely failed so the next run retries them."""
+        for key in keys:
+            self.entries.pop(key, None)
+        self.save()
+
+    def prune(self, before: date) -> int:
+        """Drop entries whose CFP deadline is before ``before``."""
+        cutoff = before.isoformat()
+        stale = [key for key in self.entries if key.split("|")[-2] < cutoff]
+        for key in stale:
+            del self.entries[key]
+        return len(stale)
+
+    def save(self) -> None:
+        """Atomically write the ledger to disk."""
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.filepath}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.filepath)
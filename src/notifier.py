@@ -1,28 +1,29 @@
 """Slack notification system for CFP deadlines."""
 
-import httpx
 from datetime import date
-from .collector.models import EventStore, Event
-from .config import EVENTS_FILE, SLACK_WEBHOOK_URL
-
-
-async def check_upcoming_cfps(days: int = 14) -> list[Event]:
-    """Check for CFPs closing within the specified number of days and send notifications."""
+from .channels import fan_out, load_channels, send_digests
+from .collector.models import EventStore
+from .config import EVENTS_FILE, LEDGER_FILE, SLACK_WEBHOOK_URL
+from .delivery import DeliveryReport, SlackDelivery, pack_messages, split_text
+from .ledger import NotificationLedger
+from .views import EventView, build_views
+
+
+async def check_upcoming_cfps(days: int = 14, digest: bool = False, force: bool = False) -> list[EventView]:
+    """Check for CFPs closing within the specified number of days and send notifications.
+
+    Args:
+        days: Notify for CFPs closing within this many days
+        digest: Send one daily digest instead of a message per event
+        force: Ignore the notification ledger and alert on every upcoming CFP
+    """
     store = EventStore(EVENTS_FILE)
-    events = store.load()
-
-    today = date.today()
-    upcoming = []
-
-    for event in events:
-        if not event.cfp_deadline:
-            continue
-        days_left = (event.cfp_deadline - today).days
-        if 0 <= days_left <= days:
-            upcoming.append(event)
 
-    # Sort by deadline
-    upcoming.sort(key=lambda e: e.cfp_deadline)
+    # Views come sorted by deadline
+    upcoming = [
+        view for view in build_views(store.load())
+        if view.days_left is not None and 0 <= view.days_left <= days
+    ]
 
     if not upcoming:
         print("No CFPs closing soon.")
@@ -30,113 +31,116 @@ async def check_upcoming_cfps(days: int = 14) -> list[Event]:
 
     print(f"Found {len(upcoming)} CFPs closing within {days} days")
 
-    if SLACK_WEBHOOK_URL:
-        await send_slack_notifications(upcoming)
+    channels = load_channels()
+    if channels:
+        ledger = None if force else NotificationLedger(LEDGER_FILE)
+        if ledger:
+            in_doubt = ledger.in_doubt()
+            if in_doubt:
+                print(f"Skipping {len(in_doubt)} alert(s) left pending by an interrupted run")
+            if ledger.prune(before=date.today()):
+                ledger.save()
+        send = send_digests if digest else fan_out
+        reports = await send(upcoming, channels, ledger)
+        for name, report in reports.items():
+            print(f"{name}:")
+            _print_report(report, "alert")
     else:
-        print("SLACK_WEBHOOK_URL not set, skipping Slack notifications")
+        print("No notification channels configured and SLACK_WEBHOOK_URL not set, skipping notifications")
         print("\nUpcoming CFPs:")
-        for event in upcoming:
-            days_left = (event.cfp_deadline - today).days
-            print(f"  - {event.name} ({event.city}): {days_left} days left")
+        for view in upcoming:
+            print(f"  - {view.event.name} ({view.event.city}): {view.days_left} days left")
 
     return upcoming
 
 
-async def send_slack_notifications(events: list[Event]) -> None:
-    """Send Slack notifications for upcoming CFP deadlines."""
-    today = date.today()
+def event_blocks(view: EventView) -> list[dict]:
+    """Build the Slack blocks announcing one CFP deadline."""
+    event = view.event
+    days_left = view.days_left
+
+    urgency = ""
+    if view.urgency == "critical":
+        urgency = ":rotating_light: URGENT: "
+    elif view.urgency == "urgent":
+        urgency = ":warning: "
+
+    cfp_link = f"<{event.cfp_url}|Submit your talk>" if event.cfp_url else f"<{event.website}|Event website>"
+
+    return [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"{urgency}*CFP closing soon: {event.name}*",
+            },
+        },
+        {
+            "type": "section",
+            "fields": [
+                {
+                    "type": "mrkdwn",
+                    "text": f"*Location:*\n{event.city}, {event.country}",
+                },
+                {
+                    "type": "mrkdwn",
+                    "text": f"*Event Date:*\n{view.start_long_label}",
+                },
+                {
+                    "type": "mrkdwn",
+                    "text": f"*CFP Deadline:*\n{view.cfp_long_label}",
+                },
+                {
+                    "type": "mrkdwn",
+                    "text": f"*Days Left:*\n{days_left} day{'s' if days_left != 1 else ''}",
+                },
+            ],
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": cfp_link,
+            },
+        },
+        {"type": "divider"},
+    ]
+
+
+async def send_slack_notifications(
+    views: list[EventView], delivery: SlackDelivery | None = None
+) -> DeliveryReport:
+    """Send Slack notifications for upcoming CFP deadlines.
+
+    Events are packed into as few messages as Slack's block limit allows
+    and sent through a rate-limited, retrying delivery engine.
+    """
+    delivery = delivery or SlackDelivery(SLACK_WEBHOOK_URL)
+    messages = pack_messages([event_blocks(view) for view in views])
+    report = await delivery.send(messages)
+    _print_report(report, "event")
+    return report
+
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for event in events:
-            days_left = (event.cfp_deadline - today).days
-
-            # Build message
-            urgency = ""
-            if days_left <= 3:
-                urgency = ":rotating_light: URGENT: "
-            elif days_left <= 7:
-                urgency = ":warning: "
-
-            cfp_link = f"<{event.cfp_url}|Submit your talk>" if event.cfp_url else f"<{event.website}|Event website>"
-
-            message = {
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"{urgency}*CFP closing soon: {event.name}*",
-                        },
-                    },
-                    {
-                        "type": "section",
-                        "fields": [
-                            {
-                                "type": "mrkdwn",
-                                "text": f"*Location:*\n{event.city}, {event.country}",
-                            },
-                            {
-                                "type": "mrkdwn",
-                                "text": f"*Event Date:*\n{event.start_date.strftime('%B %d, %Y')}",
-                            },
-                            {
-                                "type": "mrkdwn",
-                                "text": f"*CFP Deadline:*\n{event.cfp_deadline.strftime('%B %d, %Y')}",
-                            },
-                            {
-                                "type": "mrkdwn",
-                                "text": f"*Days Left:*\n{days_left} day{'s' if days_left != 1 else ''}",
-                            },
-                        ],
-                    },
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": cfp_link,
-                        },
-                    },
-                    {"type": "divider"},
-                ]
-            }
-
-            try:
-                response = await client.post(SLACK_WEBHOOK_URL, json=message)
-                if response.status_code == 200:
-                    print(f"  Sent notification for {event.name}")
-                else:
-                    print(f"  Failed to notify for {event.name}: {response.status_code}")
-            except Exception as e:
-                print(f"  Error sending notification for {event.name}: {e}")
-
-
-async def send_daily_digest(events: list[Event]) -> None:
-    """Send a daily digest of all upcoming CFPs to Slack."""
-    if not SLACK_WEBHOOK_URL or not events:
-        return
+async def send_daily_digest(views: list[EventView], delivery: SlackDelivery | None = None) -> DeliveryReport | None:
+    """Send a daily digest of all upcoming CFPs to Slack.
+
+    The once-a-day limit is kept by channels.send_digests, which calls this
+    for Slack channels.
+    """
+    if not views or not (delivery or SLACK_WEBHOOK_URL):
+        return None
 
     today = date.today()
 
-    # Group by urgency
-    urgent = []  # <= 3 days
-    soon = []    # <= 7 days
-    upcoming = []  # <= 14 days
-
-    for event in events:
-        if not event.cfp_deadline:
-            continue
-        days_left = (event.cfp_deadline - today).days
-        if days_left < 0:
-            continue
-        elif days_left <= 3:
-            urgent.append((event, days_left))
-        elif days_left <= 7:
-            soon.append((event, days_left))
-        elif days_left <= 14:
-            upcoming.append((event, days_left))
+    # Group by urgency bucket
+    buckets = {"critical": [], "urgent": [], "soon": []}
+    for view in views:
+        if view.urgency in buckets:
+            buckets[view.urgency].append((view.event, view.days_left))
 
     # Build digest message
-    blocks = [
+    header = [
         {
             "type": "header",
             "text": {
@@ -154,6 +158,7 @@ async def send_daily_digest(events: list[Event]) -> None:
             ],
         },
     ]
+    sections = []
 
     def format_events(event_list: list, header: str, emoji: str) -> None:
         if not event_list:
@@ -161,24 +166,34 @@ async def send_daily_digest(events: list[Event]) -> None:
         text = f"{emoji} *{header}*\n"
         for event, days in event_list:
             text += f"• {event.name} ({event.city}) - {days}d left\n"
-        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": text}})
+        # Long sections are split to stay under Slack's text limit
+        for chunk in split_text(text):
+            sections.append([{"type": "section", "text": {"type": "mrkdwn", "text": chunk}}])
 
-    format_events(urgent, "Closing in 3 days or less!", ":rotating_light:")
-    format_events(soon, "Closing this week", ":warning:")
-    format_events(upcoming, "Closing in 2 weeks", ":calendar:")
+    format_events(buckets["critical"], "Closing in 3 days or less!", ":rotating_light:")
+    format_events(buckets["urgent"], "Closing this week", ":warning:")
+    format_events(buckets["soon"], "Closing in 2 weeks", ":calendar:")
 
-    if len(blocks) == 2:
-        blocks.append({
+    if not sections:
+        sections.append([{
             "type": "section",
             "text": {"type": "mrkdwn", "text": "No CFPs closing in the next 2 weeks."},
-        })
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.post(SLACK_WEBHOOK_URL, json={"blocks": blocks})
-            if response.status_code == 200:
-                print("Daily digest sent to Slack")
-            else:
-                print(f"Failed to send digest: {response.status_code}")
-        except Exception as e:
-            print(f"Error sending digest: {e}")
+        }])
+
+    messages = pack_messages(sections, header=header)
+    delivery = delivery or SlackDelivery(SLACK_WEBHOOK_URL)
+    report = await delivery.send(messages)
+    if report.messages_failed:
+        print(f"Failed to send digest: {'; '.join(report.errors)}")
+    else:
+        print("Daily digest sent to Slack")
+    return report
+
+
+def _print_report(report: DeliveryReport, item: str) -> None:
+    print(
+        f"  Delivered {report.delivered} {item}(s) in {report.messages_sent} message(s), "
+        f"{report.failed} failed, {report.retries} retries"
+    )
+    for error in report.errors:
+        print(f"  Error: {error}")
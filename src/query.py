@@ -0,0 +1,415 @@
+"""Ad-hoc event queries: a small filter language compiled to a predicate.
+
+Expressions combine field comparisons with ``and``, ``or``, ``not`` and
+parentheses::
+
+    country in (France, India) and cfp_deadline < +21d and topic ~ kube
+
+Operators are ``=``, ``!=``, ``<``, ``<=``, ``>``, ``>=``, ``~`` (contains),
+``!~`` (does not contain) and ``in (a, b, ...)``. Text comparisons ignore
+case; ``topic`` matches if any of an event's topics does. Dates are written
+``2026-05-01``, ``today`` or relative to today as ``+21d``, ``-2w``. The
+literal ``none`` matches missing values, e.g. ``cfp_deadline != none``.
+
+An expression is parsed and type-checked once, then compiled into nested
+closures, so evaluating it per event involves no parsing or field lookups.
+"""
+
+import csv
+import heapq
+import json
+import re
+from datetime import date, timedelta
+from typing import Callable, Iterable, TextIO
+
+from .collector.models import Event
+
+QUERY_FORMATS = ("table", "json", "csv")
+
+# Field name -> (Event attribute, kind)
+FIELDS = {
+    "name": ("name", "text"),
+    "city": ("city", "text"),
+    "country": ("country", "text"),
+    "type": ("event_type", "text"),
+    "cfp_status": ("cfp_status", "text"),
+    "venue": ("venue", "text"),
+    "description": ("description", "text"),
+    "website": ("website", "text"),
+    "id": ("id", "text"),
+    "topic": ("topics", "list"),
+    "start": ("start_date", "date"),
+    "end": ("end_date", "date"),
+    "cfp_deadline": ("cfp_deadline", "date"),
+    "relevance": ("relevance_score", "number"),
+    "attendees": ("expected_attendees", "number"),
+}
+
+FIELD_ALIASES = {
+    "topics": "topic",
+    "event_type": "type",
+    "start_date": "start",
+    "end_date": "end",
+    "cfp": "cfp_deadline",
+    "deadline": "cfp_deadline",
+    "relevance_score": "relevance",
+    "score": "relevance",
+    "expected_attendees": "attendees",
+}
+
+# Relative evaluation cost of a comparison by field kind; cheap tests run
+# first in a conjunction so expensive substring scans are often skipped
+_COSTS = {"number": 0, "date": 0, "text": 1, "list": 2}
+_LONG_TEXT_COST = 3  # description
+
+_ORDERING = {"<", "<=", ">", ">="}
+_KEYWORDS = {"and", "or", "not", "in"}
+
+_TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+      | (?P<op><=|>=|!=|==|!~|=|<|>|~)
+      | (?P<punct>[(),])
+      | (?P<word>[^\s()"',<>=!~]+)
+    )""",
+    re.VERBOSE,
+)
+
+_RELATIVE_DATE = re.compile(r"^([+-]\d+)([dw])$")
+
+
+class QueryError(ValueError):
+    """Raised when a query expression or sort key is invalid."""
+
+
+def _tokenize(text: str) -> list[tuple[str, str, int]]:
+    """Split an expression into (kind, value, offset) tokens."""
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_PATTERN.match(text, pos)
+        if not match:
+            raise QueryError(f"Unexpected character {text[pos:].lstrip()[:1]!r} at offset {pos}")
+        kind = match.lastgroup
+        value, offset = match.group(kind), match.start(kind)
+        if kind == "string":
+            value = value[1:-1]
+        elif kind == "word" and value.lower() in _KEYWORDS:
+            kind, value = "keyword", value.lower()
+        tokens.append((kind, value, offset))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing a small tuple AST.
+
+    Nodes are ``("and", [nodes])``, ``("or", [nodes])``, ``("not", node)``
+    and ``("cmp", field, op, values)``.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None, len(self.text))
+
+    def _next(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def _expect(self, kind, value=None):
+        token = self._next()
+        if token[0] != kind or (value is not None and token[1] != value):
+            found = repr(token[1]) if token[0] else "end of query"
+            raise QueryError(f"Expected {value or kind} at offset {token[2]}, found {found}")
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise QueryError("Empty query")
+        node = self._or()
+        if self.pos < len(self.tokens):
+            _, value, offset = self._peek()
+            raise QueryError(f"Unexpected {value!r} at offset {offset}")
+        return node
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._peek()[:2] == ("keyword", "or"):
+            self._next()
+            nodes.append(self._and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def _and(self):
+        nodes = [self._not()]
+        while self._peek()[:2] == ("keyword", "and"):
+            self._next()
+            nodes.append(self._not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def _not(self):
+        if self._peek()[:2] == ("keyword", "not"):
+            self._next()
+            return ("not", self._not())
+        if self._peek()[:2] == ("punct", "("):
+            self._next()
+            node = self._or()
+            self._expect("punct", ")")
+            return node
+        return self._comparison()
+
+    def _comparison(self):
+        kind, name, offset = self._next()
+        if kind != "word":
+            found = repr(name) if kind else "end of query"
+            raise QueryError(f"Expected a field name at offset {offset}, found {found}")
+        field = FIELD_ALIASES.get(name.lower(), name.lower())
+        if field not in FIELDS:
+            raise QueryError(f"Unknown field {name!r} at offset {offset}")
+        kind, op, _ = self._next()
+        if kind == "keyword" and op == "in":
+            self._expect("punct", "(")
+            values = [self._value()]
+            while self._peek()[:2] == ("punct", ","):
+                self._next()
+                values.append(self._value())
+            self._expect("punct", ")")
+            return ("cmp", field, "in", values)
+        if kind != "op":
+            raise QueryError(f"Expected an operator after {name!r} at offset {offset}")
+        return ("cmp", field, "=" if op == "==" else op, [self._value()])
+
+    def _value(self) -> str:
+        kind, value, offset = self._next()
+        if kind == "string":
+            return value
+        if kind != "word":
+            found = repr(value) if kind else "end of query"
+            raise QueryError(f"Expected a value at offset {offset}, found {found}")
+        # Unquoted values may span several words: city = Tel Aviv
+        words = [value]
+        while self._peek()[0] == "word":
+            words.append(self._next()[1])
+        return " ".join(words)
+
+
+def _parse_date(value: str, today: date) -> date:
+    lowered = value.lower()
+    if lowered == "today":
+        return today
+    match = _RELATIVE_DATE.match(lowered)
+    if match:
+        amount = int(match[1]) * (7 if match[2] == "w" else 1)
+        return today + timedelta(days=amount)
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise QueryError(f"Invalid date {value!r}; use YYYY-MM-DD, today or +Nd/+Nw") from None
+
+
+def _parse_number(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        raise QueryError(f"Invalid number {value!r}") from None
+
+
+def _compile_comparison(field: str, op: str, raw: list[str], today: date) -> Callable[[Event], bool]:
+    attr, kind = FIELDS[field]
+    if op in ("~", "!~") and kind not in ("text", "list"):
+        raise QueryError(f"Operator {op} needs a text field, not {field!r}")
+    if op in _ORDERING and kind in ("text", "list"):
+        raise QueryError(f"Operator {op} needs a date or number field, not {field!r}")
+
+    if [v.lower() for v in raw] == ["none"] and op in ("=", "!="):
+        want_missing = op == "="
+        if kind == "list":
+            return lambda e: (not getattr(e, attr)) == want_missing
+        return lambda e: (getattr(e, attr) in (None, "")) == want_missing
+
+    if kind == "date":
+        values = [_parse_date(v, today) for v in raw]
+    elif kind == "number":
+        values = [_parse_number(v) for v in raw]
+    else:
+        values = [v.lower() for v in raw]
+    value = values[0]
+
+    if kind == "list":
+        if op == "~":
+            return lambda e: any(value in t.lower() for t in getattr(e, attr))
+        if op == "!~":
+            return lambda e: not any(value in t.lower() for t in getattr(e, attr))
+        if op == "!=":
+            return lambda e: all(t.lower() != value for t in getattr(e, attr))
+        wanted = set(values)
+        return lambda e: any(t.lower() in wanted for t in getattr(e, attr))
+
+    if kind == "text":
+        if op == "~":
+            return lambda e: value in (getattr(e, attr) or "").lower()
+        if op == "!~":
+            return lambda e: value not in (getattr(e, attr) or "").lower()
+        if op == "!=":
+            return lambda e: (getattr(e, attr) or "").lower() != value
+        wanted = set(values)
+        return lambda e: (getattr(e, attr) or "").lower() in wanted
+
+    # Dates and numbers: a missing value only satisfies !=
+    if op == "in":
+        wanted = set(values)
+        return lambda e: getattr(e, attr) in wanted
+    if op == "!=":
+        return lambda e: getattr(e, attr) != value
+    if op == "=":
+        return lambda e: getattr(e, attr) == value
+    if op == "<":
+        return lambda e: (v := getattr(e, attr)) is not None and v < value
+    if op == "<=":
+        return lambda e: (v := getattr(e, attr)) is not None and v <= value
+    if op == ">":
+        return lambda e: (v := getattr(e, attr)) is not None and v > value
+    return lambda e: (v := getattr(e, attr)) is not None and v >= value
+
+
+def _cost(node) -> int:
+    if node[0] == "cmp":
+        return _LONG_TEXT_COST if node[1] == "description" else _COSTS[FIELDS[node[1]][1]]
+    if node[0] == "not":
+        return _cost(node[1])
+    return max(_cost(child) for child in node[1])
+
+
+def _compile(node, today: date) -> Callable[[Event], bool]:
+    if node[0] == "cmp":
+        return _compile_comparison(*node[1:], today)
+    if node[0] == "not":
+        inner = _compile(node[1], today)
+        return lambda e: not inner(e)
+    # Evaluate cheap operands first; and/or short-circuit on the rest
+    children = [_compile(child, today) for child in sorted(node[1], key=_cost)]
+    if node[0] == "and":
+        return lambda e: all(child(e) for child in children)
+    return lambda e: any(child(e) for child in children)
+
+
+def compile_query(text: str, today: date | None = None) -> Callable[[Event], bool]:
+    """Parse and compile a query expression into an event predicate.
+
+    Args:
+        text: Query expression; an empty or blank string matches every event
+        today: Date that ``today`` and relative dates refer to (default: today)
+
+    Raises:
+        QueryError: If the expression is malformed or compares a field
+            with an operator or value of the wrong type
+    """
+    if not text or not text.strip():
+        return lambda e: True
+    return _compile(_Parser(text).parse(), today or date.today())
+
+
+def sort_key(spec: str) -> tuple[Callable[[Event], tuple], bool]:
+    """Build a sort key from a field name, prefixed with ``-`` for descending.
+
+    Missing values sort last in both directions.
+
+    Returns:
+        (key function, descending)
+
+    Raises:
+        QueryError: If the field is unknown
+    """
+    descending = spec.startswith("-")
+    name = spec.lstrip("-+").lower()
+    field = FIELD_ALIASES.get(name, name)
+    if field not in FIELDS:
+        raise QueryError(f"Unknown sort field {spec!r}")
+    attr, kind = FIELDS[field]
+
+    def key(e: Event) -> tuple:
+        value = getattr(e, attr)
+        if kind == "list":
+            value = ", ".join(value).lower() if value else None
+        elif kind == "text":
+            value = value.lower() if value else None
+        # (present, value) in descending order still puts missing values last
+        return (value is not None, value) if descending else (value is None, value)
+
+    return key, descending
+
+
+def run_query(
+    events: Iterable[Event],
+    predicate: Callable[[Event], bool],
+    sort: str = "start",
+    limit: int | None = None,
+) -> list[Event]:
+    """Filter and order events.
+
+    With a ``limit`` only the best ``limit`` matches are kept while
+    streaming, using a heap instead of sorting every match.
+    """
+    key, descending = sort_key(sort)
+    matches = (e for e in events if predicate(e))
+    if limit is not None:
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        return pick(limit, matches, key=key)
+    return sorted(matches, key=key, reverse=descending)
+
+
+# Columns of csv rows; the table shows the first six
+COLUMNS = ("start_date", "name", "city", "country", "cfp_deadline", "relevance_score", "topics", "website")
+_TABLE_WIDTHS = (10, 40, 16, 16, 12, 5)
+
+
+def _cell(event: Event, column: str) -> str:
+    value = getattr(event, column)
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ";".join(value)
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+def write_rows(events: Iterable[Event], fmt: str, out: TextIO) -> int:
+    """Stream events to ``out`` one row at a time; returns the row count.
+
+    Raises:
+        QueryError: If the format is unknown
+    """
+    if fmt not in QUERY_FORMATS:
+        raise QueryError(f"Unknown format {fmt!r}; expected one of {', '.join(QUERY_FORMATS)}")
+    count = 0
+    if fmt == "json":
+        out.write("[")
+        for count, event in enumerate(events, 1):
+            out.write(",\n" if count > 1 else "\n")
+            out.write(json.dumps(event.to_dict()))
+        out.write("\n]\n" if count else "]\n")
+        return count
+    if fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(COLUMNS)
+        for count, event in enumerate(events, 1):
+            writer.writerow([_cell(event, c) for c in COLUMNS])
+        return count
+
+    columns = COLUMNS[:len(_TABLE_WIDTHS)]
+    header = ("start", "name", "city", "country", "cfp", "score")
+    out.write(" | ".join(h.ljust(w) for h, w in zip(header, _TABLE_WIDTHS)).rstrip() + "\n")
+    for count, event in enumerate(events, 1):
+        cells = []
+        for column, width in zip(columns, _TABLE_WIDTHS):
+            text = _cell(event, column)
+            cells.append((text[:width - 1] + "…" if len(text) > width else text).ljust(width))
+        out.write(" | ".join(cells).rstrip() + "\n")
+    return count
+
@@ -0,0 +1,124 @@
+"""Precomputed event view model shared by the generator, CLI and notifier."""
+
+from dataclasses import dataclass
+from datetime import date
+
+from .collector.models import Event
+
+# Urgency buckets by days left until the CFP deadline, most urgent first
+URGENCY_THRESHOLDS = (
+    ("critical", 3),
+    ("urgent", 7),
+    ("soon", 14),
+)
+
+NO_DEADLINE = date(2099, 12, 31)
+
+# Display orders: deadline (upcoming CFPs first), relevance (best match first), date (soonest first)
+SORT_ORDERS = ("deadline", "relevance", "date")
+
+
+@dataclass(slots=True)
+class EventView:
+    """An event with derived display fields computed once per run.
+
+    Attribute access falls through to the wrapped Event, so a view can be
+    used anywhere an Event is read (templates, exporters, notifications).
+    """
+
+    event: Event
+    days_left: int | None  # Days until CFP deadline, None without a deadline
+    urgency: str | None  # critical | urgent | soon | open | closed | None
+    days_label: str  # "Today!", "Tomorrow", "5 days left", "Closed" or ""
+    start_label: str  # "Mar 17, 2026"
+    end_label: str | None  # Only set for multi-day events
+    cfp_label: str | None  # "Mar 01"
+    start_long_label: str  # "March 17, 2026"
+    cfp_long_label: str | None  # "March 01, 2026"
+    sort_key: tuple
+
+    def __getattr__(self, name):
+        if name == "event":
+            raise AttributeError(name)
+        return getattr(self.event, name)
+
+
+def urgency_bucket(days_left: int | None) -> str | None:
+    """Map days left until a CFP deadline to an urgency bucket."""
+    if days_left is None:
+        return None
+    if days_left < 0:
+        return "closed"
+    for bucket, limit in URGENCY_THRESHOLDS:
+        if days_left <= limit:
+            return bucket
+    return "open"
+
+
+def _days_label(days_left: int | None) -> str:
+    if days_left is None:
+        return ""
+    if days_left == 0:
+        return "Today!"
+    if days_left == 1:
+        return "Tomorrow"
+    if days_left > 0:
+        return f"{days_left} days left"
+    return "Closed"
+
+
+def build_views(events, today: date | None = None, order: str = "deadline") -> list[EventView]:
+    """Build views for all events in one batched pass, sorted for display.
+
+    By default events are ordered by CFP deadline (upcoming first), then by
+    start date. Dates shared by several events are only formatted once.
+
+    Args:
+        events: Iterable of Event objects
+        today: Reference date for days-left computations (default: today)
+        order: One of SORT_ORDERS
+
+    Raises:
+        ValueError: If the order is unknown
+    """
+    if order not in SORT_ORDERS:
+        raise ValueError(f"Unknown sort order: {order}")
+    today = today or date.today()
+    today_ordinal = today.toordinal()
+    formatted = {}
+
+    def fmt(d: date, pattern: str) -> str:
+        key = (d, pattern)
+        label = formatted.get(key)
+        if label is None:
+            label = formatted[key] = d.strftime(pattern)
+        return label
+
+    views = []
+    for event in events:
+        deadline = event.cfp_deadline
+        days_left = deadline.toordinal() - today_ordinal if deadline else None
+        end_date = event.end_date
+        if order == "relevance":
+            sort_key = (-event.relevance_score, deadline or NO_DEADLINE, event.start_date)
+        elif order == "date":
+            sort_key = (event.start_date, deadline or NO_DEADLINE)
+        else:
+            sort_key = (deadline or NO_DEADLINE, event.start_date)
+        views.append(
+            EventView(
+                event=event,
+                days_left=days_left,
+                urgency=urgency_bucket(days_left),
+                days_label=_days_label(days_left),
+                start_label=fmt(event.start_date, "%b %d, %Y"),
+                end_label=fmt(end_date, "%b %d, %Y") if end_date and end_date != event.start_date else None,
+                cfp_label=fmt(deadline, "%b %d") if deadline else None,
+                start_long_label=fmt(event.start_date, "%B %d, %Y"),
+                cfp_long_label=fmt(deadline, "%B %d, %Y") if deadline else None,
+                sort_key=sort_key,
+            )
+        )
+
+    views.sort(key=lambda v: v.sort_key)
+    return views
@@ -0,0 +1,322 @@
+"""Async FastAPI service over the event store."""
+
+import gzip
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from datetime import date
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from ..collector.index import LiveIndex
+from ..config import DATA_DIR, EVENTS_FILE, get_settings
+from ..generator import page_context, template_environment
+from ..views import SORT_ORDERS, build_views
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip is offered without it
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+# Largest page size accepted by the paginated listing
+MAX_PAGE_SIZE = 500
+
+
+class CachedBody:
+    """A serialized response body with its strong ETag and lazily built encodings."""
+
+    def __init__(self, body: bytes, media_type: str):
+        self.body = body
+        self.media_type = media_type
+        self.digest = hashlib.sha1(body).hexdigest()[:20]
+        self.encoded = {}
+
+    def etag(self, encoding: str | None) -> str:
+        # Strong validators must differ between representations
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def encode(self, encoding: str | None) -> bytes:
+        if encoding is None:
+            return self.body
+        data = self.encoded.get(encoding)
+        if data is None:
+            if encoding == "br":
+                data = brotli.compress(self.body, quality=5)
+            else:
+                data = gzip.compress(self.body, compresslevel=6, mtime=0)
+            self.encoded[encoding] = data
+        return data
+
+
+class ResponseCache:
+    """Small LRU of serialized bodies keyed by request and store version."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key, body: CachedBody) -> None:
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _negotiate_encoding(request: Request, size: int) -> str | None:
+    """Pick the best content encoding the client accepts."""
+    if size < MIN_COMPRESS_SIZE:
+        return None
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _respond(request: Request, body: CachedBody) -> Response:
+    """Send a cached body, honoring If-None-Match and Accept-Encoding."""
+    encoding = _negotiate_encoding(request, len(body.body))
+    etag = body.etag(encoding)
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body.encode(encoding), media_type=body.media_type, headers=headers)
+
+
+def _json_body(data) -> CachedBody:
+    return CachedBody(json.dumps(data, separators=(",", ":")).encode(), "application/json")
+
+
+def iter_ndjson(events, batch_size: int = 64):
+    """Serialize events as newline-delimited JSON, a few lines per chunk."""
+    lines = []
+    for event in events:
+        lines.append(json.dumps(event.to_dict(), separators=(",", ":")))
+        if len(lines) == batch_size:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def _check_sort(sort: str) -> None:
+    if sort not in SORT_ORDERS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(SORT_ORDERS)}")
+
+
+def _html_body(html: str) -> CachedBody:
+    return CachedBody(html.encode("utf-8"), "text/html; charset=utf-8")
+
+
+def create_app(events_file: str = EVENTS_FILE, check_interval: float = 1.0) -> FastAPI:
+    """Create the API app.
+
+    Args:
+        events_file: Path to the events JSON store
+        check_interval: Seconds between checks for changes to the store file
+    """
+    app = FastAPI(title="CFP Radar", docs_url="/api/docs", openapi_url="/api/openapi.json")
+    live = LiveIndex(events_file, check_interval=check_interval)
+    cache = ResponseCache()
+    fragments = ResponseCache(maxsize=512)
+
+    def invalidate(index):
+        cache.clear()
+        fragments.clear()
+
+    live.on_reload(invalidate)
+    app.state.index = live
+    app.state.cache = cache
+    app.state.fragments = fragments
+
+    def cached(request: Request, build) -> Response:
+        index = live.current()
+        # CFP filters depend on today's date and the page on the config, so both are in the key
+        key = (request.url.path, str(request.query_params), index.version, get_settings().version, date.today())
+        body = cache.get(key)
+        if body is None:
+            body = build(index)
+            cache.put(key, body)
+        return _respond(request, body)
+
+    @app.get("/")
+    async def page(request: Request, sort: str = "deadline"):
+        _check_sort(sort)
+
+        def build(index):
+            template = template_environment().get_template("index.html")
+            context = page_context(build_views(index.events, order=sort))
+            return _html_body(template.render(**context, partials_url="/partials/events"))
+
+        return cached(request, build)
+
+    @app.get("/logo.webp")
+    async def logo():
+        path = os.path.join(DATA_DIR, "logo.webp")
+        if not os.path.exists(path):
+            raise HTTPException(status_code=404)
+        return FileResponse(path, media_type="image/webp")
+
+    @app.get("/partials/events")
+    async def event_list_partial(
+        request: Request,
+        city: str | None = None,
+        topic: str | None = None,
+        cfp: bool | None = None,
+        country: list[str] = Query(default=[]),
+        sort: str = "deadline",
+    ):
+        _check_sort(sort)
+        # Normalize filters so equivalent queries share one cached fragment
+        filters = (
+            city.lower() if city else None,
+            topic.lower() if topic else None,
+            cfp,
+            tuple(sorted({c.lower() for c in country})),
+            sort,
+        )
+        index = live.current()
+        key = (filters, index.version, date.today())
+        body = fragments.get(key)
+        if body is None:
+            events = index.filter(city=city, topic=topic, has_cfp=cfp, country=list(filters[3]))
+            template = template_environment().get_template("partials/event_list.html")
+            body = _html_body(template.render(
+                events=build_views(events, order=sort),
+                selected_city=city,
+                selected_topic=topic,
+                has_cfp=cfp,
+                today=date.today(),
+            ))
+            fragments.put(key, body)
+        return _respond(request, body)
+
+    @app.get("/healthz")
+    async def healthz():
+        index = live.current()
+        return {"status": "ok", "events": len(index), "version": index.version}
+
+    @app.get("/api/events")
+    async def list_events(
+        request: Request,
+        city: str | None = None,
+        country: str | None = None,
+        topic: str | None = None,
+        cfp: bool | None = None,
+        start_after: date | None = None,
+        start_before: date | None = None,
+    ):
+        def build(index):
+            events = index.filter(
+                city=city,
+                country=country,
+                topic=topic,
+                has_cfp=cfp,
+                start_after=start_after,
+                start_before=start_before,
+            )
+            return _json_body({
+                "version": index.version,
+                "count": len(events),
+                "events": [e.to_dict() for e in events],
+            })
+
+        return cached(request, build)
+
+    @app.get("/api/events/page")
+    async def page_events(
+        request: Request,
+        cursor: str | None = None,
+        limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+        city: str | None = None,
+        country: str | None = None,
+        topic: str | None = None,
+        cfp: bool | None = None,
+        start_after: date | None = None,
+        start_before: date | None = None,
+    ):
+        def build(index):
+            try:
+                events, next_cursor = index.page(
+                    cursor=cursor,
+                    limit=limit,
+                    city=city,
+                    country=country,
+                    topic=topic,
+                    has_cfp=cfp,
+                    start_after=start_after,
+                    start_before=start_before,
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return _json_body({
+                "events": [e.to_dict() for e in events],
+                "next_cursor": next_cursor,
+            })
+
+        return cached(request, build)
+
+    @app.get("/api/events.ndjson")
+    async def export_events(
+        city: str | None = None,
+        country: str | None = None,
+        topic: str | None = None,
+        cfp: bool | None = None,
+        start_after: date | None = None,
+        start_before: date | None = None,
+    ):
+        events = live.store.iter_filter(
+            city=city,
+            country=country,
+            topic=topic,
+            has_cfp=cfp,
+            start_after=start_after,
+            start_before=start_before,
+        )
+        return StreamingResponse(iter_ndjson(events), media_type="application/x-ndjson")
+
+    @app.get("/api/events/{event_id}")
+    async def get_event(request: Request, event_id: str):
+        def build(index):
+            event = index.by_id.get(event_id)
+            if event is None:
+                raise HTTPException(status_code=404, detail="Event not found")
+            return _json_body(event.to_dict())
+
+        return cached(request, build)
+
+    @app.get("/api/facets")
+    async def facets(request: Request):
+        return cached(request, lambda index: _json_body(index.facets()))
+
+    return app
@@ -0,0 +1,37 @@
+"""Event factory and source stand-in shared by the test modules."""
+
+import copy
+from datetime import date
+
+from src.collector.models import Event
+
+
+def make_event(name, start=date(2030, 6, 1), **fields):
+    """An event in Paris starting on ``start``; ``fields`` override any other field."""
+    fields = {"city": "Paris", "country": "France", "website": "https://example.com", **fields}
+    return Event(name=name, start_date=start, **fields)
+
+
+class FakeSource:
+    """Source module stand-in whose tasks return canned events.
+
+    Args:
+        results: Task key -> events, or the exception the task fails with
+        gate: Optional asyncio.Event awaited before each task
+    """
+
+    def __init__(self, results, gate=None):
+        self.results = results
+        self.gate = gate
+        self.calls = []
+
+    def task_keys(self):
+        return list(self.results)
+
+    async def stream(self, keys):
+        self.calls.append(list(keys))
+        for key in keys:
+            if self.gate:
+                await self.gate.wait()
+            # Fresh objects each run, as a real fetch returns
+            yield key, copy.deepcopy(self.results[key])
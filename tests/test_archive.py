@@ -0,0 +1,151 @@
+"""Tests for ingesting the confs.tech dataset from one archive."""
+
+import io
+import json
+import os
+import tarfile
+import tempfile
+from datetime import date
+
+import httpx
+import pytest
+
+from src import config
+from src.collector.http import HedgedClient
+from src.collector.sources import confs_tech
+from src.collector.sources.confs_tech import ARCHIVE_TASK, ConferenceIndex, sync_index
+
+YEAR = date.today().year
+
+DATA = {
+    f"conferences/{YEAR}/devops.json": [
+        {"name": "DevOpsDays Paris", "city": "Paris", "country": "France", "startDate": f"{YEAR}-11-02"},
+        {"name": "Cloud Native Paris", "city": "Paris", "country": "France", "startDate": f"{YEAR}-12-01"},
+    ],
+    f"conferences/{YEAR}/cloud.json": [
+        {"name": "Cloud Native Paris", "city": "Paris", "country": "France", "startDate": f"{YEAR}-12-01"},
+    ],
+    # Categories other than devops and cloud need a topic match
+    f"conferences/{YEAR + 1}/python.json": [
+        {"name": "PyCon Kubernetes Day", "city": "Paris", "country": "France", "startDate": f"{YEAR + 1}-03-01"},
+        {"name": "PyCon Web", "city": "Paris", "country": "France", "startDate": f"{YEAR + 1}-04-01"},
+    ],
+    "conferences/2019/devops.json": [
+        {"name": "Old DevOps", "city": "Paris", "country": "France", "startDate": "2019-05-01"},
+    ],
+    "README.md": "not data",
+}
+
+
+def _archive(data=DATA) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as archive:
+        for name, content in data.items():
+            raw = content.encode() if isinstance(content, str) else json.dumps(content).encode()
+            member = tarfile.TarInfo(f"conference-data-main/{name}")
+            member.size = len(raw)
+            archive.addfile(member, io.BytesIO(raw))
+    return buf.getvalue()
+
+
+def _client(handler=None):
+    transport = httpx.MockTransport(handler or (lambda request: httpx.Response(404)))
+    return HedgedClient(httpx.AsyncClient(transport=transport), histograms={})
+
+
+@pytest.fixture
+def archive_config(monkeypatch):
+    """Archive-mode config reading a local .tar.gz fixture; yields (archive path, tmpdir)."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        archive = os.path.join(tmpdir, "conference-data.tar.gz")
+        with open(archive, "wb") as f:
+            f.write(_archive())
+        path = os.path.join(tmpdir, "config.yaml")
+        with open(path, "w") as f:
+            json.dump({
+                "cities": [{"city": "Paris", "country": "France"}],
+                "confs_tech": {"mode": "archive", "archive": archive},
+            }, f)
+        monkeypatch.setattr(config, "_config_file", path)
+        monkeypatch.setattr(config, "_settings", None)
+        monkeypatch.setattr(confs_tech, "CONFS_TECH_INDEX_FILE", os.path.join(tmpdir, "index.json"))
+        yield archive, tmpdir
+
+
+class TestIndexArchive:
+    def test_indexes_every_category_and_year(self):
+        files = confs_tech._index_archive(_archive())
+        assert sorted(files) == sorted(["2019/devops", f"{YEAR}/devops", f"{YEAR}/cloud", f"{YEAR + 1}/python"])
+        assert files[f"{YEAR}/cloud"] == [
+            {"name": "Cloud Native Paris", "city": "Paris", "country": "France", "startDate": f"{YEAR}-12-01"}
+        ]
+
+
+class TestArchiveMode:
+    async def test_one_task_covers_all_categories(self, archive_config):
+        assert confs_tech.task_keys() == [ARCHIVE_TASK]
+
+        results = [item async for item in confs_tech.stream([ARCHIVE_TASK])]
+        assert [key for key, _ in results] == [ARCHIVE_TASK]
+        events = {e.name: e for e in results[0][1]}
+        assert sorted(events) == ["Cloud Native Paris", "DevOpsDays Paris", "PyCon Kubernetes Day"]
+        # Listed under devops and cloud: one event with both topics
+        assert {"devops", "cloud native"} <= set(events["Cloud Native Paris"].topics)
+
+    async def test_fetch_conferences_answers_from_index(self, archive_config):
+        events = await confs_tech.fetch_conferences(YEAR + 1)
+        assert [e.name for e in events] == ["PyCon Kubernetes Day"]
+        assert os.path.exists(os.path.join(archive_config[1], "index.json"))
+
+    async def test_download_is_conditional(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=_archive(), headers={"ETag": '"v1"'})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_file = os.path.join(tmpdir, "index.json")
+            client = _client(handler)
+            url = "https://archive.example/conference-data.tar.gz"
+            await sync_index(client, ConferenceIndex(index_file), url)
+            index = await sync_index(client, ConferenceIndex(index_file), url)
+
+        assert len(requests) == 2
+        assert "if-none-match" not in requests[0].headers
+        assert index.etag == '"v1"'
+        assert index.keys([YEAR]) == [f"{YEAR}/cloud", f"{YEAR}/devops"]
+
+    async def test_checkout_is_rescanned_incrementally(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as root:
+            for name, content in DATA.items():
+                if name.endswith(".json"):
+                    os.makedirs(os.path.dirname(os.path.join(root, name)), exist_ok=True)
+                    with open(os.path.join(root, name), "w") as f:
+                        json.dump(content, f)
+            index = await sync_index(_client(), ConferenceIndex(None), root)
+            assert len(index.files) == 4
+
+            reads = []
+            original = confs_tech._index_fields
+            monkeypatch.setattr(confs_tech, "_index_fields", lambda data: reads.append(data) or original(data))
+            devops = os.path.join(root, f"conferences/{YEAR}/devops.json")
+            with open(devops, "w") as f:
+                json.dump(DATA[f"conferences/{YEAR}/devops.json"][:1], f)
+            os.utime(devops, ns=(0, 0))
+            os.remove(os.path.join(root, "conferences/2019/devops.json"))
+
+            await sync_index(_client(), index, root)
+            assert len(reads) == 1
+            assert sorted(index.files) == sorted([f"{YEAR}/devops", f"{YEAR}/cloud", f"{YEAR + 1}/python"])
+            assert len(index.files[f"{YEAR}/devops"]) == 1
+
+    def test_invalid_mode(self, archive_config):
+        _, tmpdir = archive_config
+        path = os.path.join(tmpdir, "bad.yaml")
+        with open(path, "w") as f:
+            f.write("confs_tech:\n  mode: zip\n")
+        with pytest.raises(config.ConfigError):
+            config.load_settings(path)
@@ -0,0 +1,194 @@
+"""Tests for notification channels and fan-out."""
+
+import asyncio
+import os
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+from src import notifier
+from src.channels import Channel, EmailChannel, build_channel, fan_out, send_digests
+from src.collector.models import EventStore
+from src.ledger import NotificationLedger
+from src.collector.models import Event
+from src.views import build_views
+
+
+class RecordingChannel(Channel):
+    def __init__(self, name, delay=0.0, **kwargs):
+        super().__init__(name, **kwargs)
+        self.delay = delay
+        self.batches = []
+        self.finished_at = None
+
+    async def deliver(self, views):
+        await asyncio.sleep(self.delay)
+        self.batches.append([v.name for v in views])
+        self.finished_at = asyncio.get_running_loop().time()
+
+
+def _views():
+    deadline = date.today() + timedelta(days=5)
+    return build_views([
+        Event(
+            name=f"{city} Event",
+            city=city,
+            country=country,
+            start_date=date(2030, 4, 1),
+            website="https://example.com",
+            topics=topics,
+            cfp_deadline=deadline,
+        )
+        for city, country, topics in [
+            ("Paris", "France", ["Kubernetes"]),
+            ("Pune", "India", ["DevOps"]),
+            ("Bangalore", "India", ["Kubernetes", "DevOps"]),
+        ]
+    ])
+
+
+async def _smtp_stand_in(received):
+    """Minimal SMTP server that records the DATA of each message."""
+
+    async def handle(reader, writer):
+        writer.write(b"220 localhost ESMTP\r\n")
+        in_data = False
+        lines = []
+        while line := await reader.readline():
+            if in_data:
+                if line == b".\r\n":
+                    received.append(b"".join(lines).decode())
+                    in_data = False
+                    writer.write(b"250 OK\r\n")
+                else:
+                    lines.append(line)
+                continue
+            command = line[:4].upper()
+            if command == b"DATA":
+                in_data, lines = True, []
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+            elif command == b"QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+class TestRouting:
+    async def test_subscriptions(self):
+        india = RecordingChannel("india", countries=["India"])
+        kube = RecordingChannel("kube", topics=["kube"])
+        everyone = RecordingChannel("all")
+
+        reports = await fan_out(_views(), [india, kube, everyone])
+
+        assert sorted(india.batches[0]) == ["Bangalore Event", "Pune Event"]
+        assert sorted(kube.batches[0]) == ["Bangalore Event", "Paris Event"]
+        assert len(everyone.batches[0]) == 3
+        assert reports["india"].delivered == 2
+
+    async def test_slow_channel_does_not_delay_others(self):
+        slow = RecordingChannel("slow", delay=0.3, queue_size=1)
+        slow.batch_size = 1
+        fast = RecordingChannel("fast")
+        fast.batch_size = 1
+
+        start = asyncio.get_running_loop().time()
+        await fan_out(_views(), [slow, fast])
+
+        assert fast.finished_at - start < 0.1
+        assert slow.finished_at - start >= 0.9
+        assert len(slow.batches) == 3
+
+    async def test_concurrency_per_channel(self):
+        channel = RecordingChannel("parallel", delay=0.2, concurrency=3)
+        channel.batch_size = 1
+
+        start = asyncio.get_running_loop().time()
+        await fan_out(_views(), [channel])
+        assert channel.finished_at - start < 0.4
+
+    async def test_killed_fan_out_leaves_only_the_current_batch_in_doubt(self):
+        class DyingChannel(RecordingChannel):
+            async def deliver(self, views):
+                if self.batches:
+                    # The run is killed while the second batch is being sent
+                    raise asyncio.CancelledError
+                await super().deliver(views)
+
+        channel = DyingChannel("dying")
+        channel.batch_size = 1
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "notified.json")
+            with pytest.raises(asyncio.CancelledError):
+                await fan_out(_views(), [channel], NotificationLedger(path))
+
+            ledger = NotificationLedger(path)
+            assert len(ledger.in_doubt()) == 1
+            assert sum(entry["status"] == "sent" for entry in ledger.entries.values()) == 1
+            # The alert that was never attempted is sent by the next run
+            assert len([v for v in _views() if ledger.is_new(v, "dying")]) == 1
+
+
+class TestDigest:
+    async def test_one_digest_per_channel_per_day(self):
+        india = RecordingChannel("india", countries=["India"])
+        everyone = RecordingChannel("all")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "notified.json")
+            reports = await send_digests(_views(), [india, everyone], NotificationLedger(path))
+            await send_digests(_views(), [india, everyone], NotificationLedger(path))
+
+        assert [sorted(batch) for batch in india.batches] == [["Bangalore Event", "Pune Event"]]
+        assert len(everyone.batches) == 1
+        assert reports["all"].delivered == 3
+
+    async def test_notify_digest_uses_configured_channels(self, monkeypatch):
+        channel = RecordingChannel("team")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            events_file = os.path.join(tmpdir, "events.json")
+            EventStore(events_file).save([view.event for view in _views()])
+            monkeypatch.setattr(notifier, "EVENTS_FILE", events_file)
+            monkeypatch.setattr(notifier, "LEDGER_FILE", os.path.join(tmpdir, "notified.json"))
+            monkeypatch.setattr(notifier, "load_channels", lambda: [channel])
+            await notifier.check_upcoming_cfps(digest=True)
+
+        assert len(channel.batches) == 1
+        assert len(channel.batches[0]) == 3
+
+
+class TestEmailChannel:
+    async def test_sends_through_smtp(self):
+        received = []
+        server = await _smtp_stand_in(received)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            channel = build_channel({
+                "type": "email",
+                "name": "team",
+                "to": ["team@example.com"],
+                "from": "radar@example.com",
+                "smtp_host": "127.0.0.1",
+                "smtp_port": port,
+            })
+            assert isinstance(channel, EmailChannel)
+
+            reports = await fan_out(_views(), [channel])
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        assert reports["team"].delivered == 3
+        assert len(received) == 1
+        assert "Subject: 3 CFP deadline(s) coming up" in received[0]
+        assert "Pune Event (Pune, India)" in received[0]
+
+    def test_unknown_channel_type(self):
+        with pytest.raises(ValueError):
+            build_channel({"type": "carrier-pigeon"})
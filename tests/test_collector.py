@@ -1,11 +1,18 @@
 """Tests for event collectors."""
 
+import asyncio
+import os
+import tempfile
+
 import pytest
 from datetime import date
 from unittest.mock import patch, AsyncMock
 
-from src.collector.agent import deduplicate_events, _normalize_name, _event_completeness
-from src.collector.models import Event
+from src.collector import agent
+from src.collector.agent import CollectionPipeline, deduplicate_events, _normalize_name, _event_completeness
+from src.collector.models import Event, EventStore
+from src.collector.scheduler import SourceScheduler
+from tests.conftest import FakeSource, make_event
 
 
 class TestDeduplication:
@@ -108,3 +115,86 @@ class TestEventCompleteness:
         score = _event_completeness(event)
         # description(1) + cfp_deadline(2) + cfp_url(2) + website(1) + end_date(1) + topics(2)
         assert score == 9
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(agent, "rank_events", lambda events: 0)
+    monkeypatch.setattr(agent, "prune_relevance", lambda ids: 0)
+    monkeypatch.setattr(agent, "rescore_store", lambda store: 0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield EventStore(os.path.join(tmpdir, "events.json"))
+
+
+class TestCollectionPipeline:
+    def test_dedup_across_commits(self, store):
+        pipeline = CollectionPipeline(store, cutoff=date(2030, 1, 1))
+        pipeline.add([make_event("KubeCon 2030"), make_event("Old Meetup", start=date(2029, 12, 1))])
+        assert pipeline.commit() == 1
+
+        # A more complete duplicate under another name replaces the stored event
+        better = make_event("KubeCon", cfp_url="https://example.com/cfp")
+        pipeline.add([better, make_event("KubeCon Conference")])
+        pipeline.commit()
+        assert [e.id for e in store.load()] == [better.id]
+
+    def test_stored_events_are_not_recommitted(self, store):
+        pipeline = CollectionPipeline(store, cutoff=date(2030, 1, 1))
+        pipeline.add([make_event("KubeCon", cfp_url="https://example.com/cfp")], stored=True)
+        pipeline.add([make_event("KubeCon 2030")])
+        assert pipeline.commit() == 0
+
+    def test_commit_due_by_size_or_time(self, store):
+        now = [0.0]
+        pipeline = CollectionPipeline(store, date(2030, 1, 1), commit_interval=5, commit_size=2, clock=lambda: now[0])
+        pipeline.add([make_event("A")])
+        assert not pipeline.due()
+        pipeline.add([make_event("B")])
+        assert pipeline.due()
+        pipeline.commit()
+        pipeline.add([make_event("C")])
+        now[0] = 6
+        assert pipeline.due()
+
+
+class TestStreamingCollection:
+    async def test_fast_source_lands_before_slow_one(self, store, monkeypatch):
+        gate = asyncio.Event()
+        sources = {
+            "fast": FakeSource({"a": [make_event("DevOpsDays Paris")]}),
+            "slow": FakeSource({"b": [make_event("KubeCon")]}, gate),
+        }
+        monkeypatch.setattr(agent, "source_names", lambda use_ai: list(sources))
+        monkeypatch.setattr(agent, "load_source", sources.__getitem__)
+        pipeline = CollectionPipeline(store, date(2030, 1, 1), commit_interval=0.01)
+
+        task = asyncio.create_task(
+            agent.collect_all_events(scheduler=SourceScheduler(None, {}), pipeline=pipeline)
+        )
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if os.path.exists(store.filepath):
+                break
+        assert [e.name for e in store.load()] == ["DevOpsDays Paris"]
+
+        gate.set()
+        assert await task == 2
+        assert sorted(e.name for e in store.load()) == ["DevOpsDays Paris", "KubeCon"]
+
+    async def test_cancelled_run_keeps_collected_events(self, store, monkeypatch):
+        sources = {
+            "fast": FakeSource({"a": [make_event("DevOpsDays Paris")]}),
+            "slow": FakeSource({"b": [make_event("KubeCon")]}, asyncio.Event()),
+        }
+        monkeypatch.setattr(agent, "source_names", lambda use_ai: list(sources))
+        monkeypatch.setattr(agent, "load_source", sources.__getitem__)
+        pipeline = CollectionPipeline(store, date(2030, 1, 1), commit_interval=60)
+
+        task = asyncio.create_task(
+            agent.collect_all_events(scheduler=SourceScheduler(None, {}), pipeline=pipeline)
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert [e.name for e in store.load()] == ["DevOpsDays Paris"]
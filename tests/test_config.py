@@ -0,0 +1,111 @@
+"""Tests for typed, hot-reloadable settings."""
+
+import os
+import tempfile
+
+import pytest
+
+from src import config
+from src.config import ConfigError, Settings, get_settings, load_settings
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+    # Make sure the change is visible even on coarse mtime filesystems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def config_file(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "config.yaml")
+        _write(path, "cities:\n  - city: Paris\n    country: France\n")
+        monkeypatch.setattr(config, "_config_file", path)
+        monkeypatch.setattr(config, "_settings", None)
+        monkeypatch.setattr(config, "CHECK_INTERVAL", 0)
+        yield path
+
+
+class TestLoadSettings:
+    def test_defaults_without_file(self):
+        settings = load_settings("/nonexistent/config.yaml")
+        assert settings.version == "defaults"
+        assert "Brno" in settings.city_names
+        assert settings.topics == config.DEFAULT_TOPICS
+
+    def test_topics_and_cities(self, config_file):
+        _write(config_file, "cities:\n  - Pune within 50 km\ntopics:\n  - Kubernetes\n")
+        settings = load_settings(config_file)
+        assert settings.cities == [{"city": "Pune", "country": "", "radius_km": 50.0}]
+        assert settings.topic_set == {"kubernetes"}
+        assert settings.topic_classifier.classify("KubeCon: K8s day") == ["Kubernetes"]
+
+    def test_channels_expand_env(self, config_file, monkeypatch):
+        monkeypatch.setenv("HOOK", "https://hooks.example.com/x")
+        _write(config_file, "channels:\n  - type: webhook\n    url: ${HOOK}\n")
+        assert load_settings(config_file).channels == [{"type": "webhook", "url": "https://hooks.example.com/x"}]
+
+    @pytest.mark.parametrize("text", [
+        "cities: Paris\n",
+        "cities:\n  - country: France\n",
+        "cities:\n  - city: Paris\n    radius_km: -5\n",
+        "cities:\n  - city: Atlantis\n    country: Greece\n    radius_km: 50\n",
+        "cities:\n  - Atlantis within 20 km\n",
+        "cities:\n  - city: Atlantis\n",
+        "topics: [1, 2]\n",
+        "channels: [slack]\n",
+        "channels:\n  - type: carrier-pigeon\n",
+        "cities: [unclosed\n",
+    ])
+    def test_invalid(self, config_file, text):
+        _write(config_file, text)
+        with pytest.raises(ConfigError):
+            load_settings(config_file)
+
+
+class TestHotReload:
+    def test_shared_until_file_changes(self, config_file):
+        first = get_settings()
+        assert get_settings() is first
+        assert first.matcher is first.matcher
+
+        _write(config_file, "cities:\n  - city: Brno\n    country: Czech Republic\n")
+        second = get_settings()
+        assert second is not first
+        assert second.city_names == ["Brno"]
+        assert second.version != first.version
+
+    def test_invalid_reload_keeps_previous(self, config_file):
+        first = get_settings()
+        _write(config_file, "cities: 3\n")
+        assert get_settings() is first
+
+    def test_invalid_initial_load_raises(self, config_file):
+        _write(config_file, "cities: 3\n")
+        with pytest.raises(ConfigError):
+            get_settings()
+
+    def test_module_attributes_follow_reloads(self, config_file):
+        assert [c["city"] for c in config.TARGET_CITIES] == ["Paris"]
+        _write(config_file, "cities:\n  - city: Pune\n    country: India\n")
+        assert [c["city"] for c in config.TARGET_CITIES] == ["Pune"]
+        assert config.TOPICS == config.DEFAULT_TOPICS
+
+    def test_set_config_file_reaches_sources(self, config_file, monkeypatch):
+        from src.collector.sources.confs_tech import _parse_conferences
+
+        data = [{"name": "DevOps Days", "city": "Pune", "country": "India", "startDate": "2026-05-01"}]
+        assert _parse_conferences(data, "devops") == []
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            other = os.path.join(tmpdir, "other.yaml")
+            _write(other, "cities:\n  - city: Pune\n    country: India\n")
+            config.set_config_file(other)
+            assert [e.city for e in _parse_conferences(data, "devops")] == ["Pune"]
+
+    def test_settings_is_frozen(self):
+        settings = Settings(config_file="x")
+        with pytest.raises(AttributeError):
+            settings.cities = []
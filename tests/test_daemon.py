@@ -0,0 +1,136 @@
+"""Tests for the notifier daemon."""
+
+import asyncio
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src import daemon as daemon_module
+from src.collector.models import EventStore
+from src.daemon import DeadlineQueue, NotifierDaemon
+from src.ledger import NotificationLedger, alert_key
+from src.views import build_views
+from tests.conftest import make_event
+
+
+class TestDeadlineQueue:
+    def test_crossings_in_order(self):
+        now = datetime(2030, 1, 1, 12, 0)
+        queue = DeadlineQueue(days=14)
+        queue.update([make_event("A", cfp_deadline=date(2030, 1, 31))], now)
+
+        # Crossings at 14, 7 and 3 days before the deadline
+        assert queue.next_time() == datetime(2030, 1, 17)
+        assert [e.name for e in queue.pop_due(datetime(2030, 1, 17))] == ["A"]
+        assert queue.next_time() == datetime(2030, 1, 24)
+
+    def test_event_inside_window_is_due_now(self):
+        now = datetime(2030, 1, 1, 12, 0)
+        queue = DeadlineQueue(days=14)
+        queue.update([make_event("A", cfp_deadline=date(2030, 1, 6))], now)
+        assert [e.name for e in queue.pop_due(now)] == ["A"]
+        # Only the 3-day crossing is left
+        assert queue.next_time() == datetime(2030, 1, 3)
+
+    def test_crossing_into_the_window(self):
+        now = datetime(2030, 1, 1, 12, 0)
+        queue = DeadlineQueue(days=2)
+        queue.update([make_event("A", cfp_deadline=date(2030, 1, 31))], now)
+        # Entering the 2-day window is the only crossing
+        assert queue.next_time() == datetime(2030, 1, 29)
+        assert [e.name for e in queue.pop_due(datetime(2030, 1, 29))] == ["A"]
+        assert queue.next_time() is None
+
+        queue = DeadlineQueue(days=10)
+        queue.update([make_event("A", cfp_deadline=date(2030, 1, 31))], now)
+        assert queue.next_time() == datetime(2030, 1, 21)
+
+    def test_incremental_update(self):
+        now = datetime(2030, 1, 1)
+        queue = DeadlineQueue(days=14)
+        a, b = make_event("A", cfp_deadline=date(2030, 2, 1)), make_event("B", cfp_deadline=date(2030, 3, 1))
+        assert queue.update([a, b], now) == 2
+        assert queue.update([a, b], now) == 0
+
+        # Moving a deadline reschedules only that event; removing one drops its entries
+        moved = make_event("A", cfp_deadline=date(2030, 4, 1))
+        assert queue.update([moved], now) == 2
+        assert queue.next_time() == datetime(2030, 3, 18)
+        assert queue.pop_due(datetime(2030, 3, 1)) == []
+
+
+class TestNotifierDaemon:
+    async def test_step_alerts_and_sleeps_until_next_crossing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = EventStore(os.path.join(tmpdir, "events.json"))
+            store.save([
+                make_event("Soon", cfp_deadline=date(2030, 1, 5)),
+                make_event("Later", cfp_deadline=date(2030, 2, 1)),
+            ])
+
+            now = datetime(2030, 1, 1, 8, 0)
+            sent = []
+
+            async def send(views, ledger):
+                sent.extend(v.name for v in views)
+
+            daemon = NotifierDaemon(store.filepath, send=send, poll_interval=86400, clock=lambda: now)
+            delay = await daemon.step()
+
+            assert sent == ["Soon"]
+            # Next crossing: "Soon" enters the 3-day bucket at midnight on Jan 2
+            assert delay == timedelta(hours=16).total_seconds()
+
+    async def test_run_survives_a_failing_step(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = EventStore(os.path.join(tmpdir, "events.json"))
+            store.save([make_event("Soon", cfp_deadline=date(2030, 1, 5))])
+            now = [datetime(2030, 1, 1, 8, 0)]
+            attempts = []
+
+            async def send(views, ledger):
+                attempts.append([v.name for v in views])
+                if len(attempts) == 1:
+                    raise OSError("channel down")
+
+            sleeps = []
+
+            async def sleep(delay):
+                sleeps.append(delay)
+                now[0] += timedelta(seconds=delay)
+                if len(sleeps) == 2:
+                    raise asyncio.CancelledError
+
+            daemon = NotifierDaemon(store.filepath, send=send, poll_interval=60, clock=lambda: now[0], sleep=sleep)
+            with pytest.raises(asyncio.CancelledError):
+                await daemon.run()
+            # The failed alert is retried after the poll interval
+            assert sleeps[0] == 60
+            assert attempts == [["Soon"], ["Soon"]]
+
+
+class TestRunDaemon:
+    async def test_ledger_is_pruned_on_each_send(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "notified.json")
+            ledger = NotificationLedger(path)
+            ledger.mark_sent([alert_key("slack", "old", date(2000, 1, 1), "critical")])
+            monkeypatch.setattr(daemon_module, "LEDGER_FILE", path)
+            monkeypatch.setattr(daemon_module, "load_channels", lambda: [])
+            captured = {}
+
+            class FakeDaemon:
+                def __init__(self, send, ledger, **kwargs):
+                    captured.update(send=send, ledger=ledger)
+
+                async def run(self):
+                    pass
+
+            monkeypatch.setattr(daemon_module, "NotifierDaemon", FakeDaemon)
+            await daemon_module.run_daemon()
+
+            soon = date.today() + timedelta(days=3)
+            await captured["send"](build_views([make_event("Soon", cfp_deadline=soon)]), captured["ledger"])
+            assert NotificationLedger(path).entries == {}
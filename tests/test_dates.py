@@ -0,0 +1,87 @@
+"""Tests for the shared date parser."""
+
+from datetime import date
+
+import pytest
+
+from src.collector import dates
+from src.collector.dates import parse_date, parse_date_range
+
+THIS_YEAR = date.today().year
+
+
+class TestParseDateRange:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("2030-05-12", (date(2030, 5, 12), None)),
+            ("2030-05-12T09:00:00Z", (date(2030, 5, 12), None)),
+            ("2030-05-12 – 2030-05-14", (date(2030, 5, 12), date(2030, 5, 14))),
+            ("2030-05-12/2030-05-14", (date(2030, 5, 12), date(2030, 5, 14))),
+            ("2030/05/12", (date(2030, 5, 12), None)),
+            ("12.05.2030", (date(2030, 5, 12), None)),
+            ("05/12/2030", (date(2030, 5, 12), None)),
+            ("March 3, 2030", (date(2030, 3, 3), None)),
+            ("Sept. 9, 2030", (date(2030, 9, 9), None)),
+            ("Tuesday, March 3rd, 2030", (date(2030, 3, 3), None)),
+            ("CFP closes: January 10, 2030", (date(2030, 1, 10), None)),
+            ("3 March 2030", (date(2030, 3, 3), None)),
+        ],
+    )
+    def test_single_dates(self, text, expected):
+        assert parse_date_range(text) == expected
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("Mar 3–5, 2030", (date(2030, 3, 3), date(2030, 3, 5))),
+            ("Mar 30 - Apr 2, 2030", (date(2030, 3, 30), date(2030, 4, 2))),
+            ("Dec 30 - Jan 2, 2030", (date(2029, 12, 30), date(2030, 1, 2))),
+            ("Dec 30, 2029 - Jan 2, 2030", (date(2029, 12, 30), date(2030, 1, 2))),
+            ("3-5 March 2030", (date(2030, 3, 3), date(2030, 3, 5))),
+            ("30 March - 2 April 2030", (date(2030, 3, 30), date(2030, 4, 2))),
+            ("from Mar 3 until Mar 5, 2030", (date(2030, 3, 3), date(2030, 3, 5))),
+        ],
+    )
+    def test_ranges(self, text, expected):
+        assert parse_date_range(text) == expected
+        assert parse_date(text) == expected[0]
+
+    def test_missing_year_means_this_year(self):
+        assert parse_date_range("Mar 3-5") == (date(THIS_YEAR, 3, 3), date(THIS_YEAR, 3, 5))
+
+    @pytest.mark.parametrize("text", [None, "", "TBA", "Feb 30, 2030", "Mar 5-3, 2030", 20300512])
+    def test_no_date(self, text):
+        assert parse_date_range(text) == (None, None)
+
+    def test_fuzzy_only_as_last_resort(self, monkeypatch):
+        calls = []
+        fuzzy = dates._parse_fuzzy
+
+        def spy(text, this_year):
+            calls.append(text)
+            return fuzzy(text, this_year)
+
+        monkeypatch.setattr(dates, "_parse_fuzzy", spy)
+        dates._parse.cache_clear()
+        assert parse_date("Mar 3-5, 2030") == date(2030, 3, 3)
+        assert calls == []
+        # Missing day defaults to the first, not to today
+        assert parse_date("March 2030") == date(2030, 3, 1)
+        assert calls == ["march 2030"]
+
+    @pytest.mark.parametrize("text", ["Closes in 5 days", "Q2 2030", "2030", "Room 12, 2nd floor"])
+    def test_fuzzy_needs_a_day_or_month(self, text):
+        assert parse_date_range(text) == (None, None)
+
+    def test_fuzzy_can_be_turned_off(self):
+        assert parse_date("Thursday 3 March 2030 at 10:00") == date(2030, 3, 3)
+        assert parse_date("Thursday 3 March 2030 at 10:00", fuzzy=False) is None
+        assert parse_date("March 2030", fuzzy=False) is None
+        assert parse_date_range("2030-05-12/2030-05-14", fuzzy=False) == (date(2030, 5, 12), date(2030, 5, 14))
+
+    def test_results_are_cached(self):
+        dates._parse.cache_clear()
+        parse_date("Mar 3, 2030")
+        parse_date("Mar 3, 2030")
+        assert dates._parse.cache_info().hits == 1
@@ -0,0 +1,197 @@
+"""Tests for Slack delivery and notifications."""
+
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+
+import httpx
+
+from src.collector.models import Event
+from src.delivery import SlackDelivery, TokenBucket, pack_messages, split_text
+from src.channels import SlackChannel, fan_out
+from src.ledger import NotificationLedger, alert_key
+from src.notifier import send_daily_digest, send_slack_notifications
+from src.views import build_views
+
+WEBHOOK = "https://hooks.slack.test/services/T/B/X"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _delivery(handler, clock):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    bucket = TokenBucket(rate=1.0, clock=clock, sleep=clock.sleep)
+    return SlackDelivery(WEBHOOK, client=client, bucket=bucket, sleep=clock.sleep, backoff=0.5)
+
+
+def _views(count):
+    deadline = date.today() + timedelta(days=2)
+    return build_views([
+        Event(
+            name=f"Event {i}",
+            city="Paris",
+            country="France",
+            start_date=date(2030, 4, 1),
+            website="https://example.com",
+            cfp_deadline=deadline,
+        )
+        for i in range(count)
+    ])
+
+
+class TestPacking:
+    def test_pack_respects_block_limit(self):
+        groups = [[{"type": "section"}] * 4 for _ in range(30)]
+        messages = pack_messages(groups, header=[{"type": "header"}])
+        assert [count for _, count in messages] == [12, 12, 6]
+        assert all(len(m["blocks"]) <= 50 for m, _ in messages)
+
+    def test_split_text(self):
+        text = "".join(f"line {i}\n" for i in range(1000))
+        chunks = split_text(text, limit=100)
+        assert "".join(chunks) == text
+        assert all(len(c) <= 100 for c in chunks)
+
+
+class TestSlackDelivery:
+    async def test_batches_and_honors_retry_after(self):
+        clock = FakeClock()
+        calls = []
+
+        def handler(request):
+            calls.append(clock.now)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "30"})
+            return httpx.Response(200, text="ok")
+
+        report = await send_slack_notifications(_views(20), delivery=_delivery(handler, clock))
+
+        # 20 events of 4 blocks fit in 2 messages; the first was throttled once
+        assert report.delivered == 20
+        assert report.messages_sent == 2
+        assert report.retries == 1
+        assert calls[1] >= 30
+
+    async def test_throttled_last_attempt_does_not_pause(self):
+        clock = FakeClock()
+        calls = []
+
+        def handler(request):
+            calls.append(clock.now)
+            if len(calls) <= 5:
+                return httpx.Response(429, headers={"Retry-After": "30"})
+            return httpx.Response(200, text="ok")
+
+        report = await send_slack_notifications(_views(20), delivery=_delivery(handler, clock))
+
+        # The first message gives up after 4 retries; no retry follows the
+        # last 429, so it is not counted and the next message is not held
+        assert report.messages_failed == 1 and report.messages_sent == 1
+        assert report.retries == 4
+        assert calls[5] - calls[4] < 30
+
+    async def test_permanent_failure_is_reported(self):
+        clock = FakeClock()
+
+        def handler(request):
+            return httpx.Response(400, text="invalid_blocks")
+
+        report = await send_slack_notifications(_views(3), delivery=_delivery(handler, clock))
+        assert report.delivered == 0
+        assert report.failed == 3
+        assert "invalid_blocks" in report.errors[0]
+
+    async def test_server_errors_are_retried(self):
+        clock = FakeClock()
+        responses = iter([500, 503, 200])
+
+        def handler(request):
+            return httpx.Response(next(responses))
+
+        report = await send_daily_digest(_views(3), delivery=_delivery(handler, clock))
+        assert report.messages_sent == 1
+        assert report.retries == 2
+
+
+class TestLedger:
+    async def test_only_new_or_escalated_alerts(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "notified.json")
+            clock = FakeClock()
+            sent = []
+
+            def handler(request):
+                sent.append(request)
+                return httpx.Response(200)
+
+            channel = SlackChannel("slack", WEBHOOK, delivery=_delivery(handler, clock))
+            views = _views(3)
+            await fan_out(views, [channel], NotificationLedger(path))
+            assert len(sent) == 1
+
+            # Reloaded from disk: nothing new to send
+            ledger = NotificationLedger(path)
+            assert ledger.select(views) == []
+            await fan_out(views, [channel], ledger)
+            assert len(sent) == 1
+
+            # A less urgent bucket for the same deadline is not an escalation
+            view = views[0]
+            view.urgency = "soon"
+            assert not ledger.is_new(view)
+            view.urgency = "open"
+            assert not ledger.is_new(view)
+
+    async def test_pending_alerts_are_not_resent(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "notified.json")
+            views = _views(2)
+
+            # Simulate a run that crashed after recording its alerts
+            ledger = NotificationLedger(path)
+            ledger.begin([alert_key("slack", v.event.id, v.event.cfp_deadline, v.urgency) for v in views])
+
+            ledger = NotificationLedger(path)
+            assert len(ledger.in_doubt()) == 2
+            assert ledger.select(views) == []
+
+    async def test_failed_alerts_are_retried_next_run(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "notified.json")
+            clock = FakeClock()
+
+            def handler(request):
+                return httpx.Response(404, text="no_service")
+
+            channel = SlackChannel("slack", WEBHOOK, delivery=_delivery(handler, clock))
+            views = _views(2)
+            reports = await fan_out(views, [channel], NotificationLedger(path))
+
+            assert reports["slack"].failed == 2
+            assert NotificationLedger(path).select(views) == views
+
+    def test_keys_without_a_channel_are_read_as_slack(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "notified.json")
+            view = _views(1)[0]
+            event = view.event
+            legacy = f"{event.id}|{event.cfp_deadline.isoformat()}|{view.urgency}"
+            with open(path, "w") as f:
+                json.dump({legacy: {"status": "sent", "at": "2030-01-01T00:00:00"}}, f)
+
+            ledger = NotificationLedger(path)
+            assert ledger.status(alert_key("slack", event.id, event.cfp_deadline, view.urgency)) == "sent"
+            assert not ledger.is_new(view, "slack")
+            assert ledger.is_new(view, "email")
@@ -0,0 +1,151 @@
+"""Tests for the multi-format exporter."""
+
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from xml.etree import ElementTree
+
+import pytest
+
+from src.collector.models import Event
+from src import exporter, generator
+from src.exporter import export_events
+
+
+def _events():
+    soon = date.today() + timedelta(days=10)
+    return [
+        Event(
+            name="KubeCon, Paris; 2030",
+            city="Paris",
+            country="France",
+            start_date=date(2030, 3, 17),
+            end_date=date(2030, 3, 19),
+            website="https://kubecon.io",
+            topics=["kubernetes", "Cloud Native"],
+            cfp_deadline=soon,
+            cfp_url="https://kubecon.io/cfp?a=1&b=2",
+            description="A very long description " * 10,
+        ),
+        Event(
+            name="DevOpsDays Pune",
+            city="Pune",
+            country="India",
+            start_date=date(2030, 1, 10),
+            website="https://devopsdays.org",
+            topics=["devops"],
+        ),
+    ]
+
+
+class TestExport:
+    def test_all_formats(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "index.html")
+            paths = export_events(_events(), output, ["html", "ics", "atom", "json"])
+
+            assert output in paths
+            assert os.path.exists(os.path.join(tmpdir, "ics", "city-paris.ics"))
+            assert os.path.exists(os.path.join(tmpdir, "ics", "topic-kubernetes.ics"))
+            assert os.path.exists(os.path.join(tmpdir, "ics", "topic-devops.ics"))
+
+            with open(os.path.join(tmpdir, "api", "events.json")) as f:
+                data = json.load(f)
+            assert data["count"] == 2
+            # Sorted once by CFP deadline: the event with a deadline comes first
+            assert data["events"][0]["city"] == "Paris"
+
+            feed = ElementTree.parse(os.path.join(tmpdir, "feeds", "cfp.atom"))
+            entries = feed.findall("{http://www.w3.org/2005/Atom}entry")
+            assert len(entries) == 1
+
+    def test_ics_has_cfp_entry_and_folded_lines(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            export_events(_events(), os.path.join(tmpdir, "index.html"), ["ics"])
+            with open(os.path.join(tmpdir, "ics", "city-paris.ics"), newline="") as f:
+                content = f.read()
+
+            assert content.startswith("BEGIN:VCALENDAR\r\n")
+            assert content.endswith("END:VCALENDAR\r\n")
+            assert content.count("BEGIN:VEVENT") == 2
+            assert "SUMMARY:CFP deadline: KubeCon\\, Paris\\; 2030" in content
+            assert all(len(line.encode()) <= 75 for line in content.split("\r\n"))
+            assert not os.path.exists(os.path.join(tmpdir, "index.html"))
+
+    def test_unknown_format(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(ValueError):
+                export_events(_events(), os.path.join(tmpdir, "index.html"), ["pdf"])
+
+    def test_failed_export_leaves_previous_files(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "index.html")
+            export_events(_events()[:1], output, ["json"])
+
+            # Fail on the second event, after every writer has started its output
+            entry = exporter.AtomWriter._entry
+            calls = []
+
+            def failing_entry(writer, event):
+                calls.append(event)
+                if len(calls) > 1:
+                    raise RuntimeError("bad event")
+                return entry(writer, event)
+
+            monkeypatch.setattr(exporter.AtomWriter, "_entry", failing_entry)
+            with pytest.raises(RuntimeError):
+                export_events(_events(), output, ["ics", "json", "atom"])
+
+            assert not os.path.exists(os.path.join(tmpdir, "ics", "all.ics"))
+            assert not any(name.endswith(".tmp") for _, _, files in os.walk(tmpdir) for name in files)
+            assert not os.path.exists(os.path.join(tmpdir, "feeds", "events.atom"))
+            with open(os.path.join(tmpdir, "api", "events.json")) as f:
+                assert json.load(f)["count"] == 1
+
+    def test_failed_finish_replaces_no_output(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "index.html")
+            export_events(_events()[:1], output, ["ics", "json"])
+            with open(os.path.join(tmpdir, "ics", "all.ics"), newline="") as f:
+                before = f.read()
+
+            def failing_finish(writer):
+                raise OSError("disk full")
+
+            # The calendars are complete before the JSON snapshot fails
+            monkeypatch.setattr(exporter.JsonWriter, "finish", failing_finish)
+            with pytest.raises(OSError):
+                export_events(_events(), output, ["ics", "json"])
+
+            with open(os.path.join(tmpdir, "ics", "all.ics"), newline="") as f:
+                assert f.read() == before
+            assert not any(name.endswith(".tmp") for _, _, files in os.walk(tmpdir) for name in files)
+
+    def test_html_is_replaced_atomically(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "index.html")
+            export_events(_events(), output, ["html"])
+            with open(output) as f:
+                before = f.read()
+
+            def failing_context(views):
+                raise RuntimeError("template error")
+
+            monkeypatch.setattr(generator, "page_context", failing_context)
+            with pytest.raises(RuntimeError):
+                export_events(_events(), output, ["html"])
+            with open(output) as f:
+                assert f.read() == before
+            assert not any(name.endswith(".tmp") for name in os.listdir(tmpdir))
+
+    def test_calendars_stream_with_few_open_files(self, monkeypatch):
+        monkeypatch.setattr(exporter.IcsWriter, "MAX_OPEN_CALENDARS", 1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            export_events(_events(), os.path.join(tmpdir, "index.html"), ["ics"])
+            with open(os.path.join(tmpdir, "ics", "all.ics"), newline="") as f:
+                content = f.read()
+            assert content.startswith("BEGIN:VCALENDAR\r\n")
+            assert content.endswith("END:VCALENDAR\r\n")
+            assert content.count("BEGIN:VCALENDAR") == 1
+            assert content.count("UID:") == 3
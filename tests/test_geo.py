@@ -0,0 +1,138 @@
+"""Tests for the offline gazetteer and radius matching."""
+
+import os
+import random
+import tempfile
+
+import pytest
+
+from src.collector.geo import Gazetteer, Place, haversine_km, load_gazetteer, read_places
+from src.collector.matching import location_matcher
+from src.config import ConfigError, load_cities, parse_city_entry
+
+
+class TestHaversine:
+    def test_known_distance(self):
+        # Paris to Lyon is about 392 km
+        assert 385 < haversine_km(48.857, 2.352, 45.764, 4.836) < 400
+
+    def test_zero(self):
+        assert haversine_km(12.97, 77.59, 12.97, 77.59) == 0
+
+
+class TestGazetteer:
+    def test_bundled_file_loads(self):
+        gazetteer = load_gazetteer()
+        assert len(gazetteer) > 100
+        assert gazetteer.locate("Paris").country == "France"
+
+    def test_locate_aliases_and_accents(self):
+        gazetteer = load_gazetteer()
+        assert gazetteer.locate("Bengaluru").name == "Bangalore"
+        assert gazetteer.locate("Plzen").name == "Plzeň"
+        assert gazetteer.locate("Atlantis") is None
+
+    def test_locate_prefers_country(self):
+        gazetteer = Gazetteer([
+            Place("Paris", "France", 48.857, 2.352),
+            Place("Paris", "USA", 33.661, -95.556),
+        ])
+        assert gazetteer.locate("Paris").country == "France"
+        assert gazetteer.locate("Paris", "USA").country == "USA"
+
+    def test_within_matches_brute_force(self):
+        rng = random.Random(7)
+        places = [
+            Place(f"p{i}", "X", rng.uniform(-80, 80), rng.uniform(-180, 180))
+            for i in range(500)
+        ]
+        gazetteer = Gazetteer(places)
+        for _ in range(20):
+            lat, lon = rng.uniform(-80, 80), rng.uniform(-180, 180)
+            radius = rng.uniform(100, 3000)
+            expected = {p.name for p in places if haversine_km(lat, lon, p.lat, p.lon) <= radius}
+            assert {p.name for p, _ in gazetteer.within(lat, lon, radius)} == expected
+
+    def test_within_across_antimeridian(self):
+        gazetteer = Gazetteer([Place("east", "X", 0, 179.9), Place("west", "X", 0, -179.9)])
+        assert [p.name for p, _ in gazetteer.within(0, 179.95, 50)] == ["east", "west"]
+
+    def test_around_sorted_by_distance(self):
+        hits = load_gazetteer().around("Paris", 30)
+        assert hits[0][0].name == "Paris"
+        assert [km for _, km in hits] == sorted(km for _, km in hits)
+        assert "Versailles" in {p.name for p, _ in hits}
+
+    def test_read_places(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "places.tsv")
+            with open(path, "w") as f:
+                f.write("# header\nBrno\tCzech Republic\t49.195\t16.608\n\nVienna\tAustria\t48.208\t16.373\tWien\n")
+            places = read_places(path)
+        assert places == [
+            Place("Brno", "Czech Republic", 49.195, 16.608),
+            Place("Vienna", "Austria", 48.208, 16.373, ("Wien",)),
+        ]
+
+
+class TestCityEntries:
+    def test_parse_within(self):
+        assert parse_city_entry("Paris within 150 km") == {"city": "Paris", "country": "", "radius_km": 150.0}
+        assert parse_city_entry("Brno, Czech Republic within 80km")["country"] == "Czech Republic"
+
+    def test_parse_plain(self):
+        assert parse_city_entry("Tel Aviv, Israel") == {"city": "Tel Aviv", "country": "Israel"}
+        assert parse_city_entry({"city": "Pune", "country": "India", "radius_km": 100})["radius_km"] == 100
+
+    def test_load_cities_mixed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "config.yaml")
+            with open(path, "w") as f:
+                f.write("cities:\n  - Paris within 150 km\n  - city: Pune\n    country: India\n")
+            cities = load_cities(path)
+        assert cities[0]["radius_km"] == 150.0
+        assert cities[1] == {"city": "Pune", "country": "India"}
+
+
+class TestRadiusMatching:
+    def test_nearby_city(self):
+        matcher = location_matcher([{"city": "Paris", "country": "France", "radius_km": 50}])
+        match = matcher.match("Versailles, France")
+        assert (match.city, match.kind, match.near) == ("Versailles", "nearby", "Paris")
+        assert matcher.city("La Défense") == ("Courbevoie", "France")
+
+    def test_outside_radius(self):
+        matcher = location_matcher([{"city": "Paris", "country": "France", "radius_km": 150}])
+        assert matcher.city("Lyon") is None
+        # The radius replaces the country: other French cities do not match
+        assert matcher.match("Lyon, France") is None
+        assert matcher.match("Marseille, FR") is None
+        assert matcher.resolve("Lyon", "France") is None
+        assert matcher.match("Paris, France").kind == "city"
+
+    def test_country_of_other_targets_still_matches(self):
+        matcher = location_matcher([
+            {"city": "Paris", "country": "France", "radius_km": 50},
+            {"city": "Lyon", "country": "France"},
+        ])
+        assert matcher.match("Marseille, France").kind == "country"
+
+    def test_unknown_radius_target(self):
+        with pytest.raises(ConfigError):
+            location_matcher([{"city": "Atlantis", "country": "Greece", "radius_km": 50}])
+        with pytest.raises(ConfigError):
+            location_matcher([{"city": "Atlantis", "country": ""}])
+
+    def test_cross_border(self):
+        matcher = location_matcher([{"city": "Brno", "country": "Czech Republic", "radius_km": 150}])
+        assert matcher.city("Wien") == ("Vienna", "Austria")
+        assert matcher.city("Olomouc") == ("Olomouc", "Czech Republic")
+
+    def test_country_resolved_from_gazetteer(self):
+        matcher = location_matcher([{"city": "Pune", "country": "", "radius_km": 130}])
+        assert matcher.city("Pune") == ("Pune", "India")
+        assert matcher.city("Bombay") == ("Mumbai", "India")
+
+    def test_exact_target_unaffected(self):
+        matcher = location_matcher([{"city": "Paris", "country": "France"}])
+        assert matcher.city("Versailles") is None
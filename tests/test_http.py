@@ -0,0 +1,137 @@
+"""Tests for hedged and retried collector requests."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.collector.http import DEFAULT_HEDGE_DELAY, MIN_SAMPLES, HedgedClient, LatencyHistogram
+
+URL = "https://example.com/events.json"
+
+
+def _client(handler, **kwargs):
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return HedgedClient(http, histograms={}, sleep=sleep, **kwargs), sleeps
+
+
+def _warm(client, seconds, host="example.com"):
+    for _ in range(MIN_SAMPLES):
+        client.histogram(host).record(seconds)
+
+
+class TestLatencyHistogram:
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(0.95) is None
+        for _ in range(90):
+            histogram.record(0.05)
+        for _ in range(10):
+            histogram.record(2.0)
+        assert 0.05 <= histogram.percentile(0.5) < 0.07
+        assert 2.0 <= histogram.percentile(0.95) < 2.6
+
+    def test_old_samples_decay(self):
+        histogram = LatencyHistogram()
+        for _ in range(999):
+            histogram.record(0.05)
+        histogram.record(0.05)
+        assert histogram.total == 500
+
+
+class TestHedging:
+    async def test_slow_primary_is_hedged(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+            return httpx.Response(200, json=[])
+
+        client, _ = _client(handler)
+        _warm(client, 0.02)
+        assert client.hedge_delay("example.com") < 0.05
+
+        response = await asyncio.wait_for(client.get(URL), timeout=1)
+        assert response.status_code == 200
+        assert len(calls) == 2
+        assert client.hedges == 1
+
+    async def test_fast_response_is_not_hedged(self):
+        async def handler(request):
+            return httpx.Response(200, json=[])
+
+        client, _ = _client(handler)
+        assert client.hedge_delay("example.com") == DEFAULT_HEDGE_DELAY
+        await client.get(URL)
+        assert client.hedges == 0
+        assert client.histogram("example.com").total == 1
+
+    async def test_failed_hedge_does_not_beat_pending_primary(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(0.1)
+                return httpx.Response(200, json=["ok"])
+            raise httpx.ConnectError("refused", request=request)
+
+        client, _ = _client(handler, max_retries=0)
+        _warm(client, 0.01)
+        response = await client.get(URL)
+        assert response.json() == ["ok"]
+
+
+class TestRetries:
+    async def test_retries_transient_failures_with_backoff(self):
+        responses = iter([503, 502, 200])
+
+        async def handler(request):
+            return httpx.Response(next(responses))
+
+        client, sleeps = _client(handler, backoff=1.0)
+        response = await client.get(URL)
+        assert response.status_code == 200
+        assert client.retries == 2
+        # Jittered exponential backoff: base 1s then 2s, up to double each
+        assert 1.0 <= sleeps[0] <= 2.0 and 2.0 <= sleeps[1] <= 4.0
+
+    async def test_gives_up_after_max_retries(self):
+        async def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        client, sleeps = _client(handler, max_retries=2)
+        with pytest.raises(httpx.ConnectError):
+            await client.get(URL)
+        assert len(sleeps) == 2
+
+        async def unavailable(request):
+            return httpx.Response(503)
+
+        client, _ = _client(unavailable, max_retries=1)
+        assert (await client.get(URL)).status_code == 503
+
+    async def test_client_errors_are_not_retried(self):
+        async def handler(request):
+            return httpx.Response(404)
+
+        client, sleeps = _client(handler)
+        assert (await client.get(URL)).status_code == 404
+        assert sleeps == []
+
+    async def test_retry_after(self):
+        responses = iter([httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200)])
+
+        async def handler(request):
+            return next(responses)
+
+        client, sleeps = _client(handler, backoff=0.1)
+        await client.get(URL)
+        assert 7.0 <= sleeps[0] <= 14.0
@@ -0,0 +1,94 @@
+"""Import-time regression tests for the CLI startup path."""
+
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import date, timedelta
+
+from src.collector.models import Event, EventStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs `list` against the given events file, as the console script would
+LIST_SCRIPT = """
+import sys
+import src.config
+src.config.EVENTS_FILE = sys.argv[1]
+sys.argv = ["cfp-radar", "list", "--sort", "relevance"]
+from src.cli import main
+main()
+"""
+
+# Generous enough for slow CI machines, far below the ~1s the Gemini SDK costs
+LIST_IMPORT_BUDGET_US = 400_000
+
+HEAVY_MODULES = ("google.genai", "bs4", "httpx", "fastapi", "jinja2")
+
+
+def _run(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_times(stderr: str) -> list[tuple[str, int, bool]]:
+    """(module, cumulative microseconds, is top level) from ``-X importtime`` output."""
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            # Nested imports are indented below the module that triggered them
+            times.append((name.strip(), int(cumulative), not name.startswith("  ")))
+    return times
+
+
+class TestStartup:
+    def test_list_skips_heavy_imports(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "events.json")
+            EventStore(path).save([
+                Event(
+                    name="DevOpsDays Paris",
+                    city="Paris",
+                    country="France",
+                    start_date=date.today() + timedelta(days=30),
+                    website="https://example.com",
+                    cfp_deadline=date.today() + timedelta(days=5),
+                )
+            ])
+            result = _run("-X", "importtime", "-c", LIST_SCRIPT, path)
+        assert "DevOpsDays Paris" in result.stdout
+        times = _import_times(result.stderr)
+        names = {name for name, _, _ in times}
+        loaded = [m for m in HEAVY_MODULES if any(n == m or n.startswith(m + ".") for n in names)]
+        assert loaded == []
+        # Interpreter startup (site) is outside our control
+        total = sum(us for name, us, top in times if top and name != "site")
+        assert total < LIST_IMPORT_BUDGET_US, f"list imports took {total / 1000:.0f} ms"
+
+    def test_no_ai_never_imports_gemini(self):
+        script = (
+            "import sys\n"
+            "from src.collector import agent\n"
+            "from src.collector.sources import load_source, source_names\n"
+            "assert 'ai_search' not in source_names(use_ai=False)\n"
+            "for name in source_names(use_ai=False):\n"
+            "    load_source(name)\n"
+            "print(sorted(m for m in sys.modules if m.startswith('google') or m.endswith('web_search')))\n"
+        )
+        assert _run("-c", script).stdout.strip() == "[]"
+
+    def test_web_search_imports_sdk_lazily(self):
+        script = (
+            "import sys\n"
+            "import src.collector.sources.web_search\n"
+            "print('google.genai' in sys.modules)\n"
+        )
+        assert _run("-c", script).stdout.strip() == "False"
@@ -0,0 +1,103 @@
+"""Tests for compiled keyword and location matching."""
+
+from src.collector.matching import keyword_pattern, location_matcher, normalize
+from src.collector.sources.confs_tech import _parse_conferences
+
+TARGETS = [
+    {"city": "Paris", "country": "France"},
+    {"city": "Bangalore", "country": "India"},
+    {"city": "Tel Aviv", "country": "Israel"},
+    {"city": "Raleigh", "country": "USA"},
+    {"city": "Brno", "country": "Czech Republic"},
+]
+
+
+class TestKeywordPattern:
+    def test_shared_prefixes(self):
+        pattern = keyword_pattern(["pun", "pune", "paris"])
+        assert pattern.search("Meetup in Pune").group() == "Pune"
+        assert pattern.search("PUN intended").group() == "PUN"
+
+    def test_word_boundaries(self):
+        pattern = keyword_pattern(["paris"])
+        assert pattern.search("Parisian cafe") is None
+        assert pattern.search("Comparison") is None
+        assert pattern.search("(Paris)") is not None
+
+    def test_empty(self):
+        assert keyword_pattern([]).search("anything") is None
+
+
+class TestLocationMatcher:
+    def test_normalize(self):
+        assert normalize("Tel-Aviv") == "tel aviv"
+        assert normalize(" U.S.A. ") == "usa"
+
+    def test_exact_lookup(self):
+        matcher = location_matcher(TARGETS)
+        assert matcher.city("bengaluru") == ("Bangalore", "India")
+        assert matcher.city("Tel Aviv-Yafo") == ("Tel Aviv", "Israel")
+        assert matcher.city("Lyon") is None
+        assert matcher.country("Czechia") == "Czech Republic"
+        assert matcher.country("U.S.A.") == "USA"
+        assert matcher.country("FR") == "France"
+
+    def test_city_wins_over_country(self):
+        match = location_matcher(TARGETS).match("Bengaluru, Karnataka, India")
+        assert (match.city, match.country, match.kind) == ("Bangalore", "India", "city")
+
+    def test_country_match(self):
+        match = location_matcher(TARGETS).match("Ostrava, Czechia")
+        assert (match.city, match.country, match.kind) == (None, "Czech Republic", "country")
+
+    def test_trailing_country_code(self):
+        assert location_matcher(TARGETS).match("Lyon, FR").country == "France"
+        assert location_matcher(TARGETS).match("FR") is None
+
+    def test_us_state_codes(self):
+        matcher = location_matcher(TARGETS)
+        assert matcher.match("Chicago, IL") is None
+        assert matcher.match("Indianapolis, IN 46204") is None
+        assert matcher.match("Austin, TX").country == "USA"
+        # Not US-style: a region before the code
+        assert matcher.match("Kochi, Kerala, IN").country == "India"
+        assert matcher.match("Bengaluru, IN").city == "Bangalore"
+
+    def test_code_ignored_when_another_country_is_named(self):
+        assert location_matcher(TARGETS).match("Lyon, Germany, FR") is None
+
+    def test_city_in_another_country(self):
+        matcher = location_matcher(TARGETS)
+        match = matcher.match("Paris, TX, USA")
+        assert (match.city, match.country, match.kind) == (None, "USA", "country")
+        assert location_matcher(TARGETS[:1]).match("Paris, Ontario, Canada") is None
+
+    def test_resolve(self):
+        matcher = location_matcher(TARGETS)
+        assert matcher.resolve("Paris", "USA") == ("Paris", "USA")
+        assert matcher.resolve("Bengaluru", "India") == ("Bangalore", "India")
+        assert matcher.resolve("Raleigh", "United States") == ("Raleigh", "USA")
+        assert location_matcher(TARGETS[:1]).resolve("Paris", "USA") is None
+
+    def test_no_substring_false_positives(self):
+        matcher = location_matcher(TARGETS)
+        assert matcher.match("Parisian Hall, Berlin, Germany") is None
+        assert matcher.match("") is None
+
+    def test_cached(self):
+        assert location_matcher(TARGETS) is location_matcher([dict(t) for t in TARGETS])
+
+
+class TestSourceMatching:
+    def test_confs_tech_aliases(self):
+        data = [
+            {"name": "DevOps Days", "city": "Bengaluru", "country": "India", "startDate": "2026-05-01"},
+            {"name": "KubeDay", "city": "Ostrava", "country": "Czechia", "startDate": "2026-06-01"},
+            {"name": "DevOps Berlin", "city": "Berlin", "country": "Germany", "startDate": "2026-06-01"},
+            {"name": "DevOps Paris Ontario", "city": "Paris", "country": "Canada", "startDate": "2026-07-01"},
+        ]
+        events = _parse_conferences(data, "devops")
+        assert [(e.city, e.country) for e in events] == [
+            ("Bangalore", "India"),
+            ("Ostrava", "Czech Republic"),
+        ]
@@ -205,3 +205,24 @@ class TestEventStore:
             cfp_events = store.filter(has_cfp=True)
             assert len(cfp_events) == 1
             assert cfp_events[0].name == "With CFP"
+
+
+class TestStreaming:
+    def test_iter_events_matches_load(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = EventStore(os.path.join(tmpdir, "events.json"))
+            store.save([
+                Event(
+                    name=f"Event {i}",
+                    city="Paris",
+                    country="France",
+                    start_date=date(2030, 1, 1 + i),
+                    website="https://example.com",
+                    description="x" * i * 10,
+                )
+                for i in range(20)
+            ])
+
+            streamed = list(store.iter_events(chunk_size=16))
+            assert [e.id for e in streamed] == [e.id for e in store.load()]
+            assert len(list(store.iter_filter(start_after=date(2030, 1, 11)))) == 10
@@ -0,0 +1,135 @@
+"""Tests for parsing downloaded pages in a worker pool."""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from src import config
+from src.collector import parsing
+from src.collector.sources import confs_tech, papercall
+
+CONFERENCES = [
+    {
+        "name": "DevOpsDays Paris",
+        "url": "https://devopsdays.org/paris",
+        "startDate": "2030-05-12",
+        "endDate": "2030-05-13",
+        "city": "Paris",
+        "country": "France",
+        "cfpUrl": "https://devopsdays.org/paris/cfp",
+        "cfpEndDate": "2030-02-01",
+    },
+    {"name": "No Date Conf", "city": "Paris", "country": "France"},
+    {"name": "Elsewhere", "startDate": "2030-05-12", "city": "Oslo", "country": "Norway"},
+]
+
+PAGE = """
+<html><body>
+  <div class="event-card">
+    <h3>KubeCon Paris</h3>
+    <span class="location">Paris, France</span>
+    <span class="date">March 3–5, 2030</span>
+    <span class="deadline">CFP closes: January 10, 2030</span>
+    <a href="/events/1">Details</a>
+  </div>
+  <div class="event-card"><span class="location">Paris</span></div>
+</body></html>
+""".encode()
+
+
+@pytest.fixture
+def parse_settings(monkeypatch):
+    """Point settings at a config file with the given parsing section."""
+    tmpdir = tempfile.TemporaryDirectory()
+
+    def use(**parsing_config):
+        path = os.path.join(tmpdir.name, "config.yaml")
+        with open(path, "w") as f:
+            json.dump({"parsing": parsing_config}, f)
+        monkeypatch.setattr(config, "_config_file", path)
+        monkeypatch.setattr(config, "_settings", None)
+
+    yield use
+    parsing.shutdown_executor()
+    tmpdir.cleanup()
+
+
+class TestWorkerRows:
+    def test_conference_rows(self):
+        rows = confs_tech._decode_conferences(json.dumps(CONFERENCES).encode())
+        assert [row[0] for row in rows] == ["DevOpsDays Paris", "Elsewhere"]
+        assert rows[0][4:7] == (date(2030, 5, 12), date(2030, 5, 13), date(2030, 2, 1))
+
+    def test_built_events_match_direct_parse(self):
+        rows = confs_tech._decode_conferences(json.dumps(CONFERENCES).encode())
+        built = confs_tech._build_events(rows, "devops")
+        direct = confs_tech._parse_conferences(CONFERENCES, "devops")
+        assert [e.name for e in built] == [e.name for e in direct] == ["DevOpsDays Paris"]
+        assert built[0].same_content(direct[0])
+
+    def test_card_rows(self):
+        rows = papercall._extract_cards(PAGE)
+        assert rows == [
+            (
+                "KubeCon Paris",
+                "Paris, France",
+                date(2030, 3, 3),
+                date(2030, 3, 5),
+                date(2030, 1, 10),
+                "https://www.papercall.io/events/1",
+            )
+        ]
+        events = papercall._build_events(rows)
+        assert [(e.name, e.city) for e in events] == [("KubeCon Paris", "Paris")]
+
+
+class TestRunParser:
+    async def test_thread_pool_keeps_loop_free(self, parse_settings):
+        parse_settings(pool="thread", workers=2)
+        loop_thread = threading.get_ident()
+
+        def parse(payload):
+            return threading.get_ident(), payload.decode()
+
+        worker, text = await parsing.run_parser(parse, b"abc")
+        assert text == "abc"
+        assert worker != loop_thread
+        assert isinstance(parsing.get_executor(), ThreadPoolExecutor)
+
+    async def test_process_pool(self, parse_settings):
+        parse_settings(pool="process", workers=1)
+        rows = await parsing.run_parser(papercall._extract_cards, PAGE)
+        assert rows[0][0] == "KubeCon Paris"
+        assert isinstance(parsing.get_executor(), ProcessPoolExecutor)
+
+    async def test_pool_follows_config_changes(self, parse_settings):
+        parse_settings(pool="thread", workers=1)
+        first = parsing.get_executor()
+        assert parsing.get_executor() is first
+        parse_settings(pool="thread", workers=3)
+        assert parsing.get_executor() is not first
+
+    @pytest.mark.parametrize("section", [{"pool": "fiber"}, {"workers": -1}, {"workers": "4"}])
+    def test_invalid_parsing_config(self, parse_settings, section):
+        parse_settings(**section)
+        with pytest.raises(config.ConfigError):
+            config.get_settings()
+
+
+class TestBackends:
+    def test_html_backend_falls_back_without_lxml(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "lxml", None)
+        parsing.html_backend.cache_clear()
+        try:
+            assert parsing.html_backend() == "html.parser"
+        finally:
+            parsing.html_backend.cache_clear()
+
+    def test_loads_accepts_bytes(self):
+        assert parsing.loads(b'[{"a": 1}]') == [{"a": 1}]
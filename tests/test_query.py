@@ -0,0 +1,115 @@
+"""Tests for the query expression language."""
+
+import csv
+import io
+import json
+from datetime import date
+
+import pytest
+
+from src.query import QueryError, compile_query, run_query, write_rows
+from tests.conftest import make_event
+
+TODAY = date(2030, 3, 1)
+
+
+EVENTS = [
+    make_event(
+        "KubeCon India", city="Mumbai", country="India", cfp_deadline=date(2030, 3, 10),
+        topics=["Kubernetes"], relevance_score=5.0,
+    ),
+    make_event(
+        "DevOpsDays Paris", date(2030, 5, 1), cfp_deadline=date(2030, 4, 30), topics=["DevOps"], relevance_score=4.0,
+    ),
+    make_event(
+        "Tekton Day", date(2030, 4, 1), city="Brno", country="Czech Republic", topics=["Tekton"], relevance_score=4.5,
+    ),
+    make_event(
+        "DevOpsDays Tel Aviv", date(2030, 9, 1), city="Tel Aviv", country="Israel", cfp_deadline=date(2030, 3, 5),
+        topics=["DevOps"], relevance_score=2.0,
+    ),
+]
+
+
+def _names(text, **kwargs):
+    return [e.name for e in run_query(EVENTS, compile_query(text, today=TODAY), **kwargs)]
+
+
+class TestCompileQuery:
+    def test_example_query(self):
+        query = "country in (France, India) and cfp_deadline < +21d and topic ~ kube"
+        assert _names(query) == ["KubeCon India"]
+
+    def test_precedence_and_parentheses(self):
+        assert _names("city = paris or city = brno and topic = devops") == ["DevOpsDays Paris"]
+        assert _names("(city = paris or city = brno) and not topic = devops") == ["Tekton Day"]
+
+    def test_unquoted_multiword_and_quoted_values(self):
+        assert _names("city = Tel Aviv") == ["DevOpsDays Tel Aviv"]
+        assert _names("name ~ 'days tel'") == ["DevOpsDays Tel Aviv"]
+
+    def test_dates_and_none(self):
+        assert _names("start < 2030-05-01") == ["Tekton Day"]
+        assert _names("cfp_deadline >= today and cfp_deadline <= +1w") == ["DevOpsDays Tel Aviv"]
+        assert _names("cfp_deadline = none") == ["Tekton Day"]
+        assert _names("cfp != none and relevance > 3") == ["DevOpsDays Paris", "KubeCon India"]
+
+    def test_empty_query_matches_everything(self):
+        assert len(_names("")) == len(EVENTS)
+
+    @pytest.mark.parametrize("text", [
+        "venue",
+        "colour = red",
+        "name < 3",
+        "relevance ~ 4",
+        "start > soon",
+        "relevance >= high",
+        "city = paris and",
+        "(city = paris",
+        "city = paris)",
+        "city in paris",
+    ])
+    def test_invalid(self, text):
+        with pytest.raises(QueryError):
+            compile_query(text, today=TODAY)
+
+
+class TestRunQuery:
+    def test_sort_and_limit(self):
+        assert _names("", sort="start", limit=2) == ["Tekton Day", "DevOpsDays Paris"]
+        assert _names("", sort="-relevance", limit=2) == ["KubeCon India", "Tekton Day"]
+        assert _names("", sort="-relevance") == _names("", sort="-relevance", limit=10)
+
+    def test_missing_values_sort_last(self):
+        assert _names("", sort="cfp_deadline")[-1] == "Tekton Day"
+        assert _names("", sort="-cfp_deadline")[-1] == "Tekton Day"
+
+    def test_unknown_sort_field(self):
+        with pytest.raises(QueryError):
+            _names("", sort="colour")
+
+
+class TestWriteRows:
+    def test_json(self):
+        out = io.StringIO()
+        assert write_rows(EVENTS[:2], "json", out) == 2
+        assert [e["name"] for e in json.loads(out.getvalue())] == ["KubeCon India", "DevOpsDays Paris"]
+
+        out = io.StringIO()
+        write_rows([], "json", out)
+        assert json.loads(out.getvalue()) == []
+
+    def test_csv(self):
+        out = io.StringIO()
+        write_rows(EVENTS[:1], "csv", out)
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        assert rows[0]["name"] == "KubeCon India"
+        assert rows[0]["cfp_deadline"] == "2030-03-10"
+        assert rows[0]["topics"] == "Kubernetes"
+
+    def test_table_truncates_long_names(self):
+        out = io.StringIO()
+        write_rows([make_event("A" * 60)], "table", out)
+        header, row = out.getvalue().splitlines()
+        assert header.startswith("start")
+        assert "A" * 39 + "…" in row
@@ -0,0 +1,123 @@
+"""Tests for TF-IDF relevance ranking."""
+
+import json
+import os
+import tempfile
+
+from src.collector.models import EventStore
+from src.collector.ranking import RelevanceModel, prune_relevance, rank_events, rescore_store, tokenize
+from tests.conftest import make_event
+
+
+def _events():
+    return [
+        make_event("Tekton Day", description="Building CI/CD pipelines with Tekton", topics=["CI/CD"]),
+        make_event("PlatformCon Paris", description="Platform engineering and internal developer platforms"),
+        make_event("KubeCon Europe", description="Kubernetes and cloud native", topics=["Kubernetes"]),
+        make_event("Frontend Summit", description="React, CSS and design systems", topics=["JavaScript"]),
+    ]
+
+
+class TestTokenize:
+    def test_keeps_compounds_and_drops_stopwords(self):
+        assert tokenize("The CI/CD Summit for cloud-native teams 2026") == ["ci/cd", "cloud-native", "teams"]
+
+
+class TestRelevanceModel:
+    def test_scores_follow_profiles(self):
+        events = _events()
+        model = RelevanceModel()
+        assert model.rank(events) == 4
+
+        tekton, platform, kubecon, frontend = events
+        assert frontend.relevance_score == 1.0
+        assert min(tekton.relevance_score, platform.relevance_score, kubecon.relevance_score) > 2.0
+        assert model.best_profile(tekton) == "Tekton/CI-CD"
+        assert model.best_profile(platform) == "Platform Engineering"
+        assert model.best_profile(kubecon) == "Cloud Native"
+        assert model.best_profile(frontend) is None
+
+    def test_similarities_are_one_row_per_event(self):
+        model = RelevanceModel({"a": "tekton", "b": "kubernetes"})
+        events = _events()
+        model.update(events)
+        rows = model.similarities(events)
+        assert len(rows) == 4 and all(len(row) == 2 for row in rows)
+        assert rows[0][0] > 0 and rows[0][1] == 0
+        assert rows[2][1] > 0 and rows[2][0] == 0
+
+    def test_incremental(self):
+        events = _events()
+        model = RelevanceModel()
+        model.rank(events)
+        assert model.rank(events) == 0
+
+        events[3].description = "Tekton pipelines for frontend teams"
+        assert model.rank(events) == 1
+        assert events[3].relevance_score > 1.0
+
+    def test_idf_drift_rescores(self):
+        model = RelevanceModel()
+        events = [make_event(f"Tekton Day {i}", description="CI/CD pipelines") for i in range(10)]
+        model.rank(events)
+        # One new event is within the drift allowance
+        assert model.rank(events + [make_event("GitOps Meetup")]) == 1
+        # Growing the corpus by more than IDF_DRIFT rescores everything ranked
+        more = events + [make_event(f"Platform Day {i}", description="Internal developer platforms") for i in range(3)]
+        assert model.rank(more) == len(more)
+
+    def test_prune(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "relevance.json")
+            events = _events()
+            rank_events(events, path)
+            assert prune_relevance([e.id for e in events[:2]], path) == 2
+
+            model = RelevanceModel(filepath=path)
+            assert len(model) == 2
+            assert model.idf("react") == model.idf("never-seen")
+
+    def test_rescore_store_after_drift(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "relevance.json")
+            store = EventStore(os.path.join(tmpdir, "events.json"))
+            events = [make_event(f"Tekton Day {i}", description="CI/CD pipelines") for i in range(10)]
+            rank_events(events, path)
+            store.save(events)
+            assert rescore_store(store, path) == 0
+
+            # A commit of new events drifts the IDF but only ranks its own batch
+            batch = [make_event(f"Platform Day {i}", description="Internal developer platforms") for i in range(3)]
+            rank_events(batch, path)
+            store.merge(batch)
+            assert rescore_store(store, path) == 10
+
+            expected = store.load()
+            RelevanceModel().rank(expected)
+            assert [e.relevance_score for e in store.load()] == [e.relevance_score for e in expected]
+
+    def test_state_is_persisted(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "relevance.json")
+            events = _events()
+            assert rank_events(events, path) == 4
+            scores = [e.relevance_score for e in events]
+
+            fresh = _events()
+            assert rank_events(fresh, path) == 0
+            assert [e.relevance_score for e in fresh] == scores
+
+            with open(path) as f:
+                assert len(json.load(f)["docs"]) == 4
+
+    def test_profile_change_rescores(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "relevance.json")
+            model = RelevanceModel(filepath=path)
+            model.rank(_events())
+            model.save()
+
+            other = RelevanceModel({"Frontend": "react css javascript design"}, path)
+            events = _events()
+            assert other.rank(events) == 4
+            assert events[3].relevance_score > events[0].relevance_score
@@ -0,0 +1,286 @@
+"""Tests for per-source refresh scheduling and incremental collection."""
+
+import asyncio
+import copy
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src import config, daemon
+from src.collector import agent
+from src.collector.models import EventStore
+from src.collector.scheduler import BREAKER_COOLDOWN, BREAKER_THRESHOLD, RETRY_DELAY, SourceScheduler
+from tests.conftest import FakeSource, make_event
+
+NOW = datetime(2030, 3, 1, 12, 0)
+HOUR = 3600
+
+
+class TestSourceScheduler:
+    def test_due_after_interval(self):
+        scheduler = SourceScheduler(None, {"papercall": 6 * HOUR})
+        assert scheduler.due("papercall", ["devops"], NOW) == ["devops"]
+        assert scheduler.record("papercall", "devops", [make_event("A")], NOW)
+
+        assert scheduler.due("papercall", ["devops", "cloud"], NOW + timedelta(hours=5)) == ["cloud"]
+        assert scheduler.due("papercall", ["devops"], NOW + timedelta(hours=6)) == ["devops"]
+        assert scheduler.next_due() == NOW + timedelta(hours=6)
+
+    def test_unchanged_results(self):
+        scheduler = SourceScheduler(None, {})
+        assert scheduler.record("papercall", "devops", [make_event("A")], NOW)
+        later = NOW + timedelta(days=1)
+        # A fresh fetch of the same event differs only in last_updated
+        assert not scheduler.record("papercall", "devops", [make_event("A")], later)
+        assert scheduler.last_changed("papercall", "devops") == NOW
+        assert scheduler.record("papercall", "devops", [make_event("A"), make_event("B")], later)
+        assert scheduler.last_changed("papercall", "devops") == later
+
+    def test_failure_retries_sooner(self):
+        scheduler = SourceScheduler(None, {"ai_search": 7 * 24 * HOUR})
+        scheduler.record("ai_search", "Paris", [], NOW)
+        later = NOW + timedelta(days=7)
+        assert not scheduler.record("ai_search", "Paris", RuntimeError("quota"), later)
+        assert scheduler.tasks["ai_search:Paris"]["error"] == "RuntimeError: quota"
+        assert scheduler.due_at("ai_search", "Paris") == later + RETRY_DELAY
+
+    def test_persistence_and_prune(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "schedule.json")
+            scheduler = SourceScheduler(path, {})
+            scheduler.record("confs.tech", "2029/devops", [], NOW)
+            scheduler.record("confs.tech", "2030/devops", [], NOW)
+            scheduler.prune("confs.tech", ["2030/devops", "2031/devops"])
+            scheduler.save()
+
+            reloaded = SourceScheduler(path, {})
+            assert list(reloaded.tasks) == ["confs.tech:2030/devops"]
+
+    def test_reads_task_only_state(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "schedule.json")
+            with open(path, "w") as f:
+                json.dump({"papercall:devops": {"last_run": NOW.isoformat(), "error": "x"}}, f)
+            assert list(SourceScheduler(path, {}).tasks) == ["papercall:devops"]
+
+    def test_circuit_breaker(self):
+        scheduler = SourceScheduler(None, {})
+        for i in range(BREAKER_THRESHOLD):
+            assert scheduler.allow("papercall", NOW)
+            scheduler.record_run("papercall", False, NOW)
+        assert not scheduler.allow("papercall", NOW)
+        assert scheduler.allow("papercall", NOW + BREAKER_COOLDOWN)
+
+        # A failed trial run reopens it for twice as long
+        later = NOW + BREAKER_COOLDOWN
+        scheduler.record_run("papercall", False, later)
+        assert not scheduler.allow("papercall", later + BREAKER_COOLDOWN)
+        assert scheduler.allow("papercall", later + 2 * BREAKER_COOLDOWN)
+
+        scheduler.record_run("papercall", True, later)
+        assert scheduler.allow("papercall", later)
+        assert scheduler.breakers == {}
+
+    def test_next_due_waits_for_open_breaker(self):
+        scheduler = SourceScheduler(None, {"papercall": HOUR})
+        scheduler.record("papercall", "devops", RuntimeError("down"), NOW)
+        for _ in range(BREAKER_THRESHOLD):
+            scheduler.record_run("papercall", False, NOW)
+        assert scheduler.next_due() == NOW + BREAKER_COOLDOWN
+
+    def test_intervals_from_config(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "config.yaml")
+            with open(path, "w") as f:
+                f.write("schedule:\n  papercall: 2h\n  ai_search: 90\n")
+            monkeypatch.setattr(config, "_config_file", path)
+            monkeypatch.setattr(config, "_settings", None)
+            scheduler = SourceScheduler(None)
+            assert scheduler.interval("papercall") == timedelta(hours=2)
+            assert scheduler.interval("ai_search") == timedelta(minutes=90)
+            assert scheduler.interval("confs.tech") == timedelta(days=1)
+
+    @pytest.mark.parametrize("value", ["soon", "0h", -5, True])
+    def test_invalid_interval(self, value):
+        with pytest.raises(ValueError):
+            config.parse_interval(value)
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        events_file = os.path.join(tmpdir, "events.json")
+        fakes = {
+            "confs.tech": FakeSource({"2030/devops": [make_event("DevOpsDays Paris")]}),
+            "papercall": FakeSource({"kubernetes": [make_event("KubeCon")], "cloud": RuntimeError("down")}),
+        }
+        monkeypatch.setattr(agent, "EVENTS_FILE", events_file)
+        monkeypatch.setattr(daemon, "EVENTS_FILE", events_file)
+        monkeypatch.setattr(agent, "source_names", lambda use_ai: list(fakes))
+        monkeypatch.setattr(agent, "load_source", fakes.__getitem__)
+        monkeypatch.setattr(agent, "rank_events", lambda events: 0)
+        monkeypatch.setattr(agent, "prune_relevance", lambda ids: 0)
+        monkeypatch.setattr(agent, "rescore_store", lambda store: 0)
+        yield fakes, events_file
+
+
+class TestIncrementalCollection:
+    async def test_incremental_runs_only_due_tasks(self, sources):
+        fakes, events_file = sources
+        scheduler = SourceScheduler(None, {"confs.tech": 24 * HOUR, "papercall": 6 * HOUR})
+
+        assert await agent.collect_all_events(use_ai=False, scheduler=scheduler) == 2
+        assert sorted(e.name for e in EventStore(events_file).load()) == ["DevOpsDays Paris", "KubeCon"]
+        assert fakes["papercall"].calls == [["kubernetes", "cloud"]]
+
+        # Nothing is due yet except the failed task
+        for fake in fakes.values():
+            fake.calls.clear()
+        scheduler.tasks["papercall:cloud"]["last_run"] = (datetime.now() - RETRY_DELAY).isoformat()
+        await agent.collect_all_events(use_ai=False, incremental=True, scheduler=scheduler)
+        assert fakes["confs.tech"].calls == []
+        assert fakes["papercall"].calls == [["cloud"]]
+
+    async def test_unchanged_sources_leave_store_alone(self, sources):
+        fakes, events_file = sources
+        scheduler = SourceScheduler(None, {})
+        await agent.collect_all_events(use_ai=False, scheduler=scheduler)
+        mtime = os.stat(events_file).st_mtime_ns
+
+        assert await agent.collect_all_events(use_ai=False, scheduler=scheduler) == 0
+        assert os.stat(events_file).st_mtime_ns == mtime
+
+    async def test_failed_commit_does_not_save_fingerprints(self, sources, monkeypatch):
+        fakes, events_file = sources
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "schedule.json")
+
+            def fail(self, events, remove=()):
+                raise OSError("disk full")
+
+            scheduler = SourceScheduler(path, {})
+            with monkeypatch.context() as m:
+                m.setattr(EventStore, "merge", fail)
+                with pytest.raises(OSError):
+                    await agent.collect_all_events(use_ai=False, scheduler=scheduler)
+            assert not os.path.exists(path)
+            assert scheduler.tasks == {}
+
+            # The next run, e.g. of a daemon reusing the scheduler, still stores them
+            assert await agent.collect_all_events(use_ai=False, scheduler=scheduler) == 2
+            assert sorted(e.name for e in EventStore(events_file).load()) == ["DevOpsDays Paris", "KubeCon"]
+
+    async def test_run_collector_exports_on_change(self, sources):
+        fakes, events_file = sources
+        changes, sleeps = [], []
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+
+        scheduler = SourceScheduler(None, {"confs.tech": 24 * HOUR, "papercall": 6 * HOUR})
+        await daemon.run_collector(
+            use_ai=False, on_change=lambda: changes.append(1), scheduler=scheduler, sleep=sleep, runs=2
+        )
+        # Nothing was due on the second run, so the store did not change again
+        assert changes == [1]
+        assert len(sleeps) == 1 and 0 < sleeps[0] <= RETRY_DELAY.total_seconds()
+
+
+class HangingSource(FakeSource):
+    """Source whose tasks after the first never finish."""
+
+    async def stream(self, keys):
+        self.calls.append(list(keys))
+        for i, key in enumerate(keys):
+            if i:
+                await asyncio.Event().wait()
+            yield key, copy.deepcopy(self.results[key])
+
+
+class TestTimeouts:
+    async def test_source_timeout_fails_remaining_tasks(self, sources, monkeypatch):
+        fakes, events_file = sources
+        fakes["papercall"] = HangingSource({"kubernetes": [make_event("KubeCon")], "cloud": []})
+        monkeypatch.setattr(agent, "source_timeout", lambda name: 0.05)
+        scheduler = SourceScheduler(None, {})
+
+        assert await agent.collect_all_events(use_ai=False, scheduler=scheduler) == 2
+        assert "TimeoutError" in scheduler.tasks["papercall:cloud"]["error"]
+        assert scheduler.breakers == {}
+
+    async def test_deadline_cancels_stragglers_and_keeps_results(self, sources):
+        fakes, events_file = sources
+        fakes["papercall"] = HangingSource({"kubernetes": [make_event("KubeCon")], "cloud": []})
+        scheduler = SourceScheduler(None, {})
+
+        assert await agent.collect_all_events(use_ai=False, scheduler=scheduler, deadline=0.1) == 2
+        assert sorted(e.name for e in EventStore(events_file).load()) == ["DevOpsDays Paris", "KubeCon"]
+        assert "deadline" in scheduler.tasks["papercall:cloud"]["error"]
+
+    async def test_deadline_keeps_queued_results(self, sources):
+        fakes, events_file = sources
+        fakes["papercall"] = FakeSource({f"topic-{i}": [make_event(f"Summit {i}")] for i in range(3)})
+
+        class SlowScheduler(SourceScheduler):
+            def record(self, source, key, result, now):
+                # Handling the first result outlasts the deadline while the rest wait in the queue
+                if not self.tasks:
+                    time.sleep(0.1)
+                return super().record(source, key, result, now)
+
+        scheduler = SlowScheduler(None, {})
+        assert await agent.collect_all_events(use_ai=False, scheduler=scheduler, deadline=0.05) == 4
+        assert all(task["error"] is None for task in scheduler.tasks.values())
+
+    async def test_commit_error_does_not_hide_the_first_error(self, sources, monkeypatch):
+        fakes, events_file = sources
+
+        add = agent.CollectionPipeline.add
+        calls = []
+
+        def fail_add(self, events, stored=False):
+            # The first task's events wait for the final commit, the second task fails
+            calls.append(events)
+            if len(calls) > 1:
+                raise ValueError("bad event")
+            add(self, events, stored)
+
+        def fail_merge(self, events, remove=()):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(agent.CollectionPipeline, "add", fail_add)
+        monkeypatch.setattr(EventStore, "merge", fail_merge)
+        with pytest.raises(ValueError):
+            await agent.collect_all_events(use_ai=False, scheduler=SourceScheduler(None, {}))
+
+    async def test_open_breaker_skips_source(self, sources):
+        fakes, events_file = sources
+        fakes["papercall"] = FakeSource({"cloud": RuntimeError("down")})
+        scheduler = SourceScheduler(None, {})
+        for _ in range(BREAKER_THRESHOLD):
+            await agent.collect_all_events(use_ai=False, scheduler=scheduler)
+        assert len(fakes["papercall"].calls) == BREAKER_THRESHOLD
+
+        await agent.collect_all_events(use_ai=False, scheduler=scheduler)
+        assert len(fakes["papercall"].calls) == BREAKER_THRESHOLD
+        assert len(fakes["confs.tech"].calls) == BREAKER_THRESHOLD + 1
+
+
+class TestStoreMerge:
+    def test_identical_events_do_not_rewrite(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = EventStore(os.path.join(tmpdir, "events.json"))
+            store.merge([make_event("A")])
+            mtime = os.stat(store.filepath).st_mtime_ns
+
+            store.merge([make_event("A")])
+            assert os.stat(store.filepath).st_mtime_ns == mtime
+
+            changed = make_event("A")
+            changed.cfp_deadline = date(2030, 4, 1)
+            store.merge([changed])
+            assert store.load()[0].cfp_deadline == date(2030, 4, 1)
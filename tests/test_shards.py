@@ -0,0 +1,194 @@
+"""Tests for sharded collection and merging partial stores."""
+
+import itertools
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+
+import pytest
+
+from src import cli, config
+from src.collector import agent, shards
+from src.collector.models import EventStore
+from src.collector.ranking import RelevanceModel, rank_events
+from src.collector.scheduler import SourceScheduler
+from src.collector.shards import Shard, merge_stores, parse_shard
+from tests.conftest import FakeSource, make_event
+
+CITIES = [f"City {i}" for i in range(20)]
+
+
+def _event(name, updated=datetime(2030, 1, 1), **fields):
+    # A fixed update time, so versions of an event only differ where a test says so
+    return make_event(name, last_updated=updated, **fields)
+
+
+@pytest.fixture(autouse=True)
+def relevance_file(monkeypatch):
+    # Merges rank into a throwaway model instead of data/relevance.json
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "relevance.json")
+        monkeypatch.setattr(shards, "rank_events", lambda events, rescore=False: rank_events(events, path, rescore))
+        yield path
+
+
+def _source(keys):
+    """Source with one event per task key."""
+    return FakeSource({key: [_event(f"{key} Summit")] for key in keys})
+
+
+class TestShard:
+    def test_parse(self):
+        assert parse_shard("2/4") == Shard(2, 4)
+        assert str(parse_shard("0/1")) == "0/1"
+
+    @pytest.mark.parametrize("text", ["4/4", "-1/4", "1", "a/b", "0/0", "1/2/3"])
+    def test_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_shard(text)
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 7])
+    def test_tasks_are_partitioned_evenly(self, count):
+        selected = [Shard(i, count).select("ai_search", CITIES) for i in range(count)]
+        assert sorted(itertools.chain(*selected)) == sorted(CITIES)
+        sizes = [len(keys) for keys in selected]
+        assert max(sizes) - min(sizes) <= 1
+
+    def test_assignment_is_per_source(self):
+        # Small sources do not all land on the same shard
+        first = {Shard(0, 2).select(name, ["a"]) == ["a"] for name in ["confs.tech", "papercall", "ai_search"]}
+        assert first == {True, False}
+
+
+@pytest.fixture
+def sharded(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fakes = {"papercall": _source(["devops", "cloud"]), "ai_search": _source(CITIES)}
+        monkeypatch.setattr(shards, "SHARDS_DIR", os.path.join(tmpdir, "shards"))
+        monkeypatch.setattr(agent, "EVENTS_FILE", os.path.join(tmpdir, "events.json"))
+        monkeypatch.setattr(agent, "source_names", lambda use_ai: list(fakes))
+        monkeypatch.setattr(agent, "load_source", fakes.__getitem__)
+        monkeypatch.setattr(agent, "rank_events", lambda events: 0)
+        yield fakes, tmpdir
+
+
+class TestShardedCollection:
+    async def test_shards_cover_all_tasks_once(self, sharded):
+        fakes, tmpdir = sharded
+        count = 3
+        for i in range(count):
+            shard = Shard(i, count)
+            await agent.collect_all_events(scheduler=SourceScheduler(None, {}), shard=shard)
+            assert os.path.exists(shard.events_file)
+        assert not os.path.exists(agent.EVENTS_FILE)
+
+        calls = [key for fake in fakes.values() for keys in fake.calls for key in keys]
+        assert sorted(calls) == sorted(["devops", "cloud", *CITIES])
+
+        merged = merge_stores(shards.partial_stores(), os.path.join(tmpdir, "events.json"))
+        assert len(merged) == 22
+
+    async def test_shard_keeps_its_own_schedule(self, sharded):
+        shard = Shard(1, 2)
+        await agent.collect_all_events(shard=shard)
+        expected = [f"papercall:{key}" for key in shard.select("papercall", ["devops", "cloud"])]
+        expected += [f"ai_search:{key}" for key in shard.select("ai_search", CITIES)]
+        assert sorted(SourceScheduler(shard.schedule_file, {}).tasks) == sorted(expected)
+
+
+def _write_partials(tmpdir):
+    """Three partial stores with duplicate, newer and tied versions of events."""
+    old = _event("KubeCon", description="old", updated=datetime(2030, 1, 1))
+    new = _event("KubeCon", description="new", updated=datetime(2030, 1, 2))
+    # Same name and date after normalization, but more complete
+    complete = _event("KubeCon 2030", cfp_url="https://example.com/cfp", cfp_deadline=date(2030, 3, 1))
+    # Two versions updated at the same moment
+    tie_a = _event("DevOpsDays", description="a")
+    tie_b = _event("DevOpsDays", description="b")
+    stores = [[old, tie_a], [new, _event("GitOpsCon")], [complete, tie_b]]
+    paths = []
+    for i, events in enumerate(stores):
+        path = os.path.join(tmpdir, f"events-{i}-of-3.json")
+        EventStore(path).save(events)
+        paths.append(path)
+    return paths
+
+
+class TestMerge:
+    def test_merge_rules(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            merged = merge_stores(_write_partials(tmpdir), os.path.join(tmpdir, "out", "events.json"))
+            by_name = {e.name: e for e in merged}
+            assert sorted(by_name) == ["DevOpsDays", "GitOpsCon", "KubeCon 2030"]
+            assert by_name["DevOpsDays"].description == "b"
+
+    def test_output_is_independent_of_shard_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = _write_partials(tmpdir)
+            outputs = set()
+            for i, order in enumerate(itertools.permutations(paths)):
+                output = os.path.join(tmpdir, f"merged-{i}.json")
+                merge_stores(list(order), output)
+                with open(output) as f:
+                    outputs.add(f.read())
+            assert len(outputs) == 1
+
+    def test_newest_version_wins(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = _write_partials(tmpdir)[:2]
+            merged = merge_stores(list(reversed(paths)), os.path.join(tmpdir, "events.json"))
+            assert [e.description for e in merged if e.name == "KubeCon"] == ["new"]
+
+    def test_existing_store_is_kept(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "events.json")
+            EventStore(output).save([_event("Older Event", start=date(2030, 2, 1))])
+            merged = merge_stores(_write_partials(tmpdir), output)
+            assert merged[0].name == "Older Event"
+            assert len(EventStore(output).load()) == 4
+
+    def test_scores_do_not_depend_on_the_split(self):
+        events = [
+            _event("Tekton Day", description="CI/CD pipelines with Tekton", topics=["CI/CD"]),
+            _event("PlatformCon", description="Platform engineering and internal developer platforms"),
+            _event("KubeCon", description="Kubernetes and cloud native", topics=["Kubernetes"]),
+            _event("Frontend Summit", description="React, CSS and design systems"),
+        ]
+        expected = {e.id: e.relevance_score for e in _ranked(events)}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for n, split in enumerate([[events[:1], events[1:]], [events[:2], events[2:]], [events]]):
+                paths = []
+                for i, part in enumerate(split):
+                    # Each shard scored against its own events only
+                    path = os.path.join(tmpdir, f"events-{i}-of-{len(split)}.json")
+                    EventStore(path).save(_ranked(part))
+                    paths.append(path)
+                merged = merge_stores(paths, os.path.join(tmpdir, f"merged-{n}.json"))
+                assert {e.id: e.relevance_score for e in merged} == expected
+
+
+def _ranked(events):
+    events = [_event(e.name, description=e.description, topics=list(e.topics)) for e in events]
+    RelevanceModel(config.get_settings().profiles).rank(events)
+    return events
+
+
+class TestMergeCommand:
+    def test_merges_and_exports(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write_partials(tmpdir)
+            monkeypatch.setattr(shards, "SHARDS_DIR", tmpdir)
+            monkeypatch.setattr(config, "EVENTS_FILE", os.path.join(tmpdir, "events.json"))
+            exported = []
+            monkeypatch.setattr(cli, "_export", lambda args, formats, path=None: exported.append(path))
+            monkeypatch.setattr(sys, "argv", ["cli", "merge"])
+            cli.main()
+            assert exported == [config.EVENTS_FILE]
+            assert len(EventStore(config.EVENTS_FILE).load()) == 3
+
+    def test_bad_shard_is_a_usage_error(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "argv", ["cli", "collect", "--shard", "3/3"])
+        with pytest.raises(SystemExit):
+            cli.main()
+        assert "between 0 and n-1" in capsys.readouterr().err
@@ -0,0 +1,53 @@
+"""Tests for the compiled topic classifier."""
+
+from src.collector.topics import TopicClassifier, tag_events
+from src.config import DEFAULT_TOPICS
+from tests.conftest import make_event
+
+CLASSIFIER = TopicClassifier(DEFAULT_TOPICS)
+
+
+class TestTopicClassifier:
+    def test_topics_in_config_order(self):
+        tags = CLASSIFIER.classify("Tekton and Kubernetes: CI/CD for cloud native teams")
+        assert tags == ["ci/cd", "cloud native", "kubernetes", "tekton"]
+
+    def test_synonyms(self):
+        assert CLASSIFIER.classify("KubeCon India") == ["cloud native", "kubernetes"]
+        assert CLASSIFIER.classify("DevOpsDays Tel Aviv") == ["devops"]
+        assert CLASSIFIER.classify("Scaling k8s with ArgoCD") == ["kubernetes", "gitops"]
+
+    def test_word_boundaries(self):
+        assert CLASSIFIER.classify("Containership Summit") == []
+        assert CLASSIFIER.classify("Presreleases") == []
+        assert CLASSIFIER.classify("(Kubernetes)") == ["kubernetes"]
+
+    def test_name_and_description(self):
+        assert CLASSIFIER.classify("Paris Tech Day", "", "A day about GitOps") == ["gitops"]
+
+    def test_non_ascii_case_folding(self):
+        assert CLASSIFIER.classify("İstanbul DevOps Meetup") == ["devops"]
+
+    def test_classify_many_matches_classify(self):
+        texts = ["KubeCon", "", "Docker and Podman", "nothing here", "tekton\nGitOps"]
+        assert CLASSIFIER.classify_many(texts) == [CLASSIFIER.classify(t) for t in texts]
+
+    def test_custom_topics(self):
+        classifier = TopicClassifier(["Observability"], {"observability": ["opentelemetry", "otel"]})
+        assert classifier.classify("OTel Community Day") == ["Observability"]
+
+
+class TestTagging:
+    def test_tag_events_keeps_existing(self):
+        events = [
+            make_event("Cloud Day", description="Talks on Kubernetes operators", topics=["AI"]),
+            make_event("Meetup"),
+        ]
+        tag_events(events, CLASSIFIER)
+        assert events[0].topics == ["AI", "kubernetes"]
+        assert events[1].topics == []
+
+    def test_tags_come_from_description(self):
+        event = make_event("Tech Day", description="Tekton pipelines and GitOps", topics=["misc"])
+        tag_events([event], CLASSIFIER)
+        assert "tekton" in event.topics
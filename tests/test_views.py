@@ -0,0 +1,65 @@
+"""Tests for the precomputed event view model."""
+
+from datetime import date
+
+import pytest
+
+from src.views import build_views, urgency_bucket
+from tests.conftest import make_event
+
+
+class TestUrgency:
+    def test_buckets(self):
+        assert urgency_bucket(None) is None
+        assert urgency_bucket(-1) == "closed"
+        assert urgency_bucket(0) == "critical"
+        assert urgency_bucket(3) == "critical"
+        assert urgency_bucket(7) == "urgent"
+        assert urgency_bucket(14) == "soon"
+        assert urgency_bucket(15) == "open"
+
+
+class TestBuildViews:
+    def test_derived_fields(self):
+        today = date(2030, 3, 1)
+        views = build_views(
+            [
+                make_event("No CFP"),
+                make_event("Tomorrow", date(2030, 5, 1), end_date=date(2030, 5, 3), cfp_deadline=date(2030, 3, 2)),
+                make_event("Closed", cfp_deadline=date(2030, 2, 1)),
+            ],
+            today=today,
+        )
+
+        assert [v.name for v in views] == ["Closed", "Tomorrow", "No CFP"]
+        closed, tomorrow, no_cfp = views
+
+        assert closed.urgency == "closed"
+        assert closed.days_label == "Closed"
+        assert tomorrow.days_left == 1
+        assert tomorrow.days_label == "Tomorrow"
+        assert tomorrow.start_label == "May 01, 2030"
+        assert tomorrow.end_label == "May 03, 2030"
+        assert tomorrow.cfp_label == "Mar 02"
+        assert tomorrow.cfp_long_label == "March 02, 2030"
+        assert no_cfp.days_left is None
+        assert no_cfp.end_label is None
+
+    def test_view_proxies_event_fields(self):
+        view = build_views([make_event("KubeCon")], today=date(2030, 1, 1))[0]
+        assert view.city == "Paris"
+        assert view.id == view.event.id
+
+    def test_sort_orders(self):
+        today = date(2030, 3, 1)
+        low = make_event("Low", cfp_deadline=date(2030, 3, 5), start=date(2030, 6, 1))
+        high = make_event("High", start=date(2030, 7, 1))
+        soon = make_event("Soon", start=date(2030, 4, 1))
+        low.relevance_score, high.relevance_score, soon.relevance_score = 1.5, 4.8, 3.0
+        events = [low, high, soon]
+
+        assert [v.name for v in build_views(events, today)] == ["Low", "Soon", "High"]
+        assert [v.name for v in build_views(events, today, order="relevance")] == ["High", "Soon", "Low"]
+        assert [v.name for v in build_views(events, today, order="date")] == ["Soon", "Low", "High"]
+        with pytest.raises(ValueError):
+            build_views(events, today, order="random")
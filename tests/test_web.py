@@ -0,0 +1,200 @@
+"""Tests for the web API."""
+
+import json
+import os
+import tempfile
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from src.collector.models import Event, EventStore
+from src.web.app import create_app
+
+
+def _store(tmpdir):
+    store = EventStore(os.path.join(tmpdir, "events.json"))
+    store.save([
+        Event(
+            name=f"Paris Event {i}",
+            city="Paris",
+            country="France",
+            start_date=date(2030, 4, 1 + i),
+            website="https://paris.com",
+            topics=["Kubernetes"],
+            description="x" * 200,
+        )
+        for i in range(5)
+    ] + [
+        Event(
+            name="Pune Event",
+            city="Pune",
+            country="India",
+            start_date=date(2030, 5, 1),
+            website="https://pune.com",
+            topics=["DevOps"],
+            cfp_deadline=date(2030, 3, 1),
+        ),
+    ])
+    return store
+
+
+class TestEventsApi:
+    def test_list_and_filter(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = _store(tmpdir)
+            client = TestClient(create_app(store.filepath))
+
+            data = client.get("/api/events").json()
+            assert data["count"] == 6
+
+            data = client.get("/api/events", params={"topic": "kube", "city": "paris"}).json()
+            assert data["count"] == 5
+            assert all(e["city"] == "Paris" for e in data["events"])
+
+            data = client.get("/api/events", params={"cfp": "true"}).json()
+            assert [e["name"] for e in data["events"]] == ["Pune Event"]
+
+            assert client.get("/api/events/missing").status_code == 404
+
+    def test_etag_and_compression(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = _store(tmpdir)
+            client = TestClient(create_app(store.filepath))
+
+            response = client.get("/api/events", headers={"Accept-Encoding": "gzip"})
+            assert response.headers["content-encoding"] == "gzip"
+            etag = response.headers["etag"]
+
+            response = client.get(
+                "/api/events",
+                headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+            )
+            assert response.status_code == 304
+
+            # A different representation does not match the gzip ETag
+            response = client.get(
+                "/api/events",
+                headers={"Accept-Encoding": "identity", "If-None-Match": etag},
+            )
+            assert response.status_code == 200
+            assert "content-encoding" not in response.headers
+
+    def test_reload_on_store_change(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = _store(tmpdir)
+            client = TestClient(create_app(store.filepath, check_interval=0))
+            before = client.get("/api/events")
+
+            store.save(store.load()[:2])
+            after = client.get("/api/events")
+
+            assert after.json()["count"] == 2
+            assert after.headers["etag"] != before.headers["etag"]
+
+    def test_half_written_store_keeps_previous_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = _store(tmpdir)
+            client = TestClient(create_app(store.filepath, check_interval=0))
+            assert client.get("/api/events").json()["count"] == 6
+
+            with open(store.filepath) as f:
+                text = f.read()
+            with open(store.filepath, "w") as f:
+                f.write(text[: len(text) // 2])
+            response = client.get("/api/events")
+            assert response.status_code == 200
+            assert response.json()["count"] == 6
+
+            # Once the file is whole again it is picked up
+            store.save([])
+            assert client.get("/api/events").json()["count"] == 0
+
+    def test_save_leaves_no_temp_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = _store(tmpdir)
+            assert os.listdir(tmpdir) == ["events.json"]
+
+
+class TestPartials:
+    def test_partial_is_cached_per_filters(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = _store(tmpdir)
+            app = create_app(store.filepath, check_interval=0)
+            client = TestClient(app)
+
+            response = client.get("/partials/events", params={"country": "India"})
+            assert response.status_code == 200
+            assert "Pune Event" in response.text
+            assert "Paris Event" not in response.text
+
+            # Equivalent filters hit the same fragment
+            client.get("/partials/events", params={"country": "india"})
+            assert len(app.state.fragments) == 1
+
+            response = client.get("/partials/events", params=[("country", "India"), ("country", "France")])
+            assert "Paris Event" in response.text
+            assert len(app.state.fragments) == 2
+
+            # Any store change invalidates the fragments
+            store.save(store.load()[:1])
+            client.get("/partials/events")
+            assert len(app.state.fragments) == 1
+
+    def test_page_uses_partials(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = _store(tmpdir)
+            client = TestClient(create_app(store.filepath))
+
+            response = client.get("/")
+            assert response.status_code == 200
+            assert 'const PARTIALS_URL = "/partials/events"' in response.text
+
+    def test_sort_parameter(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = _store(tmpdir)
+            events = store.load()
+            events[-1].relevance_score = 0.1
+            events[2].relevance_score = 5.0
+            store.save(events)
+            client = TestClient(create_app(store.filepath))
+
+            text = client.get("/partials/events", params={"sort": "relevance"}).text
+            assert text.index("Paris Event 2") < text.index("Paris Event 0") < text.index("Pune Event")
+            assert client.get("/", params={"sort": "relevance"}).status_code == 200
+            assert client.get("/partials/events", params={"sort": "random"}).status_code == 400
+
+
+class TestPaginationAndExport:
+    def test_cursor_pagination(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = _store(tmpdir)
+            client = TestClient(create_app(store.filepath))
+
+            names = []
+            cursor = None
+            while True:
+                params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+                data = client.get("/api/events/page", params=params).json()
+                names.extend(e["name"] for e in data["events"])
+                cursor = data["next_cursor"]
+                if not cursor:
+                    break
+
+            assert names == [f"Paris Event {i}" for i in range(5)] + ["Pune Event"]
+
+            data = client.get("/api/events/page", params={"limit": 10, "country": "india"}).json()
+            assert [e["name"] for e in data["events"]] == ["Pune Event"]
+            assert data["next_cursor"] is None
+
+            assert client.get("/api/events/page", params={"cursor": "!!"}).status_code == 400
+
+    def test_ndjson_export(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = _store(tmpdir)
+            client = TestClient(create_app(store.filepath))
+
+            response = client.get("/api/events.ndjson", params={"city": "Paris"})
+            assert response.headers["content-type"] == "application/x-ndjson"
+            lines = response.text.splitlines()
+            assert len(lines) == 5
+            assert json.loads(lines[0])["city"] == "Paris"
@@ -0,0 +1,143 @@
+"""Tests for schema-constrained, streamed Gemini responses."""
+
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+from src import config
+from src.collector.models import JsonArrayStream
+from src.collector.sources import web_search
+
+EVENTS = [
+    {
+        "name": "KubeCon Paris",
+        "city": "Paris",
+        "country": "France",
+        "start_date": "2030-03-03",
+        "end_date": "2030-03-05",
+        "event_type": "conference",
+        "topics": ["kubernetes"],
+        "cfp_deadline": "2030-01-10",
+        "cfp_url": "https://example.com/cfp",
+        "website": "https://example.com",
+        "description": "Cloud native {conference} with \"quotes\" and ] brackets",
+    },
+    {"name": "No Date Meetup", "start_date": None, "website": "https://example.com/meetup"},
+    {"name": "DevOps Paris", "start_date": "2030-06-01", "website": "https://example.com/devops"},
+]
+RESPONSE = json.dumps({"events": EVENTS}, indent=2)
+
+
+class FakeModels:
+    """Stands in for ``client.aio.models``, streaming a canned response in small chunks."""
+
+    def __init__(self, text, chunk_size=7):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.sent = 0  # Chunks handed out so far
+        self.calls = []
+
+    async def generate_content_stream(self, model, contents, config):
+        self.calls.append(config)
+
+        async def chunks():
+            for i in range(0, len(self.text), self.chunk_size):
+                self.sent += 1
+                yield SimpleNamespace(text=self.text[i:i + self.chunk_size])
+
+        return chunks()
+
+    async def generate_content(self, model, contents, config):
+        self.calls.append(config)
+        return SimpleNamespace(text=self.text)
+
+
+def _fake_client(text, **kwargs):
+    return SimpleNamespace(aio=SimpleNamespace(models=FakeModels(text, **kwargs)))
+
+
+@pytest.fixture
+def paris(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "config.yaml")
+        with open(path, "w") as f:
+            f.write("cities:\n  - city: Paris\n    country: France\n")
+        monkeypatch.setattr(config, "_config_file", path)
+        monkeypatch.setattr(config, "_settings", None)
+        yield
+
+
+class TestJsonArrayStream:
+    def test_elements_arrive_as_they_complete(self):
+        parser = JsonArrayStream("events")
+        items = []
+        for char in RESPONSE:
+            items.extend(parser.feed(char))
+        assert items == EVENTS
+        assert parser.done
+
+    def test_text_around_the_json_is_ignored(self):
+        text = f"Here you go:\n```json\n{RESPONSE}\n```\nLet me know if you need {{more}}."
+        parser = JsonArrayStream("events")
+        assert parser.feed(text) == EVENTS
+        assert parser.feed("trailing") == []
+
+    def test_incomplete_element_waits(self):
+        parser = JsonArrayStream("events")
+        first = json.dumps(EVENTS[0])
+        assert parser.feed('{"events": [' + first[:-1]) == []
+        assert parser.feed(first[-1] + ", {") == [EVENTS[0]]
+        assert not parser.done
+
+
+class TestSearchCity:
+    async def test_first_event_before_response_ends(self, paris):
+        client = _fake_client(RESPONSE)
+        models = client.aio.models
+        total_chunks = -(-len(RESPONSE) // models.chunk_size)
+
+        async for event in web_search.search_city(client, "Paris", "France"):
+            assert event.name == "KubeCon Paris"
+            assert models.sent < total_chunks
+            break
+
+    async def test_events_and_schema(self, paris):
+        client = _fake_client(RESPONSE)
+        events = [e async for e in web_search.search_city(client, "Paris", "France")]
+        assert [e.name for e in events] == ["KubeCon Paris", "DevOps Paris"]
+        assert (events[0].start_date.isoformat(), events[0].end_date.isoformat()) == ("2030-03-03", "2030-03-05")
+        assert events[1].city == "Paris"
+
+        config_used = client.aio.models.calls[0]
+        assert config_used.response_mime_type == "application/json"
+        assert config_used.response_json_schema == web_search.EVENTS_SCHEMA
+
+    async def test_truncated_response_keeps_complete_events(self, paris):
+        client = _fake_client(RESPONSE[: RESPONSE.index("No Date Meetup")])
+        events = [e async for e in web_search.search_city(client, "Paris", "France")]
+        assert [e.name for e in events] == ["KubeCon Paris"]
+
+    async def test_stream_yields_per_city(self, paris, monkeypatch):
+        monkeypatch.setattr(web_search, "_client", lambda: _fake_client(RESPONSE + "\nHope this helps!"))
+        results = [item async for item in web_search.stream(["Paris"])]
+        assert [(key, len(events)) for key, events in results] == [("Paris", 2)]
+
+
+class TestParseResponse:
+    def test_complete_response(self, paris):
+        events = web_search._parse_response(f"Sure!\n{RESPONSE}\nThanks", "Paris", "France")
+        assert [e.name for e in events] == ["KubeCon Paris", "DevOps Paris"]
+
+    def test_topics_are_classified(self, paris):
+        events = web_search._parse_response(RESPONSE, "Paris", "France")
+        assert events[0].topics == ["cloud native", "kubernetes"]
+        assert events[1].topics == ["devops"]
+
+    def test_first_json_object(self):
+        details = {"cfp_deadline": "2030-01-10", "cfp_url": None, "cfp_open": True, "topics": []}
+        text = f"Result: {json.dumps(details)} (from {{the}} page)"
+        assert web_search._first_json_object(text) == details
+        assert web_search._first_json_object("no json here") is None